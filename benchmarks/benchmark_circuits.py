@@ -0,0 +1,77 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Random circuits and operators shared by the benchmarks."""
+
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+from orquestra.quantum.circuits import (
+    CNOT,
+    CZ,
+    RX,
+    RY,
+    RZ,
+    SWAP,
+    XX,
+    ZZ,
+    Circuit,
+    H,
+    S,
+    T,
+)
+from orquestra.quantum.operators import PauliSum, PauliTerm
+
+GATE_MIXES: Dict[str, Tuple[List, List]] = {
+    "clifford": ([H, S], [CNOT, CZ]),
+    "rotations": ([RX, RY, RZ], [XX, ZZ]),
+    "mixed": ([H, T, RX, RZ], [CNOT, SWAP, ZZ]),
+}
+
+_PARAMETRIZED_GATES = (RX, RY, RZ, XX, ZZ)
+
+
+def layered_circuit(
+    n_qubits: int, depth: int, gate_mix: str = "mixed", seed: int = 0
+) -> Circuit:
+    """Layers of random single qubit gates followed by two-qubit gates.
+
+    Two-qubit gates of a layer act on neighbouring pairs of qubits, starting
+    at a random parity.
+    """
+    rng = np.random.default_rng(seed)
+    single_qubit_gates, two_qubit_gates = GATE_MIXES[gate_mix]
+
+    def random_gate(gates):
+        gate = gates[rng.integers(len(gates))]
+        if gate in _PARAMETRIZED_GATES:
+            gate = gate(float(rng.uniform(-np.pi, np.pi)))
+        return gate
+
+    circuit = Circuit()
+    for _ in range(depth):
+        for qubit in range(n_qubits):
+            circuit += random_gate(single_qubit_gates)(qubit)
+        for qubit in range(int(rng.integers(2)), n_qubits - 1, 2):
+            circuit += random_gate(two_qubit_gates)(qubit, qubit + 1)
+    return circuit
+
+
+def circuit_of_n_gates(
+    n_gates: int, n_qubits: int = 20, gate_mix: str = "mixed", seed: int = 0
+) -> Circuit:
+    """The first n_gates operations of a layered circuit."""
+    # Layers have n_qubits single qubit gates and at least (n_qubits - 1) // 2
+    # two-qubit gates.
+    depth = math.ceil(n_gates / (n_qubits + (n_qubits - 1) // 2))
+    circuit = layered_circuit(n_qubits, depth, gate_mix, seed)
+    return Circuit(circuit.operations[:n_gates])
+
+
+def ising_operator(n_qubits: int) -> PauliSum:
+    terms = [PauliTerm({qubit: "X"}, 0.5) for qubit in range(n_qubits)]
+    terms += [
+        PauliTerm({qubit: "Z", qubit + 1: "Z"}, 1.0) for qubit in range(n_qubits - 1)
+    ]
+    return PauliSum(terms)
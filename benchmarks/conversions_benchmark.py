@@ -0,0 +1,46 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Measures how circuit conversion scales with the number of gates.
+
+Usage:
+    python benchmarks/conversions_benchmark.py --n-gates 1000 10000 100000
+"""
+
+import argparse
+import time
+
+from benchmark_circuits import circuit_of_n_gates
+from braket.circuits.serialization import IRType
+
+from orquestra.integrations.braket.conversions import (
+    export_to_braket,
+    export_to_openqasm,
+)
+
+
+def _time(function, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n-gates", type=int, nargs="+", default=[10**3, 10**4])
+    args = parser.parse_args()
+
+    print(f"{'gates':>10} {'braket':>10} {'braket+ir':>10} {'openqasm':>10}")
+    for n_gates in args.n_gates:
+        circuit = circuit_of_n_gates(n_gates)
+        braket_time = _time(export_to_braket, circuit)
+        braket_ir_time = _time(lambda: export_to_braket(circuit).to_ir(IRType.OPENQASM))
+        openqasm_time = _time(export_to_openqasm, circuit)
+        print(
+            f"{n_gates:>10} {braket_time:>10.3f} {braket_ir_time:>10.3f} "
+            f"{openqasm_time:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
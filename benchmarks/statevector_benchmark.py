@@ -0,0 +1,52 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Compares wavefunctions computed by the "device" and "numpy" engines.
+
+Usage:
+    python benchmarks/statevector_benchmark.py --n-qubits 4 10 16 --depth 20
+"""
+
+import argparse
+import time
+
+import numpy as np
+from benchmark_circuits import GATE_MIXES, layered_circuit
+
+from orquestra.integrations.braket.simulator import braket_local_simulator
+
+
+def _best_time(function, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n-qubits", type=int, nargs="+", default=[4, 8, 12, 16])
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--gate-mix", choices=list(GATE_MIXES), default="rotations")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    simulators = {
+        "device": braket_local_simulator(),
+        "numpy64": braket_local_simulator(engine="numpy", dtype=np.complex64),
+        "numpy128": braket_local_simulator(engine="numpy", dtype=np.complex128),
+    }
+    print(f"{'qubits':>8} " + " ".join(f"{name:>10}" for name in simulators))
+    for n_qubits in args.n_qubits:
+        circuit = layered_circuit(n_qubits, args.depth, args.gate_mix)
+        times = [
+            _best_time(lambda: simulator.get_wavefunction(circuit), args.repeats)
+            for simulator in simulators.values()
+        ]
+        print(f"{n_qubits:>8} " + " ".join(f"{t:>10.4f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
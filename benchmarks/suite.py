@@ -0,0 +1,282 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""Benchmark suite of conversion, sampling, wavefunction and expectation paths.
+
+Every phase is run on circuits swept over numbers of qubits, depths and gate
+mixes, and, where relevant, numbers of shots and batch sizes. The fastest of
+`--repeats` runs is recorded together with the peak memory traced during an
+additional run, and with the mean duration per run of each phase recorded by
+the runner's metrics (e.g. submission, result, measurements). Runners are
+created before timing starts. Paths talking to AWS are run against a stubbed device, so
+they measure the integration's own overhead without any network calls. The
+"import_local_modules" phase times a fresh interpreter importing the modules
+used by local workloads.
+
+Results are written as JSON. Given a baseline written by a previous run,
+the suite compares the timings and exits with status 1 if any phase is slower
+than the baseline by more than the tolerance.
+
+Usage:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --quick --baseline results.json --tolerance 0.25
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import braket._sdk
+import numpy as np
+from benchmark_circuits import GATE_MIXES, ising_operator, layered_circuit
+from braket.circuits.serialization import IRType
+
+from orquestra.integrations.braket.conversions import (
+    export_to_braket,
+    export_to_openqasm,
+)
+from orquestra.integrations.braket.metrics import InMemoryMetrics
+from orquestra.integrations.braket.runner import BraketRunner, braket_local_runner
+from orquestra.integrations.braket.simulator import braket_local_simulator
+
+# The stubbed device is shared with the tests.
+sys.path.append(str(Path(__file__).parents[1] / "tests" / "orquestra" / "braket"))
+from conftest import StubDevice  # noqa: E402
+
+
+@dataclass(frozen=True)
+class Case:
+    phase: str
+    n_qubits: int
+    depth: int
+    gate_mix: str
+    shots: int = 0
+    batch_size: int = 1
+
+    @property
+    def key(self) -> str:
+        return (
+            f"{self.phase}/q{self.n_qubits}/d{self.depth}/{self.gate_mix}"
+            f"/s{self.shots}/b{self.batch_size}"
+        )
+
+
+def _phase(case: Case, metrics: InMemoryMetrics) -> Callable[[], object]:
+    """Prepares inputs and runners of the case, returning the timed function."""
+    if case.phase == "import_local_modules":
+        command = [sys.executable, "-c", "import " + ", ".join(_LOCAL_MODULES)]
+        # The first import may compile bytecode, so it is done before timing.
+        subprocess.run(command, check=True)
+        return lambda: subprocess.run(command, check=True)
+    circuit = layered_circuit(case.n_qubits, case.depth, case.gate_mix)
+    batch = [
+        layered_circuit(case.n_qubits, case.depth, case.gate_mix, seed)
+        for seed in range(case.batch_size)
+    ]
+    operator = ising_operator(case.n_qubits)
+    if case.phase in _CONVERSION_PHASES:
+        return {
+            "export_to_braket": lambda: export_to_braket(circuit),
+            "export_to_braket_ir": lambda: export_to_braket(circuit).to_ir(
+                IRType.OPENQASM
+            ),
+            "export_to_openqasm": lambda: export_to_openqasm(circuit),
+        }[case.phase]
+
+    local_runner = braket_local_runner(metrics=metrics)
+    stub_aws_runner = BraketRunner(StubDevice(), metrics=metrics)
+    device_simulator = braket_local_simulator(metrics=metrics)
+    numpy_simulator = braket_local_simulator(engine="numpy", metrics=metrics)
+    return {
+        "local_run_and_measure": lambda: local_runner.run_and_measure(
+            circuit, case.shots
+        ),
+        "local_run_batch_and_measure": lambda: local_runner.run_batch_and_measure(
+            batch, case.shots
+        ),
+        "stub_aws_run_and_measure": lambda: stub_aws_runner.run_and_measure(
+            circuit, case.shots
+        ),
+        "stub_aws_run_batch_and_measure": lambda: (
+            stub_aws_runner.run_batch_and_measure(batch, case.shots)
+        ),
+        "wavefunction_device": lambda: device_simulator.get_wavefunction(circuit),
+        "wavefunction_numpy": lambda: numpy_simulator.get_wavefunction(circuit),
+        "expectation_device": lambda: device_simulator.get_exact_expectation_values(
+            circuit, operator
+        ),
+        "expectation_numpy": lambda: numpy_simulator.get_exact_expectation_values(
+            circuit, operator
+        ),
+    }[case.phase]
+
+
+_CONVERSION_PHASES = ["export_to_braket", "export_to_braket_ir", "export_to_openqasm"]
+_SAMPLING_PHASES = ["local_run_and_measure", "stub_aws_run_and_measure"]
+_BATCH_PHASES = ["local_run_batch_and_measure", "stub_aws_run_batch_and_measure"]
+_EXACT_PHASES = [
+    "wavefunction_device",
+    "wavefunction_numpy",
+    "expectation_device",
+    "expectation_numpy",
+]
+_LOCAL_MODULES = [
+    "orquestra.integrations.braket.runner",
+    "orquestra.integrations.braket.simulator",
+    "orquestra.integrations.braket.local_pool",
+    "orquestra.integrations.braket.gradients",
+    "orquestra.integrations.braket.routing",
+]
+PHASES = (
+    ["import_local_modules"]
+    + _CONVERSION_PHASES
+    + _SAMPLING_PHASES
+    + _BATCH_PHASES
+    + _EXACT_PHASES
+)
+
+
+def cases(args) -> Iterator[Case]:
+    grid = list(itertools.product(args.n_qubits, args.depths, args.gate_mixes))
+    for phase in args.phases:
+        if phase == "import_local_modules":
+            # Imports don't depend on circuits.
+            yield Case(phase, 0, 0, "none")
+            continue
+        for n_qubits, depth, gate_mix in grid:
+            if phase in _SAMPLING_PHASES:
+                for shots in args.shots:
+                    yield Case(phase, n_qubits, depth, gate_mix, shots=shots)
+            elif phase in _BATCH_PHASES:
+                for batch_size in args.batch_sizes:
+                    yield Case(
+                        phase,
+                        n_qubits,
+                        depth,
+                        gate_mix,
+                        shots=args.shots[0],
+                        batch_size=batch_size,
+                    )
+            else:
+                yield Case(phase, n_qubits, depth, gate_mix)
+
+
+def measure(
+    run: Callable[[], object], repeats: int, metrics: InMemoryMetrics
+) -> Dict[str, object]:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    phase_seconds = {
+        phase: stats.total_seconds / repeats for phase, stats in metrics.phases.items()
+    }
+
+    # Tracing allocations slows the run down, so memory is measured separately.
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "peak_bytes": peak, "phase_seconds": phase_seconds}
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Lists cases slower than in the baseline by more than the tolerance."""
+    baseline_seconds = {result["key"]: result["seconds"] for result in baseline}
+    regressions = []
+    for result in results:
+        reference = baseline_seconds.get(result["key"])
+        if reference is None or reference == 0:
+            continue
+        ratio = result["seconds"] / reference
+        print(f"{result['key']:<70} {ratio:>6.2f}x")
+        if ratio > 1 + tolerance:
+            regressions.append(result["key"])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--phases", nargs="+", choices=PHASES, default=PHASES)
+    parser.add_argument("--n-qubits", type=int, nargs="+", default=[4, 8, 12])
+    parser.add_argument("--depths", type=int, nargs="+", default=[10, 50])
+    parser.add_argument(
+        "--gate-mixes", nargs="+", choices=list(GATE_MIXES), default=["mixed"]
+    )
+    parser.add_argument("--shots", type=int, nargs="+", default=[100, 10000])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="run the smallest case of every phase only",
+    )
+    parser.add_argument("--output", help="JSON file to which results are written")
+    parser.add_argument("--baseline", help="JSON file with results to compare to")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative slowdown compared to the baseline",
+    )
+    args = parser.parse_args()
+    if args.quick:
+        args.n_qubits = [min(args.n_qubits)]
+        args.depths = [min(args.depths)]
+        args.gate_mixes = args.gate_mixes[:1]
+        args.shots = [min(args.shots)]
+        args.batch_sizes = [max(args.batch_sizes)]
+
+    results = []
+    for case in cases(args):
+        metrics = InMemoryMetrics()
+        measurement = measure(_phase(case, metrics), args.repeats, metrics)
+        results.append({"key": case.key, **asdict(case), **measurement})
+        phases = " ".join(
+            f"{phase}={seconds:.4f}s"
+            for phase, seconds in sorted(measurement["phase_seconds"].items())
+        )
+        print(
+            f"{case.key:<70} {measurement['seconds']:>9.4f}s "
+            f"{measurement['peak_bytes'] / 2**20:>9.2f}MiB {phases}".rstrip()
+        )
+
+    if args.output:
+        report = {
+            "metadata": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "numpy": np.__version__,
+                "braket": braket._sdk.__version__,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(
+                f"{len(regressions)} cases regressed by more than {args.tolerance:.0%}"
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+COMPLETED_STATE = "COMPLETED"
+TERMINAL_STATES = frozenset({"COMPLETED", "FAILED", "CANCELLED"})
+
+
+@dataclass
+class _PendingTask:
+    future: Future
+    parse_result: Callable[[Any], Any]
+    deadline: Optional[float]
+    task: Any = None
+
+
+class _TaskPoller:
+    """Resolves futures of Braket tasks using a single shared polling thread.
+
+    Submission of tasks happens on a small thread pool, so that devices which
+    run synchronously on `run` (e.g. LocalSimulator) don't block the caller.
+    Submitted tasks are then polled for their state by one background thread,
+    regardless of how many of them are in flight. Results of completed tasks
+    are downloaded and parsed on another thread pool, so that a slow download
+    doesn't delay polling of the other tasks.
+
+    Args:
+        poll_interval: number of seconds between consecutive polls of the
+            outstanding tasks.
+        max_submitters: number of threads used for submitting tasks.
+        max_fetchers: number of threads used for fetching results of tasks.
+    """
+
+    def __init__(
+        self, poll_interval: float = 1.0, max_submitters: int = 8, max_fetchers: int = 8
+    ):
+        self.poll_interval = poll_interval
+        self._submitter = ThreadPoolExecutor(
+            max_workers=max_submitters, thread_name_prefix="braket-submit"
+        )
+        self._fetcher = ThreadPoolExecutor(
+            max_workers=max_fetchers, thread_name_prefix="braket-fetch"
+        )
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending: List[_PendingTask] = []
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(
+        self,
+        submit_task: Callable[[], Any],
+        parse_result: Callable[[Any], Any],
+        timeout: Optional[float] = None,
+    ) -> Future:
+        """Submit a task and return a future of its parsed result.
+
+        Args:
+            submit_task: callable creating the Braket task.
+            parse_result: callable converting the task's result into the value
+                of the returned future.
+            timeout: number of seconds after which the task is cancelled and
+                the future fails with TimeoutError. It also applies to time
+                spent waiting for a free submission thread.
+
+        Returns:
+            Future resolved with the parsed result. Cancelling the future
+            cancels the underlying task.
+        """
+        future: Future = Future()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        entry = _PendingTask(future, parse_result, deadline)
+
+        def _submit():
+            if future.done():
+                return
+            try:
+                task = submit_task()
+            except Exception as error:
+                _resolve(future.set_exception, error)
+                return
+            entry.task = task
+            if future.done():
+                # Cancelled or timed out while the task was being created.
+                _cancel_task(task)
+                return
+            self._wakeup.set()
+
+        # Entries are polled from the start, so that deadlines of tasks still
+        # waiting for submission are enforced too.
+        self._track(entry)
+        self._submitter.submit(_submit)
+        return future
+
+    def _track(self, pending_task: _PendingTask):
+        with self._lock:
+            self._pending.append(pending_task)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._poll_forever, name="braket-poller", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def _poll_forever(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            with self._lock:
+                pending, self._pending = self._pending, []
+            unfinished = [entry for entry in pending if not self._process(entry)]
+            with self._lock:
+                self._pending.extend(unfinished)
+
+    def _process(self, entry: _PendingTask) -> bool:
+        """Advance a single pending task. Returns True if it no longer needs polling."""
+        task = entry.task
+        if entry.future.done():
+            if task is not None:
+                _cancel_task(task)
+            return True
+
+        state = None
+        if task is not None:
+            try:
+                state = task.state()
+            except Exception as error:
+                _resolve(entry.future.set_exception, error)
+                return True
+
+        if state in TERMINAL_STATES:
+            self._fetcher.submit(_fetch_result, entry, state)
+            return True
+
+        # Deadlines are checked only after reading the state, so that tasks
+        # which have just finished aren't reported as timed out.
+        if entry.deadline is not None and time.monotonic() > entry.deadline:
+            if task is not None:
+                _cancel_task(task)
+            description = (
+                "not submitted" if task is None else f"{task.id} did not finish"
+            )
+            _resolve(
+                entry.future.set_exception,
+                TimeoutError(f"Braket task {description} in time"),
+            )
+            return True
+        return False
+
+
+def _fetch_result(entry: _PendingTask, state: str):
+    try:
+        if state != COMPLETED_STATE:
+            raise RuntimeError(f"Braket task {entry.task.id} finished as {state}")
+        value = entry.parse_result(entry.task.result())
+    except Exception as error:
+        _resolve(entry.future.set_exception, error)
+    else:
+        _resolve(entry.future.set_result, value)
+
+
+def _cancel_task(task):
+    try:
+        task.cancel()
+    except NotImplementedError:
+        # Local tasks are already finished and cannot be cancelled.
+        pass
+
+
+def _resolve(setter: Callable[[Any], None], value):
+    try:
+        setter(value)
+    except InvalidStateError:
+        # The future has been cancelled in the meantime.
+        pass
+
+
+_shared_poller: Optional[_TaskPoller] = None
+_shared_poller_lock = threading.Lock()
+
+
+def _get_task_poller() -> _TaskPoller:
+    global _shared_poller
+    with _shared_poller_lock:
+        if _shared_poller is None:
+            _shared_poller = _TaskPoller()
+        return _shared_poller
@@ -3,14 +3,15 @@
 ################################################################################
 
 
-from braket.aws import AwsDevice
+from orquestra.integrations.braket.devices import default_device_catalog
 
 
 def _get_arn(name: str, aws_session):
     """
     This function extracts the Amazon Resources Name (arn) of the simulator or hardware
     See https://docs.aws.amazon.com/braket/latest/developerguide/braket-devices.html
-    to find lists of resources that are available.
+    to find lists of resources that are available. The catalog of devices is
+    cached by `devices.default_device_catalog`.
 
     Args:
         name : name of the device or simulator
@@ -28,8 +29,4 @@ def _get_arn(name: str, aws_session):
         >>> _get_arn(name, boto_sess)
     """
 
-    simulator_properties = AwsDevice.get_devices(names=[name], aws_session=aws_session)[
-        0
-    ]
-
-    return simulator_properties.arn
+    return default_device_catalog.get_arn(name, aws_session)
@@ -0,0 +1,138 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+_COUNTS_SUFFIX = ".json"
+_ARRAY_SUFFIX = ".npy"
+# Number of writes after which the size of the directory is measured again,
+# to account for entries written or evicted by other processes.
+_RESCAN_INTERVAL = 100
+
+
+class ResultCache:
+    """On-disk cache of results of Braket tasks, addressed by their content.
+
+    Entries are written atomically, so the cache can be shared by concurrent
+    processes. Reading an entry marks it as recently used and once the total
+    size of the cache exceeds max_size_bytes, least recently used entries
+    are evicted. The total size is tracked across writes and the directory
+    is scanned only when it exceeds the limit, or every few writes to account
+    for other processes.
+
+    Args:
+        directory: directory in which results are stored. It is created if it
+            doesn't exist.
+        max_size_bytes: maximum total size of stored results.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_size_bytes: int = 2**30):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self._writes_since_scan = 0
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Computes the key of an entry from strings describing the task."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def load_counts(self, key: str) -> Optional[Dict[str, int]]:
+        return self._load(
+            key + _COUNTS_SUFFIX, lambda path: json.loads(path.read_text())
+        )
+
+    def save_counts(self, key: str, counts: Dict[str, int]):
+        self._save(
+            key + _COUNTS_SUFFIX,
+            lambda file: file.write(json.dumps(dict(counts)).encode()),
+        )
+
+    def load_array(self, key: str) -> Optional[np.ndarray]:
+        return self._load(key + _ARRAY_SUFFIX, np.load)
+
+    def save_array(self, key: str, array: np.ndarray):
+        self._save(key + _ARRAY_SUFFIX, lambda file: np.save(file, np.asarray(array)))
+
+    def _load(self, filename: str, read: Callable):
+        path = self.directory / filename
+        try:
+            value = read(path)
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):
+            # Missing entries, as well as ones evicted or corrupted by other
+            # processes, are treated as misses.
+            return None
+        return value
+
+    def _save(self, filename: str, write: Callable):
+        path = self.directory / filename
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                write(file)
+            size = os.path.getsize(temporary_path)
+            previous_size = _size_or_zero(path)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+        self._record_write(size - previous_size)
+
+    def _record_write(self, size_change: int):
+        with self._lock:
+            self._writes_since_scan += 1
+            if self._size is not None and self._writes_since_scan < _RESCAN_INTERVAL:
+                self._size += size_change
+                if self._size <= self.max_size_bytes:
+                    return
+            self._size = self._evict()
+            self._writes_since_scan = 0
+
+    def _evict(self) -> int:
+        """Evicts least recently used entries and returns the remaining size."""
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix not in (_COUNTS_SUFFIX, _ARRAY_SUFFIX):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self.max_size_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total_size -= size
+        return total_size
+
+
+def _size_or_zero(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _device_id(device) -> str:
+    return getattr(device, "arn", None) or device.name
@@ -1,4 +1,10 @@
 ################################################################################
 # © Copyright 2021-2022 Zapata Computing Inc.
 ################################################################################
-from ._circuit_conversions import export_to_braket
+from ._circuit_conversions import (
+    BraketCircuitTemplate,
+    export_to_braket,
+    export_to_braket_template,
+    export_to_openqasm,
+)
+from ._operator_conversions import export_to_braket_observable
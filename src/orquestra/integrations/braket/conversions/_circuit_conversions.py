@@ -2,11 +2,16 @@
 # © Copyright 2021-2022 Zapata Computing Inc.
 ################################################################################
 
-from typing import Callable, Dict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Sequence, Tuple
 
+import sympy
 from braket.circuits import Circuit as BraketCircuit
+from braket.circuits import FreeParameter, FreeParameterExpression
 from braket.circuits.gate import Gate as BraketGate
 from braket.circuits.instruction import Instruction
+from braket.ir.openqasm import Program
 from orquestra.quantum.circuits import Circuit, I
 
 
@@ -20,26 +25,168 @@ def export_to_braket(circuit: Circuit) -> BraketCircuit:
       BraketCircuit
     """
 
-    gates = [_to_braket_gate(operation) for operation in circuit.operations]
+    factories = _gate_factories()
+    gates = [
+        _to_braket_instruction(
+            operation.gate.name, operation.qubit_indices, operation.params, factories
+        )
+        for operation in circuit.operations
+    ]
     return BraketCircuit(gates)
 
 
-def _to_braket_gate(operation):
+def export_to_openqasm(circuit: Circuit, state_vector: bool = False) -> Program:
+    """Converts the circuit directly to a Braket OpenQASM program.
 
-    if operation.gate.name in NON_PARAMETERIZED_BRAKET_GATES.keys():
-        return Instruction(
-            NON_PARAMETERIZED_BRAKET_GATES[operation.gate.name](),
-            [qubit for qubit in operation.qubit_indices],
-        )
-    elif operation.gate.name in PARAMETERIZED_BRAKET_GATES.keys():
-        return Instruction(
-            PARAMETERIZED_BRAKET_GATES[operation.gate.name](operation.params[0]),
-            [qubit for qubit in operation.qubit_indices],
-        )
+    The program is the same as the one produced by serializing the result of
+    `export_to_braket`, but no intermediate Braket objects are created, which
+    makes this conversion much faster for very large circuits.
+
+    Args:
+      circuit : the circuit to convert. All its parameters have to be bound.
+      state_vector : if True, the program requests the state vector as its
+        result instead of measuring all the qubits.
+
+    Returns:
+      Program
+    """
+    body = []
+    used_qubits = set()
+    for operation in circuit.operations:
+        try:
+            gate_name, is_parametric = _OPENQASM_GATES[operation.gate.name]
+        except KeyError:
+            raise RuntimeError(
+                "Gate: {} is not supported in Braket Circuits".format(
+                    operation.gate.name
+                )
+            ) from None
+        qubits = operation.qubit_indices
+        used_qubits.update(qubits)
+        targets = ", ".join([f"q[{qubit}]" for qubit in qubits])
+        if is_parametric:
+            body.append(
+                f"{gate_name}({_to_openqasm_param(operation.params[0])}) {targets};"
+            )
+        else:
+            body.append(f"{gate_name} {targets};")
+
+    measured_qubits = sorted(used_qubits)
+    header = ["OPENQASM 3.0;"]
+    if state_vector:
+        footer = ["#pragma braket result state_vector"]
     else:
+        header.append(f"bit[{len(measured_qubits)}] b;")
+        footer = [
+            f"b[{bit}] = measure q[{qubit}];"
+            for bit, qubit in enumerate(measured_qubits)
+        ]
+    header.append(f"qubit[{measured_qubits[-1] + 1 if measured_qubits else 0}] q;")
+    return Program(source="\n".join(header + body + footer), inputs={})
+
+
+def _to_openqasm_param(param) -> str:
+    try:
+        return repr(float(param))
+    except TypeError:
+        raise ValueError(
+            f"Parameter {param} has to be bound before exporting to OpenQASM"
+        ) from None
+
+
+@dataclass(frozen=True, eq=False)
+class BraketCircuitTemplate:
+    """Braket circuit in which symbols are replaced with free parameters.
+
+    Args:
+      circuit : Braket circuit with a FreeParameter named after each symbol
+      symbols : symbols of the original circuit, in the order in which values
+        of the parameters are expected
+    """
+
+    circuit: BraketCircuit
+    symbols: Tuple[sympy.Symbol, ...]
+
+    def inputs(self, params: Sequence[float]) -> Dict[str, float]:
+        """Maps names of the free parameters to the given values."""
+        if len(params) != len(self.symbols):
+            raise ValueError(
+                f"Expected {len(self.symbols)} parameters, got {len(params)}"
+            )
+        return {
+            symbol.name: float(value) for symbol, value in zip(self.symbols, params)
+        }
+
+    def bind(self, params: Sequence[float]) -> BraketCircuit:
+        """Creates a Braket circuit with the free parameters bound to params."""
+        return self.circuit.make_bound_circuit(self.inputs(params))
+
+
+def export_to_braket_template(circuit: Circuit) -> BraketCircuitTemplate:
+    """Converts a symbolic circuit to a Braket circuit with free parameters.
+
+    Conversions are cached by the structure of the circuit, so converting
+    a circuit with the same gates, qubits and symbolic parameters again
+    returns the same template.
+
+    Args:
+      circuit : the circuit to convert
+
+    Returns:
+      BraketCircuitTemplate whose symbols are ordered as circuit.free_symbols
+    """
+    return _export_template(_circuit_structure(circuit))
+
+
+def _circuit_structure(circuit: Circuit) -> Tuple:
+    return tuple(
+        (operation.gate.name, operation.qubit_indices, operation.params)
+        for operation in circuit.operations
+    )
+
+
+@lru_cache(maxsize=256)
+def _export_template(structure: Tuple) -> BraketCircuitTemplate:
+    factories = _gate_factories()
+    circuit = BraketCircuit(
+        [
+            _to_braket_instruction(name, qubit_indices, params, factories)
+            for name, qubit_indices, params in structure
+        ]
+    )
+    # Same ordering as Circuit.free_symbols
+    symbols: Dict[sympy.Symbol, None] = {}
+    for _, _, params in structure:
+        symbols.update(dict.fromkeys(_sorted_free_symbols(params)))
+    return BraketCircuitTemplate(circuit, tuple(symbols))
+
+
+def _sorted_free_symbols(params):
+    symbols = set(
+        symbol
+        for param in params
+        if isinstance(param, sympy.Expr)
+        for symbol in param.free_symbols
+    )
+    return sorted(symbols, key=str)
+
+
+def _to_braket_instruction(name, qubit_indices, params, factories: Dict[str, Callable]):
+    try:
+        make_gate = factories[name]
+    except KeyError:
         raise RuntimeError(
-            "Gate: {} is not supported in Braket Circuits".format(operation.gate.name)
-        )
+            "Gate: {} is not supported in Braket Circuits".format(name)
+        ) from None
+    return Instruction(make_gate(params), qubit_indices)
+
+
+def _to_braket_param(param):
+    if isinstance(param, sympy.Symbol):
+        return FreeParameter(param.name)
+    if isinstance(param, sympy.Expr) and param.free_symbols:
+        return FreeParameterExpression(param)
+    return param
 
 
 NON_PARAMETERIZED_BRAKET_GATES: Dict[str, Callable] = {
@@ -67,3 +214,30 @@ PARAMETERIZED_BRAKET_GATES: Dict[str, Callable] = {
     "RZ": BraketGate.Rz,
     "CPHASE": BraketGate.CPhaseShift,
 }
+
+
+@lru_cache(maxsize=None)
+def _gate_factories() -> Dict[str, Callable]:
+    # Single lookup per operation. Non-parameterized gates are immutable, so
+    # one instance of each is shared by all instructions. The table is built
+    # on first use rather than at import, and fetched once per conversion.
+    factories: Dict[str, Callable] = {}
+    for name, gate_factory in NON_PARAMETERIZED_BRAKET_GATES.items():
+        factories[name] = lambda params, gate=gate_factory(): gate
+    for name, gate_factory in PARAMETERIZED_BRAKET_GATES.items():
+        factories[name] = lambda params, factory=gate_factory: factory(
+            _to_braket_param(params[0])
+        )
+    return factories
+
+
+_OPENQASM_GATES: Dict[str, Tuple[str, bool]] = {
+    **{
+        name: (gate.__name__.lower(), False)
+        for name, gate in NON_PARAMETERIZED_BRAKET_GATES.items()
+    },
+    **{
+        name: (gate.__name__.lower(), True)
+        for name, gate in PARAMETERIZED_BRAKET_GATES.items()
+    },
+}
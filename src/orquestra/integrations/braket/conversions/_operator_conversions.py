@@ -0,0 +1,56 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+
+from typing import Dict, FrozenSet, List, Tuple
+
+from braket.circuits.observables import Observable
+from orquestra.quantum.operators import PauliRepresentation, PauliTerm
+
+
+def export_to_braket_observable(term: PauliTerm) -> Tuple[Observable, List[int]]:
+    """Converts a non-constant Pauli term to a Braket observable.
+
+    The coefficient of the term is not part of the observable.
+
+    Args:
+      term : the term to convert
+
+    Returns:
+      Observable and the qubits it acts on, in the same order
+    """
+    if term.is_constant:
+        raise ValueError("Constant terms cannot be converted to Braket observables")
+    qubits = sorted(term.qubits)
+    factors = [_BRAKET_PAULI_OBSERVABLES[term[qubit]]() for qubit in qubits]
+    observable = factors[0]
+    for factor in factors[1:]:
+        observable = observable @ factor
+    return observable, qubits
+
+
+def _group_identical_terms(
+    operator: PauliRepresentation,
+) -> Tuple[complex, Dict[FrozenSet[Tuple[int, str]], Tuple[PauliTerm, complex]]]:
+    """Splits the operator into its constant and summed coefficients of its terms.
+
+    Returns:
+        The constant part of the operator, and a dictionary mapping operations
+        of each distinct non-constant term to the term and its total coefficient.
+    """
+    constant: complex = 0
+    grouped: Dict[FrozenSet[Tuple[int, str]], Tuple[PauliTerm, complex]] = {}
+    for term in operator.terms:
+        if term.is_constant:
+            constant += term.coefficient
+            continue
+        _, coefficient = grouped.get(term.operations, (term, 0))
+        grouped[term.operations] = (term, coefficient + term.coefficient)
+    return constant, grouped
+
+
+_BRAKET_PAULI_OBSERVABLES = {
+    "X": Observable.X,
+    "Y": Observable.Y,
+    "Z": Observable.Z,
+}
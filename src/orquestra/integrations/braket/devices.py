@@ -0,0 +1,233 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from botocore.exceptions import ClientError  # type: ignore
+from braket.aws import AwsDevice, AwsDeviceType, AwsSession
+
+
+@dataclass(frozen=True)
+class DeviceSummary:
+    """Name, ARN and type ("QPU" or "SIMULATOR") of a Braket device."""
+
+    name: str
+    arn: str
+    type: str
+
+
+class DeviceCatalog:
+    """In-process cache of the Braket device catalog and device objects.
+
+    Summaries of devices visible from a session are searched at most once per
+    ttl_seconds, without fetching the metadata of each device. Device objects
+    are created only when requested by ARN and reused for the same period, so
+    their metadata isn't refreshed on every use. Entries are kept per session,
+    so that devices of one account are never used by another one.
+
+    Args:
+        ttl_seconds: number of seconds for which cached entries are valid.
+        cache_file: optional JSON file in which summaries of the catalog are
+            also stored, so that other processes can reuse them. They are
+            stored per region and access key of the session.
+        clock: function returning the current time in seconds.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 600.0,
+        cache_file: Optional[Union[str, Path]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.cache_file = None if cache_file is None else Path(cache_file)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Keyed by the id of the session, which is kept alive by the entry.
+        self._catalogs: Dict[Tuple, Tuple[float, AwsSession, List[DeviceSummary]]] = {}
+        self._devices: Dict[Tuple, Tuple[float, AwsSession, AwsDevice]] = {}
+
+    def get_summaries(self, aws_session: AwsSession) -> List[DeviceSummary]:
+        """Lists devices visible from the region of the session."""
+        key = _session_key(aws_session)
+        with self._lock:
+            cached = self._catalogs.get(key)
+            if cached is not None and self._is_fresh(cached[0]):
+                return list(cached[2])
+            loaded = self._load_summaries(_file_key(aws_session))
+            if loaded is not None:
+                fetched_at, summaries = loaded
+                self._evict_expired(self._catalogs)
+                self._catalogs[key] = (fetched_at, aws_session, summaries)
+                return list(summaries)
+            return list(self._fetch(aws_session))
+
+    def get_arn(self, name: str, aws_session: AwsSession) -> str:
+        """Finds the ARN of the device with given name."""
+        for summary in self.get_summaries(aws_session):
+            if summary.name == name:
+                return summary.arn
+        raise ValueError(f"Device {name} is not available on Braket")
+
+    def get_device(self, arn: str, aws_session: AwsSession) -> AwsDevice:
+        """Returns the device with given ARN, creating it only when not cached."""
+        key = _session_key(aws_session) + (arn,)
+        with self._lock:
+            cached_device = self._devices.get(key)
+            if cached_device is not None and self._is_fresh(cached_device[0]):
+                return cached_device[2]
+            self._evict_expired(self._devices)
+            device = AwsDevice(arn, aws_session)
+            self._devices[key] = (self._clock(), aws_session, device)
+            return device
+
+    def clear(self):
+        """Drops all entries cached in memory."""
+        with self._lock:
+            self._catalogs.clear()
+            self._devices.clear()
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        return self._clock() - fetched_at < self.ttl_seconds
+
+    def _evict_expired(self, entries: Dict[Tuple, Tuple[Any, ...]]):
+        # Drops expired entries, and with them references to their sessions.
+        for key in [
+            key for key, entry in entries.items() if not self._is_fresh(entry[0])
+        ]:
+            del entries[key]
+
+    def _fetch(self, aws_session: AwsSession) -> List[DeviceSummary]:
+        summaries = _search_summaries(aws_session)
+        fetched_at = self._clock()
+        self._evict_expired(self._catalogs)
+        self._catalogs[_session_key(aws_session)] = (
+            fetched_at,
+            aws_session,
+            summaries,
+        )
+        self._store_summaries(_file_key(aws_session), fetched_at, summaries)
+        return summaries
+
+    def _read_cache_file(self) -> Dict:
+        if self.cache_file is None:
+            return {}
+        try:
+            return json.loads(self.cache_file.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _load_summaries(
+        self, file_key: str
+    ) -> Optional[Tuple[float, List[DeviceSummary]]]:
+        entry = self._read_cache_file().get(file_key)
+        if entry is None or not self._is_fresh(entry["fetched_at"]):
+            return None
+        return entry["fetched_at"], [
+            DeviceSummary(**summary) for summary in entry["devices"]
+        ]
+
+    def _store_summaries(
+        self, file_key: str, fetched_at: float, summaries: List[DeviceSummary]
+    ):
+        if self.cache_file is None:
+            return
+        content = self._read_cache_file()
+        content[file_key] = {
+            "fetched_at": fetched_at,
+            "devices": [asdict(summary) for summary in summaries],
+        }
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.cache_file.parent, suffix=".tmp"
+        )
+        with os.fdopen(descriptor, "w") as file:
+            json.dump(content, file)
+        os.replace(temporary_path, self.cache_file)
+
+
+def _region(aws_session: AwsSession) -> str:
+    return aws_session.boto_session.region_name
+
+
+def _session_key(aws_session: AwsSession) -> Tuple[int, str]:
+    return id(aws_session), _region(aws_session)
+
+
+def _file_key(aws_session: AwsSession) -> str:
+    # Other processes have other sessions, so entries of the file are keyed by
+    # a digest of the access key, which identifies the account, and region.
+    get_credentials = getattr(aws_session.boto_session, "get_credentials", None)
+    credentials = get_credentials() if get_credentials is not None else None
+    access_key = getattr(credentials, "access_key", None) or ""
+    digest = hashlib.sha256(access_key.encode()).hexdigest()[:16]
+    return f"{digest}/{_region(aws_session)}"
+
+
+def _search_summaries(aws_session: AwsSession) -> List[DeviceSummary]:
+    # Same devices as AwsDevice.get_devices, i.e. QPUs of all regions and
+    # simulators of the session's region, but without a GetDevice call each.
+    session_region = _region(aws_session)
+    summaries: Dict[str, DeviceSummary] = {}
+    for region in AwsDevice.REGIONS:
+        if region == session_region:
+            session_for_region = aws_session
+            types = [AwsDeviceType.QPU, AwsDeviceType.SIMULATOR]
+        else:
+            session_for_region = AwsSession.copy_session(aws_session, region)
+            types = [AwsDeviceType.QPU]
+        try:
+            results = session_for_region.search_devices(types=types)
+        except ClientError as error:
+            warnings.warn(
+                f"{error.response['Error']['Code']}: Unable to search region "
+                f"'{region}' for devices. Continuing without devices in it."
+            )
+            continue
+        for result in results:
+            summaries.setdefault(
+                result["deviceArn"],
+                DeviceSummary(
+                    result["deviceName"], result["deviceArn"], result["deviceType"]
+                ),
+            )
+    return sorted(summaries.values(), key=lambda summary: summary.name)
+
+
+default_device_catalog = DeviceCatalog()
+
+# An AwsSession references its boto session, so weak keys would never be
+# released. Sessions are kept in least recently used order instead, keyed by
+# the id of the boto session, which the AwsSession keeps alive.
+_MAX_AWS_SESSIONS = 16
+_aws_sessions: "OrderedDict[int, AwsSession]" = OrderedDict()
+_aws_sessions_lock = threading.Lock()
+
+
+def get_aws_session(boto_session) -> AwsSession:
+    """Returns an AwsSession wrapping the boto session, reused across calls.
+
+    Reusing the AwsSession reuses its Braket and S3 clients together with
+    their connection pools. Sessions of the most recently used boto sessions
+    are kept.
+    """
+    with _aws_sessions_lock:
+        aws_session = _aws_sessions.get(id(boto_session))
+        if aws_session is None:
+            aws_session = AwsSession(boto_session)
+            _aws_sessions[id(boto_session)] = aws_session
+            if len(_aws_sessions) > _MAX_AWS_SESSIONS:
+                _aws_sessions.popitem(last=False)
+        else:
+            _aws_sessions.move_to_end(id(boto_session))
+        return aws_session
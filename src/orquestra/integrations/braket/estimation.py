@@ -0,0 +1,172 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from orquestra.quantum.api.circuit_runner import CircuitRunner
+from orquestra.quantum.api.estimation import EstimationTask
+from orquestra.quantum.circuits import RX, RY, Circuit, I
+from orquestra.quantum.measurements import ExpectationValues
+from orquestra.quantum.operators import PauliRepresentation, PauliSum, PauliTerm
+
+
+def group_qubitwise_commuting_terms(
+    operator: PauliRepresentation,
+) -> List[List[PauliTerm]]:
+    """Greedily partitions non-constant terms into qubit-wise commuting groups.
+
+    Terms are visited in order of decreasing magnitude of their coefficients
+    and each one is added to the first group it qubit-wise commutes with.
+
+    Args:
+        operator: operator whose terms are grouped
+
+    Returns:
+        List of groups, each being a list of terms of the operator
+    """
+    groups: List[Tuple[Dict[int, str], List[PauliTerm]]] = []
+    terms = sorted(
+        (term for term in operator.terms if not term.is_constant),
+        key=lambda term: -abs(term.coefficient),
+    )
+    for term in terms:
+        for context, group in groups:
+            if all(context.get(qubit, op) == op for qubit, op in term.operations):
+                context.update(term.operations)
+                group.append(term)
+                break
+        else:
+            groups.append((dict(term.operations), [term]))
+    return [group for _, group in groups]
+
+
+def allocate_shots_by_coefficients(
+    groups: Sequence[Sequence[PauliTerm]], n_shots: int
+) -> List[int]:
+    """Splits a budget of shots between groups of terms.
+
+    Each group gets one shot, and the remaining shots are split
+    proportionally to the sums of magnitudes of groups' coefficients by the
+    largest remainder method, so that numbers of shots add up to n_shots. If
+    there are fewer shots than groups, each group still gets one shot.
+
+    Args:
+        groups: groups of terms, e.g. from group_qubitwise_commuting_terms
+        n_shots: total number of shots to distribute
+
+    Returns:
+        Number of shots for each group
+    """
+    weights = np.array(
+        [sum(abs(term.coefficient) for term in group) for group in groups], float
+    )
+    if weights.sum() == 0:
+        weights = np.ones(len(groups))
+    remaining = max(0, n_shots - len(groups))
+    shares = remaining * weights / weights.sum()
+    allocation = np.floor(shares).astype(int)
+    leftover = remaining - int(allocation.sum())
+    # Stable sort, so that ties go to earlier groups.
+    by_remainder = np.argsort(allocation - shares, kind="stable")
+    allocation[by_remainder[:leftover]] += 1
+    return [1 + int(n) for n in allocation]
+
+
+def estimate_expectation_values_by_qwc_grouping(
+    runner: CircuitRunner,
+    estimation_tasks: List[EstimationTask],
+    allocate_shots: bool = True,
+) -> List[ExpectationValues]:
+    """Estimates expectation values by sampling qubit-wise commuting groups.
+
+    Terms of each task's operator are partitioned into qubit-wise commuting
+    groups. For every group, basis-change rotations are appended to the task's
+    circuit, and circuits of all groups of all tasks are run as a single batch.
+    Estimates of all terms in a group are computed from the same measurements.
+
+    Args:
+        runner: runner used for executing circuits
+        estimation_tasks: list of estimation tasks
+        allocate_shots: if True, number_of_shots of a task is the total budget,
+            split between its groups proportionally to their coefficients.
+            Otherwise every group is run number_of_shots times.
+
+    Returns:
+        ExpectationValues for each task. Values correspond to terms of the
+        task's operator (in the same order) and include their coefficients.
+    """
+    circuits: List[Circuit] = []
+    n_samples: List[int] = []
+    frames: List[Tuple[int, List[PauliTerm]]] = []
+
+    for task_index, task in enumerate(estimation_tasks):
+        groups = group_qubitwise_commuting_terms(task.operator)
+        if not groups:
+            continue
+        if task.number_of_shots is None or task.number_of_shots <= 0:
+            raise ValueError("Sampling estimation requires positive number_of_shots")
+        shots = (
+            allocate_shots_by_coefficients(groups, task.number_of_shots)
+            if allocate_shots
+            else [task.number_of_shots] * len(groups)
+        )
+        n_qubits = max(task.circuit.n_qubits, task.operator.n_qubits)
+        for group, group_shots in zip(groups, shots):
+            circuits.append(_measurement_circuit(task.circuit, group, n_qubits))
+            n_samples.append(group_shots)
+            frames.append((task_index, group))
+
+    measurements_list = (
+        runner.run_batch_and_measure(circuits, n_samples) if circuits else []
+    )
+
+    term_values: List[Dict[int, float]] = [{} for _ in estimation_tasks]
+    for (task_index, group), measurements in zip(frames, measurements_list):
+        frame_operator = PauliSum(
+            [
+                PauliTerm({qubit: "Z" for qubit in term.qubits}, term.coefficient)
+                for term in group
+            ]
+        )
+        values = measurements.get_expectation_values(frame_operator).values
+        for term, value in zip(group, values):
+            term_values[task_index][id(term)] = np.real(value)
+
+    return [
+        ExpectationValues(
+            np.array(
+                [
+                    np.real(term.coefficient) if term.is_constant else values[id(term)]
+                    for term in task.operator.terms
+                ]
+            )
+        )
+        for task, values in zip(estimation_tasks, term_values)
+    ]
+
+
+def _measurement_circuit(
+    circuit: Circuit, group: Sequence[PauliTerm], n_qubits: int
+) -> Circuit:
+    measurement_circuit = Circuit(circuit.operations, n_qubits=n_qubits)
+    context: Dict[int, str] = {}
+    for term in group:
+        context.update(term.operations)
+    for qubit, op in sorted(context.items()):
+        if op == "X":
+            measurement_circuit += RY(-np.pi / 2)(qubit)
+        elif op == "Y":
+            measurement_circuit += RX(np.pi / 2)(qubit)
+
+    # Braket measures only the qubits that are acted on, so identities make
+    # sure that bitstrings are indexed by the qubits of the operator.
+    used_qubits = {
+        qubit
+        for operation in measurement_circuit.operations
+        for qubit in operation.qubit_indices
+    }
+    for qubit in range(n_qubits):
+        if qubit not in used_qubits:
+            measurement_circuit += I(qubit)
+    return measurement_circuit
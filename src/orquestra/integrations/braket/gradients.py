@@ -0,0 +1,223 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import sympy
+from braket.circuits import FreeParameter
+from braket.device_schema import DeviceActionType
+from orquestra.quantum.api.estimation import EstimationTask
+from orquestra.quantum.circuits import XX, YY, Circuit
+from orquestra.quantum.operators import PauliRepresentation
+
+from orquestra.integrations.braket.conversions import (
+    export_to_braket_observable,
+    export_to_braket_template,
+)
+from orquestra.integrations.braket.conversions._operator_conversions import (
+    _group_identical_terms,
+)
+from orquestra.integrations.braket.estimation import (
+    estimate_expectation_values_by_qwc_grouping,
+)
+from orquestra.integrations.braket.runner import BraketRunner
+from orquestra.integrations.braket.simulator import _BraketWavefunctionSimulator
+
+# Gates exp(-i * angle * G / 2), up to a global phase, where G has two
+# eigenvalues differing by 2. Derivatives of expectation values with respect
+# to their angle are given exactly by the two-term parameter-shift rule.
+_SHIFTABLE_GATES = {"RX", "RY", "RZ", "PHASE", "CPHASE", "XX", "YY", "ZZ"}
+
+_SHIFT = np.pi / 2
+
+
+@dataclass(frozen=True)
+class _Slot:
+    """Angle of a gate in the shift template, as a function of the symbols."""
+
+    symbol: sympy.Symbol
+    expression: sympy.Expr
+    factor: float
+
+
+def parameter_shift_gradient(
+    runner: BraketRunner,
+    circuit: Circuit,
+    operator: PauliRepresentation,
+    params: Sequence[float],
+    n_samples: Optional[int] = None,
+) -> np.ndarray:
+    """Computes the gradient of an expectation value with the parameter-shift rule.
+
+    The angle of every gate depending on symbols is shifted by +-pi/2, each
+    XY gate being decomposed into commuting XX and YY gates first. Each gate
+    is shifted once, however many symbols its angle depends on, and
+    derivatives with respect to the symbols follow from the chain rule. All
+    shifted circuits are evaluated together: as a single parameter sweep of
+    a simulator, or as a single batch of sampled circuits otherwise.
+
+    Args:
+        runner: runner evaluating the shifted circuits
+        circuit: the symbolic circuit preparing the state
+        operator: operator whose expectation value is differentiated
+        params: values of circuit.free_symbols, in the same order
+        n_samples: number of samples used to estimate each expectation value.
+            If None, exact expectation values of a wavefunction simulator
+            are used.
+
+    Returns:
+        Array of derivatives with respect to circuit.free_symbols
+    """
+    symbols = circuit.free_symbols
+    if len(params) != len(symbols):
+        raise ValueError(f"Expected {len(symbols)} parameters, got {len(params)}")
+    values = dict(zip(symbols, params))
+
+    template, slots = _shift_template(circuit)
+    if not slots:
+        return np.zeros(len(symbols))
+
+    base = np.array(
+        [slot.factor * float(slot.expression.subs(values)) for slot in slots]
+    )
+    shifts = _SHIFT * np.eye(len(slots))
+    rows = np.concatenate([base + shifts, base - shifts])
+    # The order of columns has to follow template.free_symbols.
+    slot_indices = {slot.symbol: index for index, slot in enumerate(slots)}
+    columns = [slot_indices[symbol] for symbol in template.free_symbols]
+    shifted_values = _evaluate(runner, template, operator, rows[:, columns], n_samples)
+    slot_derivatives = (shifted_values[: len(slots)] - shifted_values[len(slots) :]) / 2
+
+    gradient = np.zeros(len(symbols))
+    for slot, slot_derivative in zip(slots, slot_derivatives):
+        for index, symbol in enumerate(symbols):
+            chain = slot.factor * float(slot.expression.diff(symbol).subs(values))
+            gradient[index] += slot_derivative * chain
+    return gradient
+
+
+def adjoint_gradient(
+    runner: BraketRunner,
+    circuit: Circuit,
+    operator: PauliRepresentation,
+    params: Sequence[float],
+) -> np.ndarray:
+    """Computes the gradient of an expectation value with the adjoint method.
+
+    The gradient is requested as Braket's AdjointGradient result type, so it
+    costs a single task, independently of the number of parameters. It is
+    supported only by devices advertising this result type, like SV1.
+
+    Args:
+        runner: runner whose device computes the gradient
+        circuit: the symbolic circuit preparing the state
+        operator: operator whose expectation value is differentiated. Its
+            coefficients have to be real.
+        params: values of circuit.free_symbols, in the same order
+
+    Returns:
+        Array of derivatives with respect to circuit.free_symbols
+    """
+    if not _supports_adjoint_gradient(runner.device):
+        raise ValueError(
+            f"Device {runner.device.name} doesn't support adjoint gradients"
+        )
+    _, grouped_terms = _group_identical_terms(operator)
+    template = export_to_braket_template(circuit)
+    if not grouped_terms or not template.symbols:
+        return np.zeros(len(template.symbols))
+
+    observable = None
+    targets = []
+    for term, coefficient in grouped_terms.values():
+        term_observable, qubits = export_to_braket_observable(term)
+        term_observable = complex(coefficient).real * term_observable
+        observable = (
+            term_observable if observable is None else observable + term_observable
+        )
+        targets.append(qubits)
+    braket_circuit = template.circuit.copy()
+    braket_circuit.adjoint_gradient(
+        observable=observable,
+        target=targets[0] if len(targets) == 1 else targets,
+        parameters=[FreeParameter(symbol.name) for symbol in template.symbols],
+    )
+    result = runner._run_task(braket_circuit, 0, inputs=template.inputs(params))
+    runner._n_jobs_executed += 1
+    runner._n_circuits_executed += 1
+
+    gradient = result.values[0]["gradient"]
+    return np.array([gradient[symbol.name] for symbol in template.symbols])
+
+
+def _shift_template(circuit: Circuit) -> Tuple[Circuit, List[_Slot]]:
+    # Replaces the angle of each gate depending on symbols with a new symbol,
+    # so that all shifted circuits are bindings of the same circuit.
+    operations = []
+    slots: List[_Slot] = []
+
+    def new_symbol(expression, factor):
+        slot = _Slot(sympy.Symbol(f"shift_{len(slots)}"), expression, factor)
+        slots.append(slot)
+        return slot.symbol
+
+    for operation in circuit.operations:
+        param = operation.params[0] if operation.params else None
+        if not isinstance(param, sympy.Expr) or not param.free_symbols:
+            operations.append(operation)
+        elif operation.gate.name in _SHIFTABLE_GATES:
+            symbol = new_symbol(param, 1.0)
+            operations.append(
+                operation.gate.replace_params((symbol,))(*operation.qubit_indices)
+            )
+        elif operation.gate.name == "XY":
+            # XY(angle) = XX(-angle / 2) YY(-angle / 2), which commute.
+            qubits = operation.qubit_indices
+            operations.append(XX(new_symbol(param, -0.5))(*qubits))
+            operations.append(YY(new_symbol(param, -0.5))(*qubits))
+        else:
+            raise ValueError(
+                f"Gate {operation.gate.name} is not supported by the "
+                "parameter-shift rule"
+            )
+    return Circuit(operations, n_qubits=circuit.n_qubits), slots
+
+
+def _evaluate(
+    runner: BraketRunner,
+    template: Circuit,
+    operator: PauliRepresentation,
+    rows: np.ndarray,
+    n_samples: Optional[int],
+) -> np.ndarray:
+    if n_samples is None:
+        if not isinstance(runner, _BraketWavefunctionSimulator):
+            raise ValueError("Exact gradients require a wavefunction simulator")
+        return runner.get_exact_expectation_values_for_params(template, operator, rows)
+
+    symbols = template.free_symbols
+    tasks = [
+        EstimationTask(operator, template.bind(dict(zip(symbols, row))), n_samples)
+        for row in rows.tolist()
+    ]
+    return np.array(
+        [
+            np.sum(values.values)
+            for values in estimate_expectation_values_by_qwc_grouping(
+                runner, tasks, allocate_shots=False
+            )
+        ]
+    )
+
+
+def _supports_adjoint_gradient(device) -> bool:
+    try:
+        action = device.properties.action[DeviceActionType.OPENQASM]
+    except (AttributeError, KeyError):
+        return False
+    return any(
+        result_type.name == "AdjointGradient"
+        for result_type in action.supportedResultTypes
+    )
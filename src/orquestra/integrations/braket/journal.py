@@ -0,0 +1,142 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import json
+import os
+import tempfile
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple, Union
+
+# Tasks in these states have no results to reattach to.
+_UNUSABLE_STATES = ("FAILED", "CANCELLED")
+
+
+class TaskJournal:
+    """Durable record of submitted tasks, letting a new process reattach to them.
+
+    Each submission is appended to a file, with a key describing the program,
+    device, number of shots and inputs of the task, the task's ARN and where
+    its results are stored. Once the result of a task has been read, the
+    task is marked as completed.
+
+    A journal opened on an existing file remembers tasks which weren't
+    completed by the process which wrote it. When a task with the same key
+    is submitted again, `reattach` returns the remembered task instead, so
+    that its results are downloaded once it finishes rather than paid for
+    twice. Failed and cancelled tasks are skipped. Tasks submitted by the
+    current process are never reattached, so running the same circuit twice
+    still runs two tasks.
+
+    Args:
+        path: file in which submissions are recorded. It is created if it
+            doesn't exist.
+        load_task: function returning the task with given ARN. Defaults to
+            AwsQuantumTask.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        load_task: Optional[Callable[[str], Any]] = None,
+    ):
+        self.path = Path(path)
+        if load_task is None:
+            # Imported here, so that local workloads don't import braket.aws.
+            from braket.aws import AwsQuantumTask
+
+            load_task = AwsQuantumTask
+        self.load_task = load_task
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Deque[Dict]] = defaultdict(deque)
+        for entry in self._read_pending():
+            self._pending[entry["key"]].append(entry)
+        self._rewrite()
+
+    @property
+    def n_pending(self) -> int:
+        """Number of tasks of previous processes which can be reattached."""
+        with self._lock:
+            return sum(len(entries) for entries in self._pending.values())
+
+    def reattach(self, key: str):
+        """Returns an uncompleted task of a previous process with the key, if any."""
+        while True:
+            with self._lock:
+                entries = self._pending.get(key)
+                if not entries:
+                    return None
+                entry = entries.popleft()
+            try:
+                task = self.load_task(entry["task_id"])
+                if task.state() not in _UNUSABLE_STATES:
+                    return task
+            except Exception:
+                # Tasks which can't be loaded anymore are resubmitted.
+                pass
+            self.complete(entry["task_id"])
+
+    def record(
+        self,
+        key: str,
+        task_id: str,
+        shots: int,
+        s3_destination_folder: Optional[Union[str, Tuple]] = None,
+    ):
+        """Records the submission of a task."""
+        self._append(
+            {
+                "event": "submitted",
+                "key": key,
+                "task_id": task_id,
+                "shots": shots,
+                "s3_destination_folder": s3_destination_folder,
+            }
+        )
+
+    def complete(self, task_id: str):
+        """Records that the result of the task was read."""
+        self._append({"event": "completed", "task_id": task_id})
+
+    def _append(self, entry: Dict):
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            with open(self.path, "a") as file:
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+
+    def _read_pending(self) -> Iterable[Dict]:
+        submitted: Dict[str, Dict] = {}
+        try:
+            with open(self.path) as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # The last line may be truncated by a crash.
+                        continue
+                    if entry["event"] == "submitted":
+                        submitted[entry["task_id"]] = entry
+                    else:
+                        submitted.pop(entry["task_id"], None)
+        except FileNotFoundError:
+            pass
+        return submitted.values()
+
+    def _rewrite(self):
+        # Compacts the file down to the uncompleted submissions.
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.path.parent, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "w") as file:
+                for entries in self._pending.values():
+                    for entry in entries:
+                        file.write(json.dumps(entry) + "\n")
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
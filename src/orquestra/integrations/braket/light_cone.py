@@ -0,0 +1,80 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from typing import Iterable, List, Sequence, Set, Tuple
+
+from orquestra.quantum.circuits import Circuit, I
+from orquestra.quantum.operators import PauliTerm
+
+
+def light_cone(circuit: Circuit, qubits: Iterable[int]) -> Circuit:
+    """Restricts the circuit to operations which can affect the given qubits.
+
+    The backward light cone of the qubits contains every operation acting on
+    them, and, recursively, every earlier operation acting on qubits of an
+    operation in the cone. Measurements of the qubits after the cone have the
+    same distribution as after the whole circuit. Qubits which aren't acted
+    on by the cone get an identity gate, so that they are part of its
+    register.
+
+    Args:
+        circuit: the circuit to restrict
+        qubits: qubits whose measurements are kept
+
+    Returns:
+        Circuit with the operations of the cone, in their original order
+    """
+    qubits = set(qubits)
+    operations, _ = _backward_cone(circuit, qubits)
+    acted_on = {qubit for operation in operations for qubit in operation.qubit_indices}
+    operations += [I(qubit) for qubit in sorted(qubits - acted_on)]
+    return Circuit(operations, n_qubits=circuit.n_qubits)
+
+
+def light_cone_groups(
+    circuit: Circuit, terms: Sequence[PauliTerm]
+) -> List[Tuple[Circuit, List[int]]]:
+    """Groups Pauli terms whose expectation values can share a light cone.
+
+    Terms are considered from the one with the largest light cone, and each
+    joins the first group whose light cone doesn't gain any qubit by
+    including it. Expectation values of the terms of a group are those of the
+    state prepared by the group's cone, which is simulated on its qubits only.
+
+    Args:
+        circuit: the circuit preparing the state
+        terms: Pauli terms to measure
+
+    Returns:
+        List of light cones of groups, each with indices of its terms
+    """
+    cone_sizes = [len(_backward_cone(circuit, set(term.qubits))[1]) for term in terms]
+    groups: List[Tuple[Set[int], Set[int], List[int]]] = []
+    for index in sorted(range(len(terms)), key=lambda index: -cone_sizes[index]):
+        support = set(terms[index].qubits)
+        for group_support, cone_qubits, indices in groups:
+            joint_support = group_support | support
+            if len(_backward_cone(circuit, joint_support)[1]) == len(cone_qubits):
+                group_support.update(support)
+                indices.append(index)
+                break
+        else:
+            groups.append((support, _backward_cone(circuit, support)[1], [index]))
+
+    return [
+        (light_cone(circuit, group_support), sorted(indices))
+        for group_support, _, indices in groups
+    ]
+
+
+def _backward_cone(circuit: Circuit, qubits: Set[int]) -> Tuple[List, Set[int]]:
+    # Operations of the cone in their original order, and the qubits of the
+    # register they are simulated on.
+    cone_qubits = set(qubits)
+    operations = []
+    for operation in reversed(circuit.operations):
+        if not cone_qubits.isdisjoint(operation.qubit_indices):
+            operations.append(operation)
+            cone_qubits.update(operation.qubit_indices)
+    operations.reverse()
+    return operations, cone_qubits
@@ -0,0 +1,166 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from braket.circuits import Noise
+from braket.circuits.serialization import IRType
+from braket.devices import LocalSimulator
+from braket.ir.openqasm import Program
+
+from orquestra.integrations.braket.cache import ResultCache
+from orquestra.integrations.braket.metrics import MetricsSink, TaskRecord
+from orquestra.integrations.braket.runner import BraketRunner, _choose_local_backend
+
+_worker_simulator: Optional[LocalSimulator] = None
+
+
+def _initialize_worker(backend: str):
+    global _worker_simulator
+    _worker_simulator = LocalSimulator(backend=backend)
+
+
+def _run_programs(tasks: Sequence[Tuple[str, int]]) -> List[Dict[str, int]]:
+    assert _worker_simulator is not None
+    return [
+        dict(
+            _worker_simulator.run(Program(source=source, inputs={}), shots=shots)
+            .result()
+            .measurement_counts
+        )
+        for source, shots in tasks
+    ]
+
+
+class LocalPoolRunner(BraketRunner):
+    """Runner simulating batches of circuits on a pool of worker processes.
+
+    Each worker holds its own LocalSimulator for the whole lifetime of the
+    pool. Circuits are sent to workers as OpenQASM source, in chunks of
+    chunksize circuits, and results are returned in the order of the batch.
+    Single circuits are simulated in the current process.
+
+    Args:
+        backend: name of the Braket local simulator, e.g. "braket_sv"
+        noise_model: optional noise model for the simulator
+        n_workers: number of worker processes. Defaults to the number of CPUs.
+        chunksize: number of circuits sent to a worker at once
+        cache: optional on-disk cache of results
+        metrics: optional sink receiving durations of phases and descriptions
+            of simulated circuits
+    """
+
+    def __init__(
+        self,
+        backend: str = "braket_sv",
+        noise_model: Optional[Type[Noise]] = None,
+        n_workers: Optional[int] = None,
+        chunksize: int = 1,
+        cache: Optional[ResultCache] = None,
+        metrics: Optional[MetricsSink] = None,
+    ):
+        super().__init__(
+            LocalSimulator(backend=backend),
+            noise_model,
+            cache=cache,
+            metrics=metrics,
+        )
+        self.backend = backend
+        self.n_workers = n_workers
+        self.chunksize = chunksize
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                initializer=_initialize_worker,
+                initargs=(self.backend,),
+            )
+        return self._executor
+
+    def close(self):
+        """Shuts down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run_braket_batch(
+        self, braket_circuits: Sequence, samples_per_circuit: Sequence[int]
+    ) -> List[Dict[str, int]]:
+        if not braket_circuits:
+            return []
+        with self.metrics.phase("submission"):
+            tasks = [
+                (braket_circuit.to_ir(IRType.OPENQASM).source, n_samples)
+                for braket_circuit, n_samples in zip(
+                    braket_circuits, samples_per_circuit
+                )
+            ]
+            chunks = [
+                tasks[start : start + self.chunksize]
+                for start in range(0, len(tasks), self.chunksize)
+            ]
+        with self.metrics.phase("result"):
+            counts_list = [
+                counts
+                for chunk_counts in self._get_executor().map(_run_programs, chunks)
+                for counts in chunk_counts
+            ]
+        if self.metrics.enabled:
+            for braket_circuit, (source, n_samples) in zip(braket_circuits, tasks):
+                self.metrics.record_task(
+                    TaskRecord(
+                        None,
+                        n_samples,
+                        braket_circuit.qubit_count,
+                        len(braket_circuit.instructions),
+                        len(source.encode()),
+                    )
+                )
+            self.metrics.increment(
+                "result_bytes",
+                sum(len(json.dumps(counts).encode()) for counts in counts_list),
+            )
+        return counts_list
+
+
+def braket_local_pool_runner(
+    backend: Optional[str] = None,
+    noise_model: Optional[Type[Noise]] = None,
+    n_workers: Optional[int] = None,
+    chunksize: int = 1,
+    cache: Optional[ResultCache] = None,
+    metrics: Optional[MetricsSink] = None,
+) -> LocalPoolRunner:
+    """
+    Create a runner simulating batches on a pool of Braket local simulators
+
+    Args:
+        backend: name of the Braket local simulator
+        noise_model: optional noise model for the simulator
+        n_workers: number of worker processes. Defaults to the number of CPUs.
+        chunksize: number of circuits sent to a worker at once
+        cache: optional on-disk cache of results
+        metrics: optional sink receiving durations of phases and descriptions
+            of simulated circuits
+
+    Returns:
+        LocalPoolRunner
+    """
+    return LocalPoolRunner(
+        _choose_local_backend(backend, noise_model),
+        noise_model,
+        n_workers,
+        chunksize,
+        cache,
+        metrics,
+    )
@@ -0,0 +1,121 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from orquestra.quantum.distributions import MeasurementOutcomeDistribution
+from orquestra.quantum.measurements import Measurements
+
+
+class CountsMeasurements(Measurements):
+    """Measurements stored as counts of measured bitstrings.
+
+    Counts, distributions and expectation values are computed directly from
+    the counts. Bitstrings of individual shots are only materialized when
+    `bitstrings` is iterated or indexed.
+
+    Args:
+        counts: mapping of bitstrings (e.g. "001") to the number of times
+            they were measured.
+    """
+
+    def __init__(self, counts: Optional[Dict[str, int]] = None):
+        self._counts: Dict[str, int] = {}
+        if counts is not None:
+            self.add_counts(counts)
+
+    @classmethod
+    def from_counts(cls, counts: Dict[str, int]):
+        return cls(counts)
+
+    @classmethod
+    def from_array(cls, measurements: np.ndarray) -> "CountsMeasurements":
+        """Create measurements from a 2D array of bits, with a row for each shot.
+
+        Args:
+            measurements: array of shape (n_shots, n_qubits) with values 0 and 1
+        """
+        measurements = np.asarray(measurements, dtype=np.uint8)
+        if measurements.size == 0:
+            return cls()
+        rows, counts = np.unique(measurements, axis=0, return_counts=True)
+        return cls(
+            {
+                "".join(map(str, row)): int(count)
+                for row, count in zip(rows.tolist(), counts)
+            }
+        )
+
+    @property  # type: ignore[override]
+    def bitstrings(self) -> Sequence[Tuple[int, ...]]:
+        return _BitstringsView(self._counts)
+
+    @bitstrings.setter
+    def bitstrings(self, bitstrings: List[Tuple[int, ...]]):
+        self._counts = {}
+        self.add_counts(
+            Counter("".join(map(str, bitstring)) for bitstring in bitstrings)
+        )
+
+    @property
+    def n_samples(self) -> int:
+        """Total number of measured shots."""
+        return sum(self._counts.values())
+
+    def get_counts(self):
+        return dict(self._counts)
+
+    def add_counts(self, counts: Dict[str, int]):
+        for bitstring, count in counts.items():
+            self._counts[bitstring] = self._counts.get(bitstring, 0) + int(count)
+
+    def get_distribution(self) -> MeasurementOutcomeDistribution:
+        n_samples = self.n_samples
+        return MeasurementOutcomeDistribution(
+            {bitstring: count / n_samples for bitstring, count in self._counts.items()}
+        )
+
+    def get_bitstrings_array(self) -> np.ndarray:
+        """Get measurements as an array of shape (n_shots, n_qubits) of uint8 bits.
+
+        Rows with the same bitstring are contiguous.
+        """
+        if not self._counts:
+            return np.zeros((0, 0), dtype=np.uint8)
+        unique = np.array(
+            [[int(bit) for bit in bitstring] for bitstring in self._counts],
+            dtype=np.uint8,
+        )
+        return np.repeat(unique, list(self._counts.values()), axis=0)
+
+
+class _BitstringsView(Sequence):
+    """Read-only sequence of per-shot bitstrings, expanded on first access."""
+
+    def __init__(self, counts: Dict[str, int]):
+        self._counts = counts
+        self._expanded: Optional[List[Tuple[int, ...]]] = None
+
+    def __len__(self) -> int:
+        return sum(self._counts.values())
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        for bitstring, count in self._counts.items():
+            measurement = tuple(int(bit) for bit in bitstring)
+            for _ in range(count):
+                yield measurement
+
+    def __getitem__(self, index):
+        if self._expanded is None:
+            self._expanded = list(self)
+        return self._expanded[index]
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
@@ -0,0 +1,183 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import ContextManager, Deque, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class TaskRecord:
+    """Description of a task submitted to a Braket device."""
+
+    task_id: Optional[str]
+    shots: int
+    n_qubits: Optional[int]
+    n_gates: Optional[int]
+    program_bytes: Optional[int]
+
+
+class MetricsSink:
+    """Receiver of durations of phases and counters of runners and simulators.
+
+    This class ignores everything it receives and is the default sink, so
+    that instrumentation costs nothing unless a sink is configured. Sinks
+    recording metrics subclass it, set `enabled` to True and override the
+    `record_*` and `increment` methods.
+
+    Phases reported by runners are "optimization", "conversion", "noise",
+    "submission", "result" (queueing, execution and download of results),
+    "measurements" and, for the "numpy" engine of simulators, "simulation".
+    Besides counters of recorded tasks, runners increment "result_bytes" by
+    the size of results they receive.
+    """
+
+    enabled = False
+
+    def phase(self, name: str) -> ContextManager:
+        """Context manager recording the duration of its body as given phase."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _TimedPhase(self, name)
+
+    def record_duration(self, phase: str, seconds: float):
+        pass
+
+    def record_task(self, task: TaskRecord):
+        pass
+
+    def increment(self, name: str, value: float = 1):
+        pass
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+NULL_METRICS = MetricsSink()
+
+
+class _TimedPhase:
+    def __init__(self, sink: MetricsSink, name: str):
+        self._sink = sink
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._sink.record_duration(self._name, time.perf_counter() - self._start)
+        return False
+
+
+@dataclass
+class PhaseStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+class InMemoryMetrics(MetricsSink):
+    """Sink aggregating metrics in memory, exportable in Prometheus format.
+
+    Args:
+        max_tasks: number of most recent task records which are kept.
+    """
+
+    enabled = True
+
+    def __init__(self, max_tasks: int = 1000):
+        self._lock = threading.Lock()
+        self.phases: Dict[str, PhaseStats] = defaultdict(PhaseStats)
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.tasks: Deque[TaskRecord] = deque(maxlen=max_tasks)
+
+    def record_duration(self, phase: str, seconds: float):
+        with self._lock:
+            stats = self.phases[phase]
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+
+    def record_task(self, task: TaskRecord):
+        with self._lock:
+            self.tasks.append(task)
+            self.counters["tasks"] += 1
+            self.counters["shots"] += task.shots
+            if task.n_gates is not None:
+                self.counters["gates"] += task.n_gates
+            if task.program_bytes is not None:
+                self.counters["program_bytes"] += task.program_bytes
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def to_prometheus(self, prefix: str = "orquestra_braket") -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines: List[str] = []
+            if self.phases:
+                name = f"{prefix}_phase_seconds"
+                lines.append(f"# TYPE {name} summary")
+                for phase, stats in sorted(self.phases.items()):
+                    lines.append(f'{name}_sum{{phase="{phase}"}} {stats.total_seconds}')
+                    lines.append(f'{name}_count{{phase="{phase}"}} {stats.count}')
+            for counter, value in sorted(self.counters.items()):
+                name = f"{prefix}_{counter}_total"
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryMetrics(MetricsSink):
+    """Sink forwarding metrics to an OpenTelemetry meter.
+
+    Durations are recorded by a histogram with the phase as an attribute,
+    and qubit and gate counts of tasks by histograms as well.
+
+    Args:
+        meter: meter, e.g. from opentelemetry.metrics.get_meter(__name__)
+        prefix: prefix of names of the created instruments
+    """
+
+    enabled = True
+
+    def __init__(self, meter, prefix: str = "orquestra.braket"):
+        self._meter = meter
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._durations = meter.create_histogram(f"{prefix}.phase.duration", unit="s")
+        self._qubits = meter.create_histogram(f"{prefix}.task.qubits")
+        self._gates = meter.create_histogram(f"{prefix}.task.gates")
+        self._counters: Dict[str, object] = {}
+
+    def record_duration(self, phase: str, seconds: float):
+        self._durations.record(seconds, {"phase": phase})
+
+    def record_task(self, task: TaskRecord):
+        self.increment("tasks")
+        self.increment("shots", task.shots)
+        if task.program_bytes is not None:
+            self.increment("program_bytes", task.program_bytes)
+        if task.n_qubits is not None:
+            self._qubits.record(task.n_qubits)
+        if task.n_gates is not None:
+            self._gates.record(task.n_gates)
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            counter = self._counters.get(name)
+            if counter is None:
+                counter = self._meter.create_counter(f"{self._prefix}.{name}")
+                self._counters[name] = counter
+        counter.add(value)  # type: ignore
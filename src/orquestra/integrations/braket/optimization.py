@@ -0,0 +1,302 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import sympy
+from orquestra.quantum.circuits import RY, RZ, Circuit, I
+
+from orquestra.integrations.braket.statevector import _bound_angle, _gate_matrix
+
+Pass = Callable[[List], List]
+
+_SELF_INVERSE_GATES = {"X", "Y", "Z", "H", "CNOT", "CZ", "SWAP"}
+
+# Gates whose action doesn't change when their qubits are swapped.
+_SYMMETRIC_GATES = {"CZ", "SWAP", "CPHASE", "XX", "YY", "ZZ", "XY"}
+
+# Rotations composing by adding their angles, and the periods after which
+# they are exactly the identity.
+_ROTATION_PERIODS = {
+    "RX": 4 * np.pi,
+    "RY": 4 * np.pi,
+    "RZ": 4 * np.pi,
+    "XX": 4 * np.pi,
+    "YY": 4 * np.pi,
+    "ZZ": 4 * np.pi,
+    "XY": 4 * np.pi,
+    "PHASE": 2 * np.pi,
+    "CPHASE": 2 * np.pi,
+}
+
+_TOLERANCE = 1e-10
+
+
+@dataclass(frozen=True)
+class OptimizationReport:
+    """Numbers of gates and depths of circuits before and after optimization."""
+
+    n_gates_before: int = 0
+    n_gates_after: int = 0
+    depth_before: int = 0
+    depth_after: int = 0
+
+    @property
+    def gate_reduction(self) -> int:
+        return self.n_gates_before - self.n_gates_after
+
+    @property
+    def depth_reduction(self) -> int:
+        return self.depth_before - self.depth_after
+
+    def __add__(self, other: "OptimizationReport") -> "OptimizationReport":
+        return OptimizationReport(
+            self.n_gates_before + other.n_gates_before,
+            self.n_gates_after + other.n_gates_after,
+            self.depth_before + other.depth_before,
+            self.depth_after + other.depth_after,
+        )
+
+
+def strip_identities(operations: List) -> List:
+    """Removes identity gates and rotations by angles equivalent to zero."""
+    return [operation for operation in operations if not _is_identity(operation)]
+
+
+def cancel_inverse_pairs(operations: List) -> List:
+    """Removes pairs of adjacent self-inverse gates, like H H or CNOT CNOT.
+
+    Gates are adjacent if no other gate acts on their qubits in between, and
+    removing a pair can make the gates around it adjacent as well.
+    """
+
+    def cancel(previous, operation):
+        if operation.gate.name in _SELF_INVERSE_GATES and _same_action(
+            previous, operation
+        ):
+            return []
+        return None
+
+    return _combine_adjacent(operations, cancel)
+
+
+def merge_rotations(operations: List) -> List:
+    """Replaces adjacent rotations around the same axis with a single one.
+
+    Rotations by symbolic angles are merged too, and merged rotations by
+    angles equivalent to zero are removed.
+    """
+
+    def merge(previous, operation):
+        name = operation.gate.name
+        if name not in _ROTATION_PERIODS or not _same_action(previous, operation):
+            return None
+        angle = previous.params[0] + operation.params[0]
+        if isinstance(angle, sympy.Expr):
+            angle = sympy.simplify(angle)
+        merged = operation.gate.replace_params((angle,))(*previous.qubit_indices)
+        return [] if _is_identity(merged) else [merged]
+
+    return _combine_adjacent(operations, merge)
+
+
+def fuse_single_qubit_gates(operations: List) -> List:
+    """Replaces runs of single-qubit gates on a qubit with at most 3 rotations.
+
+    The product of gates of each run is decomposed as RZ RY RZ, and the
+    decomposition is used if it has fewer gates than the run. States are
+    preserved up to a global phase. Runs are interrupted by gates acting on
+    more qubits and by gates with symbolic parameters, which are kept.
+    """
+    result = []
+    runs: Dict[int, List] = defaultdict(list)
+
+    def flush(qubit):
+        run = runs.pop(qubit, [])
+        fused = _fuse(run, qubit)
+        result.extend(fused if len(fused) < len(run) else run)
+
+    for operation in operations:
+        qubits = operation.qubit_indices
+        if len(qubits) == 1 and _is_numeric(operation):
+            runs[qubits[0]].append(operation)
+            continue
+        for qubit in qubits:
+            flush(qubit)
+        result.append(operation)
+    for qubit in sorted(runs):
+        flush(qubit)
+    return result
+
+
+DEFAULT_PASSES: Tuple[Pass, ...] = (
+    strip_identities,
+    cancel_inverse_pairs,
+    merge_rotations,
+    fuse_single_qubit_gates,
+)
+
+
+class CircuitOptimizer:
+    """Pipeline of optimization passes applied to circuits before conversion.
+
+    Passes are applied in order, and the whole pipeline is repeated while it
+    keeps removing gates, as removing gates can make others adjacent. Qubits
+    which lose all their gates keep an identity gate, because Braket only
+    measures qubits acted on by gates.
+
+    Args:
+        passes: functions taking and returning lists of operations.
+        max_iterations: maximum number of times the pipeline is repeated.
+    """
+
+    def __init__(self, passes: Sequence[Pass] = DEFAULT_PASSES, max_iterations=10):
+        self.passes = tuple(passes)
+        self.max_iterations = max_iterations
+        self._lock = threading.Lock()
+        self.last_report = OptimizationReport()
+        self.total_report = OptimizationReport()
+
+    def optimize(self, circuit: Circuit) -> Circuit:
+        """Optimizes the circuit and updates last_report and total_report."""
+        operations = list(circuit.operations)
+        for _ in range(self.max_iterations):
+            n_gates = len(operations)
+            for optimization_pass in self.passes:
+                operations = optimization_pass(operations)
+            if len(operations) == n_gates:
+                break
+
+        remaining_qubits = {
+            qubit for operation in operations for qubit in operation.qubit_indices
+        }
+        operations += [
+            I(qubit) for qubit in sorted(_qubits(circuit.operations) - remaining_qubits)
+        ]
+        optimized_circuit = Circuit(operations, n_qubits=circuit.n_qubits)
+
+        report = OptimizationReport(
+            len(circuit.operations),
+            len(operations),
+            _depth(circuit.operations),
+            _depth(operations),
+        )
+        with self._lock:
+            self.last_report = report
+            self.total_report += report
+        return optimized_circuit
+
+
+def _combine_adjacent(
+    operations: List, combine: Callable[[object, object], Optional[List]]
+) -> List:
+    # combine returns None if operations can't be combined, or the list of at
+    # most one operation replacing both of them.
+    result: List = []
+    history: Dict[int, List[int]] = defaultdict(list)
+    for operation in operations:
+        qubits = operation.qubit_indices
+        last_indices = {
+            history[qubit][-1] if history[qubit] else -1 for qubit in qubits
+        }
+        if len(last_indices) == 1:
+            (index,) = last_indices
+            previous = result[index] if index >= 0 else None
+            if previous is not None and set(previous.qubit_indices) == set(qubits):
+                combined = combine(previous, operation)
+                if combined is not None:
+                    if combined:
+                        result[index] = combined[0]
+                    else:
+                        result[index] = None
+                        for qubit in qubits:
+                            history[qubit].pop()
+                    continue
+        for qubit in qubits:
+            history[qubit].append(len(result))
+        result.append(operation)
+    return [operation for operation in result if operation is not None]
+
+
+def _same_action(previous, operation) -> bool:
+    if previous.gate.name != operation.gate.name:
+        return False
+    if previous.qubit_indices == operation.qubit_indices:
+        return True
+    return operation.gate.name in _SYMMETRIC_GATES
+
+
+def _is_identity(operation) -> bool:
+    name = operation.gate.name
+    if name == "I":
+        return True
+    if name not in _ROTATION_PERIODS:
+        return False
+    angle = operation.params[0]
+    if isinstance(angle, sympy.Expr) and angle.free_symbols:
+        return angle == 0
+    remainder = float(angle) % _ROTATION_PERIODS[name]
+    return min(remainder, _ROTATION_PERIODS[name] - remainder) < _TOLERANCE
+
+
+def _is_numeric(operation) -> bool:
+    return not any(
+        isinstance(param, sympy.Expr) and param.free_symbols
+        for param in operation.params
+    )
+
+
+def _fuse(run: List, qubit: int) -> List:
+    if len(run) < 2:
+        return run
+    try:
+        unitary = np.eye(2, dtype=complex)
+        for operation in run:
+            is_diagonal, matrix = _gate_matrix(
+                operation.gate.name, operation.params, np.complex128, _bound_angle
+            )
+            unitary = (np.diag(matrix) if is_diagonal else matrix) @ unitary
+    except RuntimeError:
+        # Gates not supported by Braket are kept for conversion to report them.
+        return run
+
+    # unitary = phase * RZ(alpha) RY(beta) RZ(gamma)
+    special_unitary = unitary / np.sqrt(np.linalg.det(unitary))
+    beta = 2 * np.arctan2(abs(special_unitary[1, 0]), abs(special_unitary[0, 0]))
+    total = (
+        2 * np.angle(special_unitary[1, 1])
+        if abs(special_unitary[1, 1]) > _TOLERANCE
+        else 0.0
+    )
+    difference = (
+        2 * np.angle(special_unitary[1, 0])
+        if abs(special_unitary[1, 0]) > _TOLERANCE
+        else 0.0
+    )
+    alpha, gamma = (total + difference) / 2, (total - difference) / 2
+
+    fused = [RZ(gamma)(qubit), RY(beta)(qubit), RZ(alpha)(qubit)]
+    return [operation for operation in fused if not _is_identity_up_to_phase(operation)]
+
+
+def _is_identity_up_to_phase(operation) -> bool:
+    # Within a fused run, RZ(2 * pi) = -I only changes the global phase.
+    remainder = float(operation.params[0]) % (2 * np.pi)
+    return min(remainder, 2 * np.pi - remainder) < _TOLERANCE
+
+
+def _qubits(operations) -> set:
+    return {qubit for operation in operations for qubit in operation.qubit_indices}
+
+
+def _depth(operations) -> int:
+    depths: Dict[int, int] = defaultdict(int)
+    for operation in operations:
+        depth = 1 + max((depths[qubit] for qubit in operation.qubit_indices), default=0)
+        for qubit in operation.qubit_indices:
+            depths[qubit] = depth
+    return max(depths.values(), default=0)
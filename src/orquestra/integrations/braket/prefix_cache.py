@@ -0,0 +1,165 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike
+from orquestra.quantum.circuits import Circuit
+
+from orquestra.integrations.braket.statevector import _initial_state, apply_operations
+
+
+class PrefixStateCache:
+    """In-memory cache of states prepared by leading blocks of circuits.
+
+    Circuits simulated one after another often share their first operations,
+    e.g. a fixed state preparation followed by a varying ansatz, or circuits
+    differing only in their final basis rotations. While simulating a circuit
+    the cache stores checkpoints, i.e. states prepared by its first
+    checkpoint_interval operations, by its first 2 * checkpoint_interval
+    operations and so on, as well as the state prepared by the longest block
+    of operations shared with the previous circuit, if it was simulated on the
+    same register, with the same precision and initial state.
+    Simulating a circuit starting with a stored block copies the state of the
+    longest such block and applies only the remaining operations, so savings
+    start with the second circuit.
+
+    States are evicted in least recently used order once their total size
+    exceeds max_bytes. States larger than max_bytes aren't stored at all.
+
+    Args:
+        max_bytes: maximum total number of bytes of stored states.
+        checkpoint_interval: number of operations between checkpoints. If
+            None, only blocks shared with the previous circuit are stored.
+    """
+
+    def __init__(self, max_bytes: int = 2**30, checkpoint_interval: Optional[int] = 16):
+        if checkpoint_interval is not None and checkpoint_interval <= 0:
+            raise ValueError(
+                f"Checkpoint interval has to be positive, got {checkpoint_interval}"
+            )
+        self.max_bytes = max_bytes
+        self.checkpoint_interval = checkpoint_interval
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._states: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._n_bytes = 0
+        # Prefix keys of the previous circuit. Keys of different namespaces
+        # differ, so a single list is kept, whatever the number of namespaces.
+        self._last_keys: List[str] = []
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of simulations which started from a stored state."""
+        n_lookups = self.hits + self.misses
+        return self.hits / n_lookups if n_lookups else 0.0
+
+    @property
+    def n_bytes(self) -> int:
+        """Total number of bytes of stored states."""
+        return self._n_bytes
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def clear(self):
+        """Removes all stored states and resets the hit rate."""
+        with self._lock:
+            self._states.clear()
+            self._last_keys = []
+            self._n_bytes = 0
+            self.hits = self.misses = 0
+
+    def simulate(
+        self,
+        circuit: Circuit,
+        dtype: DTypeLike = np.complex128,
+        qubits: Optional[Iterable[int]] = None,
+        initial_state: Optional[ArrayLike] = None,
+    ) -> np.ndarray:
+        """Computes the state prepared by the circuit, reusing stored states.
+
+        Args and returned state are the same as of `simulate_statevector`.
+        """
+        register, state = _initial_state(circuit, dtype, qubits, initial_state)
+        namespace = _namespace(register, state, initial_state is not None)
+        operations = circuit.operations
+        keys = _prefix_keys(namespace, operations)
+
+        with self._lock:
+            length, stored = self._longest_stored_prefix(keys)
+            if stored is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                state = stored.copy()
+            previous_keys, self._last_keys = self._last_keys, keys
+
+        boundaries: Set[int] = set()
+        if self.checkpoint_interval is not None:
+            boundaries.update(
+                range(
+                    self.checkpoint_interval, len(operations), self.checkpoint_interval
+                )
+            )
+        boundaries.add(_common_length(keys, previous_keys))
+        for boundary in sorted(boundaries):
+            if boundary <= length:
+                continue
+            state = apply_operations(state, operations[length:boundary], register)
+            self._store(keys[boundary - 1], state.copy())
+            length = boundary
+        return apply_operations(state, operations[length:], register)
+
+    def _longest_stored_prefix(
+        self, keys: Sequence[str]
+    ) -> Tuple[int, Optional[np.ndarray]]:
+        for length in range(len(keys), 0, -1):
+            stored = self._states.get(keys[length - 1])
+            if stored is not None:
+                self._states.move_to_end(keys[length - 1])
+                return length, stored
+        return 0, None
+
+    def _store(self, key: str, state: np.ndarray):
+        if state.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._states:
+                return
+            self._states[key] = state
+            self._n_bytes += state.nbytes
+            while self._n_bytes > self.max_bytes:
+                _, evicted = self._states.popitem(last=False)
+                self._n_bytes -= evicted.nbytes
+
+
+def _namespace(register: Sequence[int], state: np.ndarray, is_initial: bool) -> str:
+    # Stored states depend on the register, precision and initial state.
+    digest = hashlib.sha1(repr((list(register), state.dtype.str)).encode())
+    if is_initial:
+        digest.update(np.ascontiguousarray(state).tobytes())
+    return digest.hexdigest()
+
+
+def _prefix_keys(namespace: str, operations: Sequence) -> List[str]:
+    digest = hashlib.sha1(namespace.encode())
+    keys = []
+    for operation in operations:
+        digest.update(repr(operation).encode())
+        keys.append(digest.copy().hexdigest())
+    return keys
+
+
+def _common_length(keys: Sequence[str], other_keys: Sequence[str]) -> int:
+    length = 0
+    for key, other_key in zip(keys, other_keys):
+        if key != other_key:
+            break
+        length += 1
+    return length
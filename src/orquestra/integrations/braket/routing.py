@@ -0,0 +1,271 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import math
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from orquestra.quantum.api.circuit_runner import BaseCircuitRunner
+from orquestra.quantum.circuits import Circuit
+from orquestra.quantum.measurements import Measurements
+
+from orquestra.integrations.braket.runner import BraketRunner
+
+
+class DeviceRoute:
+    """A runner to which `RoutingRunner` sends circuits, with its device's limits.
+
+    The time the device takes per circuit is estimated with an exponential
+    moving average of the wall time of batches routed to it, divided by the
+    number of their circuits. Queued tasks of other users are read from the
+    device's queue_depth(), if it has one, at most once per
+    queue_depth_ttl_seconds, and assumed to take as long as routed circuits.
+
+    Args:
+        runner: runner of the device
+        name: name of the route. Defaults to the name of the device.
+        max_qubits: largest number of qubits of circuits sent to the device.
+            Defaults to the qubit count in the device's properties, or to no
+            limit if the properties don't have one.
+        seconds_per_circuit: initial estimate of the time per circuit, used
+            until a batch was run on the device.
+        smoothing: weight of the latest batch in the moving average, between
+            0 and 1.
+        queue_depth_ttl_seconds: number of seconds for which the queue depth
+            read from the device is reused.
+        clock: function returning the current time in seconds.
+    """
+
+    def __init__(
+        self,
+        runner: BraketRunner,
+        name: Optional[str] = None,
+        max_qubits: Optional[int] = None,
+        seconds_per_circuit: float = 1.0,
+        smoothing: float = 0.3,
+        queue_depth_ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"Smoothing has to be in (0, 1], got {smoothing}")
+        self.runner = runner
+        self.name = name if name is not None else runner.device.name
+        self.max_qubits: float = (
+            max_qubits if max_qubits is not None else _device_qubit_count(runner)
+        )
+        self.seconds_per_circuit = seconds_per_circuit
+        self.smoothing = smoothing
+        self.queue_depth_ttl_seconds = queue_depth_ttl_seconds
+        self.n_circuits_routed = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._queue_depth: Optional[Tuple[float, int]] = None
+
+    @property
+    def noisy(self) -> bool:
+        """Whether the runner applies a noise model to circuits."""
+        return self.runner.noise_model is not None
+
+    def accepts(self, circuit: Circuit, noisy: bool) -> bool:
+        """Tells whether the device can run the circuit with given noise."""
+        return self.noisy == noisy and circuit.n_qubits <= self.max_qubits
+
+    def queue_depth(self) -> int:
+        """Number of tasks waiting to run on the device, 0 if it's unknown."""
+        with self._lock:
+            cached = self._queue_depth
+        if (
+            cached is not None
+            and self._clock() - cached[0] < self.queue_depth_ttl_seconds
+        ):
+            return cached[1]
+        queue_depth = self._read_queue_depth()
+        with self._lock:
+            self._queue_depth = (self._clock(), queue_depth)
+        return queue_depth
+
+    def _read_queue_depth(self) -> int:
+        queue_depth = getattr(self.runner.device, "queue_depth", None)
+        if queue_depth is None:
+            return 0
+        try:
+            quantum_tasks = queue_depth().quantum_tasks
+        except Exception:
+            return 0
+        # Long queues are reported as e.g. ">4000".
+        return sum(
+            int(match.group())
+            for size in quantum_tasks.values()
+            for match in [re.search(r"\d+", str(size))]
+            if match is not None
+        )
+
+    def observe(self, n_circuits: int, seconds: float):
+        """Updates the estimate with the wall time of a batch of n_circuits."""
+        with self._lock:
+            self.n_circuits_routed += n_circuits
+            self.seconds_per_circuit += self.smoothing * (
+                seconds / n_circuits - self.seconds_per_circuit
+            )
+
+
+class RoutingRunner(BaseCircuitRunner):
+    """Runner distributing circuits between several Braket devices.
+
+    Each circuit of a batch is sent to one of the devices which can run it,
+    i.e. whose qubit limit it fits and whose runner applies a noise model if
+    and only if noisy is True. Among those, circuits are assigned one by one,
+    most constrained and largest first, to the device expected to finish them
+    earliest, given its queue and the circuits already assigned to it. Parts
+    of the batch sent to different devices run concurrently, and their
+    measurements are merged back in the order of the batch.
+
+    The circuit runner interface has no per-call options, so noisy applies
+    to all circuits run by the runner. To route both noisy and noiseless
+    circuits, create two runners sharing the same routes, which then also
+    share their latency estimates and queue depths.
+
+    Args:
+        routes: devices to route circuits to, as routes or runners. Ties are
+            broken in favour of earlier routes.
+        noisy: whether circuits have to be run with a noise model.
+    """
+
+    def __init__(
+        self,
+        routes: Sequence[Union[DeviceRoute, BraketRunner]],
+        noisy: bool = False,
+    ):
+        super().__init__()
+        if not routes:
+            raise ValueError("At least one route is required")
+        self.routes = [
+            route if isinstance(route, DeviceRoute) else DeviceRoute(route)
+            for route in routes
+        ]
+        self.noisy = noisy
+
+    def route(self, batch: Sequence[Circuit]) -> List[DeviceRoute]:
+        """Chooses the route of each circuit of the batch.
+
+        Raises:
+            ValueError: if no route can run one of the circuits
+        """
+        return [self.routes[route_index] for route_index in self._route_indices(batch)]
+
+    def _route_indices(self, batch: Sequence[Circuit]) -> List[int]:
+        eligible = []
+        for index, circuit in enumerate(batch):
+            indices = [
+                route_index
+                for route_index, route in enumerate(self.routes)
+                if route.accepts(circuit, self.noisy)
+            ]
+            if not indices:
+                raise ValueError(
+                    f"No device can run circuit {index} of {circuit.n_qubits} qubits"
+                    + (" with noise" if self.noisy else " without noise")
+                )
+            eligible.append(indices)
+
+        used_routes = {route_index for indices in eligible for route_index in indices}
+        # Expected number of seconds until each device finishes its work.
+        loads = [
+            (
+                route.queue_depth() * route.seconds_per_circuit
+                if route_index in used_routes
+                else math.inf
+            )
+            for route_index, route in enumerate(self.routes)
+        ]
+        assignments = [0] * len(batch)
+        for index in sorted(
+            range(len(batch)),
+            key=lambda index: (len(eligible[index]), -batch[index].n_qubits),
+        ):
+            best = min(
+                eligible[index],
+                key=lambda route_index: loads[route_index]
+                + self.routes[route_index].seconds_per_circuit,
+            )
+            loads[best] += self.routes[best].seconds_per_circuit
+            assignments[index] = best
+        return assignments
+
+    def _run_and_measure(self, circuit: Circuit, n_samples: int) -> Measurements:
+        (route,) = self.route([circuit])
+        return self._run_on_route(route, [circuit], [n_samples])[0]
+
+    def run_and_measure_async(
+        self, circuit: Circuit, n_samples: int, timeout: Optional[float] = None
+    ) -> "Future[Measurements]":
+        """
+        Submits the circuit to its route without waiting for its outcome
+
+        See `BraketRunner.run_and_measure_async`.
+        """
+        (route,) = self.route([circuit])
+        self._n_jobs_executed += 1
+        self._n_circuits_executed += 1
+        return route.runner.run_and_measure_async(circuit, n_samples, timeout)
+
+    def _run_batch_and_measure(
+        self, batch: Sequence[Circuit], samples_per_circuit: Sequence[int]
+    ) -> List[Measurements]:
+        """
+        Runs parts of the batch on their routes concurrently
+
+        Args:
+            batch: the circuits to run
+            samples_per_circuit: number of samples for each circuit
+
+        Returns:
+            List of Measurements, in the same order as the circuits
+        """
+        indices_per_route: Dict[int, List[int]] = {}
+        for index, route_index in enumerate(self._route_indices(batch)):
+            indices_per_route.setdefault(route_index, []).append(index)
+
+        measurements: List[Optional[Measurements]] = [None] * len(batch)
+        with ThreadPoolExecutor(len(indices_per_route)) as executor:
+            futures = {
+                route_index: executor.submit(
+                    self._run_on_route,
+                    self.routes[route_index],
+                    [batch[index] for index in indices],
+                    [samples_per_circuit[index] for index in indices],
+                )
+                for route_index, indices in indices_per_route.items()
+            }
+            for route_index, future in futures.items():
+                for index, result in zip(
+                    indices_per_route[route_index], future.result()
+                ):
+                    measurements[index] = result
+        self._n_jobs_executed += len(indices_per_route)
+        self._n_circuits_executed += len(batch)
+        return measurements  # type: ignore
+
+    def _run_on_route(
+        self,
+        route: DeviceRoute,
+        circuits: Sequence[Circuit],
+        samples_per_circuit: Sequence[int],
+    ) -> List[Measurements]:
+        start = time.perf_counter()
+        measurements = route.runner.run_batch_and_measure(
+            circuits, list(samples_per_circuit)
+        )
+        route.observe(len(circuits), time.perf_counter() - start)
+        return measurements
+
+
+def _device_qubit_count(runner: BraketRunner) -> float:
+    try:
+        qubit_count = runner.device.properties.paradigm.qubitCount
+    except AttributeError:
+        return math.inf
+    return qubit_count if isinstance(qubit_count, int) else math.inf
@@ -1,15 +1,59 @@
-from typing import List, Optional, Tuple, Type, Union
+import json
+import math
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
-from boto3 import Session  # type: ignore
-from braket.aws import AwsDevice, AwsDeviceType, AwsSession
+import numpy as np
+from braket.circuits import Circuit as BraketCircuit
 from braket.circuits import Noise
+from braket.circuits.serialization import IRType
 from braket.devices import Device, LocalSimulator
 from orquestra.quantum.api.circuit_runner import BaseCircuitRunner
 from orquestra.quantum.circuits import Circuit
 from orquestra.quantum.measurements import Measurements
 
-from orquestra.integrations.braket._utils import _get_arn
-from orquestra.integrations.braket.conversions import export_to_braket
+from orquestra.integrations.braket._futures import _get_task_poller, _resolve
+from orquestra.integrations.braket.cache import ResultCache, _device_id
+from orquestra.integrations.braket.conversions import (
+    BraketCircuitTemplate,
+    export_to_braket,
+    export_to_braket_template,
+)
+from orquestra.integrations.braket.conversions._circuit_conversions import (
+    _circuit_structure,
+)
+from orquestra.integrations.braket.journal import TaskJournal
+from orquestra.integrations.braket.measurements import CountsMeasurements
+from orquestra.integrations.braket.metrics import (
+    NULL_METRICS,
+    MetricsSink,
+    TaskRecord,
+)
+from orquestra.integrations.braket.optimization import CircuitOptimizer
+from orquestra.integrations.braket.s3_results import S3ResultCollector
+
+# boto3 and braket.aws are imported only by functions talking to AWS, so that
+# processes running local simulations don't pay for importing them.
+if TYPE_CHECKING:
+    from boto3 import Session  # type: ignore
+
+
+# Number of optimized templates of symbolic circuits kept by a runner.
+_MAX_OPTIMIZED_TEMPLATES = 128
 
 
 class BraketRunner(BaseCircuitRunner):
@@ -18,6 +62,14 @@ class BraketRunner(BaseCircuitRunner):
         device: Device,
         noise_model: Optional[Type[Noise]] = None,
         s3_destination_folder: Optional[Union[str, Tuple]] = None,
+        max_parallel: Optional[int] = None,
+        cache: Optional[ResultCache] = None,
+        max_shots_per_task: Optional[int] = None,
+        seed: Optional[int] = None,
+        metrics: Optional[MetricsSink] = None,
+        optimizer: Optional[CircuitOptimizer] = None,
+        journal: Optional[TaskJournal] = None,
+        result_collector: Optional[S3ResultCollector] = None,
     ):
         """
         Initiates a runner for Braket supported runners
@@ -30,11 +82,93 @@ class BraketRunner(BaseCircuitRunner):
             string. The bucket name and the folder can be supplied
             as a tuple. If nothing was provided, the results will be
             stored in the default Braket bucket.
+            max_parallel: maximum number of tasks run in parallel when a batch
+            of circuits is submitted. If nothing was provided, the device's
+            default is used.
+            cache: an optional on-disk cache of results. Circuits that were
+            already run on the same device with the same noise model and
+            number of shots return the stored results instead of running a
+            task. It isn't used by seeded local simulators, whose results
+            differ on every call.
+            max_shots_per_task: larger numbers of samples are split into shards
+            of at most this many shots, run as one batch and merged. If nothing
+            was provided, the maximum number of shots of the device is used.
+            seed: an optional seed making results of local simulators
+            reproducible. Samples are then drawn from the exact distribution
+            of each circuit, with a generator spawned from the seed for every
+            call and every circuit of a batch, so that runners with the same
+            seed return the same sequence of results. Braket devices don't
+            accept seeds, so it has no effect on other devices.
+            metrics: an optional sink receiving durations of phases of running
+            circuits and descriptions of submitted tasks. By default nothing
+            is recorded.
+            optimizer: an optional pipeline of optimization passes applied to
+            circuits before they are converted. Its reports tell how many
+            gates and how much depth were removed.
+            journal: an optional journal recording submitted tasks. Tasks
+            that a previous process submitted but didn't read the results of
+            are reattached to instead of being submitted again.
+            result_collector: an optional collector downloading results of
+            batches stored in s3_destination_folder concurrently, as tasks
+            complete. By default results are downloaded by the Braket SDK.
         """
         super().__init__()
         self.device = device
         self.noise_model = noise_model
         self.s3_destination_folder = s3_destination_folder
+        self.max_parallel = max_parallel
+        self.cache = cache
+        self.max_shots_per_task = max_shots_per_task
+        self.seed = seed
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.optimizer = optimizer
+        self.journal = journal
+        self.result_collector = result_collector
+        self._get_parametric_program = lru_cache(maxsize=128)(
+            self._build_parametric_program
+        )
+        self._optimized_templates: Dict[Tuple, BraketCircuitTemplate] = {}
+        self._seed_sequence: Optional[np.random.SeedSequence] = None
+
+    def _optimize(self, circuit: Circuit) -> Circuit:
+        if self.optimizer is None:
+            return circuit
+        with self.metrics.phase("optimization"):
+            circuit = self.optimizer.optimize(circuit)
+        if self.metrics.enabled:
+            report = self.optimizer.last_report
+            self.metrics.increment("gates_removed", report.gate_reduction)
+            self.metrics.increment("depth_removed", report.depth_reduction)
+        return circuit
+
+    def _export_circuit(self, circuit: Circuit):
+        circuit = self._optimize(circuit)
+        with self.metrics.phase("conversion"):
+            braket_circuit = export_to_braket(circuit)
+        if self.noise_model is not None:
+            with self.metrics.phase("noise"):
+                braket_circuit.apply_gate_noise(self.noise_model)
+        return braket_circuit
+
+    def _cache_key(self, braket_circuit, n_samples: int) -> Optional[str]:
+        if self.cache is None or self._is_seeded():
+            return None
+        return self.cache.key(
+            braket_circuit.to_ir(IRType.OPENQASM).source,
+            _device_id(self.device),
+            str(n_samples),
+        )
+
+    def _load_cached_counts(self, cache_key: Optional[str]):
+        if self.cache is None or cache_key is None:
+            return None
+        counts = self.cache.load_counts(cache_key)
+        self.metrics.increment("cache_misses" if counts is None else "cache_hits")
+        return counts
+
+    def _save_cached_counts(self, cache_key: Optional[str], counts: Dict[str, int]):
+        if self.cache is not None and cache_key is not None:
+            self.cache.save_counts(cache_key, counts)
 
     def _run_and_measure(self, circuit: Circuit, n_samples: int) -> Measurements:
         """
@@ -47,21 +181,651 @@ class BraketRunner(BaseCircuitRunner):
         Returns:
             Measurement
         """
-        braket_circuit = export_to_braket(circuit)
+        braket_circuit = self._export_circuit(circuit)
+
+        cache_key = self._cache_key(braket_circuit, n_samples)
+        counts = self._load_cached_counts(cache_key)
+        if counts is not None:
+            return self._measurements_from_counts(counts)
+
+        if self._is_seeded() or n_samples > self._max_shots_per_task():
+            counts = self._run_sharded([braket_circuit], [n_samples])[0]
+        else:
+            counts = self._run_task(braket_circuit, n_samples).measurement_counts
+        self._save_cached_counts(cache_key, counts)
+        return self._measurements_from_counts(counts)
+
+    def _measurements_from_counts(self, counts: Dict[str, int]) -> Measurements:
+        with self.metrics.phase("measurements"):
+            return CountsMeasurements(counts)
+
+    def _is_seeded(self) -> bool:
+        return self.seed is not None and isinstance(self.device, LocalSimulator)
+
+    def _max_shots_per_task(self) -> float:
+        if self.max_shots_per_task is not None:
+            return self.max_shots_per_task
+        try:
+            max_shots = self.device.properties.service.shotsRange[1]
+        except (AttributeError, TypeError):
+            return math.inf
+        return max_shots if isinstance(max_shots, int) else math.inf
+
+    def _run_sharded(
+        self, braket_circuits: Sequence, samples_per_circuit: Sequence[int]
+    ) -> List[Dict[str, int]]:
+        """
+        Runs converted circuits, splitting numbers of samples exceeding the
+        maximum number of shots per task into near-equal shards run in a
+        single batch.
+        Counts of all shards of a circuit are merged. Job and circuit counters
+        aren't updated, callers count the run.
+        """
+        if self._is_seeded():
+            return self._sample_seeded(braket_circuits, samples_per_circuit)
+
+        max_shots = self._max_shots_per_task()
+        shard_circuits = []
+        shard_samples: List[int] = []
+        shard_owners: List[int] = []
+        for owner, (braket_circuit, n_samples) in enumerate(
+            zip(braket_circuits, samples_per_circuit)
+        ):
+            for shard in _split_shots(n_samples, max_shots):
+                shard_circuits.append(braket_circuit)
+                shard_samples.append(shard)
+                shard_owners.append(owner)
+
+        shard_counts = self._run_braket_batch(shard_circuits, shard_samples)
+
+        merged_counts: List[Dict[str, int]] = [{} for _ in braket_circuits]
+        for owner, counts in zip(shard_owners, shard_counts):
+            for bitstring, count in counts.items():
+                merged_counts[owner][bitstring] = (
+                    merged_counts[owner].get(bitstring, 0) + count
+                )
+        return merged_counts
+
+    def _sample_seeded(
+        self, braket_circuits: Sequence, samples_per_circuit: Sequence[int]
+    ) -> List[Dict[str, int]]:
+        # Samples are drawn locally, so they don't need to be sharded.
+        distributions = self._exact_distributions(braket_circuits)
+        seed_sequences = self._next_seed_sequence().spawn(len(braket_circuits))
+        counts_list = []
+        for braket_circuit, n_samples, seed_sequence in zip(
+            braket_circuits, samples_per_circuit, seed_sequences
+        ):
+            n_qubits, probabilities = distributions[id(braket_circuit)]
+            counts = np.random.default_rng(seed_sequence).multinomial(
+                n_samples, probabilities
+            )
+            # Only outcomes which were drawn are formatted as bitstrings.
+            counts_list.append(
+                {
+                    format(index, f"0{n_qubits}b"): int(counts[index])
+                    for index in np.flatnonzero(counts)
+                }
+            )
+        return counts_list
+
+    def _next_seed_sequence(self) -> np.random.SeedSequence:
+        """Spawns the seed sequence of a call, a new one for every call."""
+        if self._seed_sequence is None or self._seed_sequence.entropy != self.seed:
+            self._seed_sequence = np.random.SeedSequence(self.seed)
+        return self._seed_sequence.spawn(1)[0]
+
+    def _exact_distributions(
+        self, braket_circuits: Sequence
+    ) -> Dict[int, Tuple[int, np.ndarray]]:
+        """Computes numbers of qubits and probabilities, keyed by circuit id.
+
+        Probabilities of all distinct circuits are computed in a single batch.
+        """
+        unique_circuits = list(
+            {id(circuit): circuit for circuit in braket_circuits}.values()
+        )
+        if not unique_circuits:
+            return {}
+        probability_circuits = []
+        for braket_circuit in unique_circuits:
+            probability_circuit = braket_circuit.copy()
+            probability_circuit.probability()
+            probability_circuits.append(probability_circuit)
+        results = self._run_task_batch(probability_circuits, 0)
+
+        distributions = {}
+        for braket_circuit, probability_circuit, result in zip(
+            unique_circuits, probability_circuits, results
+        ):
+            probabilities = np.clip(np.asarray(result.values[0], dtype=float), 0, None)
+            distributions[id(braket_circuit)] = (
+                probability_circuit.qubit_count,
+                probabilities / probabilities.sum(),
+            )
+        return distributions
+
+    def run_and_measure_async(
+        self, circuit: Circuit, n_samples: int, timeout: Optional[float] = None
+    ) -> "Future[Measurements]":
+        """
+        Submits the circuit without waiting for its outcome
+
+        The returned future is resolved by a polling thread shared by all
+        outstanding tasks. Cancelling the future cancels the Braket task. To
+        use it with asyncio, wrap it with `asyncio.wrap_future`. Numbers of
+        samples exceeding the maximum number of shots per task are split into
+        shards submitted as separate tasks, and samples of seeded local
+        simulators are drawn right away, so the future is already resolved.
+
+        Args:
+            circuit : the circuit to prepare the state
+            n_samples: number of samples to for the circuit
+            timeout: number of seconds after which the task is cancelled and
+                the future fails with TimeoutError
+
+        Returns:
+            Future of the Measurement
+        """
+        if n_samples <= 0:
+            raise ValueError(f"Number of samples has to be positive, got {n_samples}")
+        braket_circuit = self._export_circuit(circuit)
+        self._n_jobs_executed += 1
+        self._n_circuits_executed += 1
+        if self._is_seeded():
+            future: "Future[Measurements]" = Future()
+            counts = self._sample_seeded([braket_circuit], [n_samples])[0]
+            future.set_result(self._measurements_from_counts(counts))
+            return future
+
+        poller = _get_task_poller()
+        shard_futures = [
+            poller.submit(
+                partial(self._submit_task, braket_circuit, shard),
+                self._completing(self._recording(_counts_from_result)),
+                timeout,
+            )
+            for shard in _split_shots(n_samples, self._max_shots_per_task())
+        ]
+        return _merged_future(shard_futures)
+
+    def run_and_measure_with_params(
+        self, circuit: Circuit, params: Sequence[float], n_samples: int
+    ) -> Measurements:
+        """
+        Runs a symbolic circuit with its symbols bound to the given values
+
+        The circuit is converted to a Braket program with free parameters only
+        once per circuit structure. Subsequent calls just send the values of
+        the parameters along with the cached program, which also lets devices
+        supporting parametric compilation reuse the compiled program. Seeded
+        runs and numbers of samples exceeding the maximum number of shots per
+        task run the template bound to the values instead, like
+        `run_and_measure`.
+
+        Args:
+            circuit : the symbolic circuit to prepare the state
+            params: values of circuit.free_symbols, in the same order
+            n_samples: number of samples to for the circuit
+
+        Returns:
+            Measurement
+        """
+        if n_samples <= 0:
+            raise ValueError(f"Number of samples has to be positive, got {n_samples}")
+        template, inputs = self._parametric_template(circuit, params)
+        if self._is_seeded() or n_samples > self._max_shots_per_task():
+            bound_circuit = template.circuit.make_bound_circuit(inputs)
+            counts = self._run_sharded([bound_circuit], [n_samples])[0]
+        else:
+            program = self._get_parametric_program(template)
+            result = self._run_task(program, n_samples, inputs=inputs)
+            counts = result.measurement_counts
+        self._n_jobs_executed += 1
+        self._n_circuits_executed += 1
+        return self._measurements_from_counts(counts)
+
+    def _parametric_template(
+        self, circuit: Circuit, params: Sequence[float]
+    ) -> Tuple[BraketCircuitTemplate, Dict[str, float]]:
+        """Returns the template of the optimized circuit and values of its inputs.
+
+        Optimized templates are cached per structure of the circuit, so the
+        optimization passes run once per structure. Values are bound to
+        symbols of the original circuit by name, since optimization may
+        reorder or remove them.
+        """
+        symbols = circuit.free_symbols
+        if len(params) != len(symbols):
+            raise ValueError(f"Expected {len(symbols)} parameters, got {len(params)}")
+        if self.optimizer is None:
+            template = export_to_braket_template(circuit)
+        else:
+            structure = _circuit_structure(circuit)
+            if structure not in self._optimized_templates:
+                if len(self._optimized_templates) >= _MAX_OPTIMIZED_TEMPLATES:
+                    del self._optimized_templates[next(iter(self._optimized_templates))]
+                self._optimized_templates[structure] = export_to_braket_template(
+                    self._optimize(circuit)
+                )
+            template = self._optimized_templates[structure]
+        values = dict(zip(symbols, params))
+        return template, {
+            symbol.name: float(values[symbol]) for symbol in template.symbols
+        }
+
+    def _build_parametric_program(
+        self, template: BraketCircuitTemplate, state_vector: bool = False
+    ):
+        braket_circuit = template.circuit.copy()
         if self.noise_model is not None:
             braket_circuit.apply_gate_noise(self.noise_model)
+        if state_vector:
+            braket_circuit.state_vector()
+        return braket_circuit.to_ir(IRType.OPENQASM)
+
+    def _submit_task(self, task_specification, n_samples: int, **kwargs):
+        journal_key = None
+        if self.journal is not None:
+            journal_key = self._journal_key(
+                task_specification, n_samples, kwargs.get("inputs")
+            )
+            task = self.journal.reattach(journal_key)
+            if task is not None:
+                self.metrics.increment("tasks_reattached")
+                return task
+
+        with self.metrics.phase("submission"):
+            if self.s3_destination_folder is not None:
+                task = self.device.run(
+                    task_specification,
+                    self.s3_destination_folder,
+                    shots=n_samples,
+                    **kwargs,
+                )
+            else:
+                task = self.device.run(task_specification, shots=n_samples, **kwargs)
+        if self.metrics.enabled:
+            self.metrics.record_task(_task_record(task, task_specification, n_samples))
+        if journal_key is not None:
+            self._record_task(journal_key, task, n_samples)
+        return task
+
+    def _run_task(self, task_specification, n_samples: int, **kwargs):
+        """Submits a single task and waits for its result."""
+        task = self._submit_task(task_specification, n_samples, **kwargs)
+        with self.metrics.phase("result"):
+            result = task.result()
+        self._record_result_bytes([result])
+        if self.journal is not None:
+            self.journal.complete(task.id)
+        return result
+
+    def _record_result_bytes(self, results: Sequence):
+        if self.metrics.enabled:
+            self.metrics.increment(
+                "result_bytes", sum(_result_bytes(result) for result in results)
+            )
+
+    def _recording(self, parse_result: Callable):
+        """Wraps a parser of results so that it records their sizes."""
+        if not self.metrics.enabled:
+            return parse_result
+
+        def record_and_parse(result):
+            self._record_result_bytes([result])
+            return parse_result(result)
+
+        return record_and_parse
+
+    def _journal_key(self, task_specification, n_samples: int, inputs=None) -> str:
+        return ResultCache.key(
+            _program_source(task_specification),
+            _device_id(self.device),
+            str(n_samples),
+            json.dumps(inputs, sort_keys=True),
+        )
+
+    def _record_task(self, journal_key: str, task, n_samples: int):
+        cast(TaskJournal, self.journal).record(
+            journal_key, task.id, n_samples, self.s3_destination_folder
+        )
 
+    def _completing(self, parse_result: Callable):
+        """Wraps a parser of results so that it marks their tasks as completed."""
+        journal = self.journal
+        if journal is None:
+            return parse_result
+
+        def parse_and_complete(result):
+            value = parse_result(result)
+            journal.complete(result.task_metadata.id)
+            return value
+
+        return parse_and_complete
+
+    def _run_task_batch(self, task_specifications, n_samples: int, **kwargs) -> List:
+        """Submits a batch of tasks and waits for their results.
+
+        Args:
+            task_specifications: a list of task specifications, or a single
+                one run with each of the inputs passed as keyword argument.
+            n_samples: number of shots of all the tasks
+        """
+        if self.journal is not None:
+            return self._run_journaled_task_batch(
+                task_specifications, n_samples, **kwargs
+            )
         if self.s3_destination_folder is not None:
-            return self.device.run(
-                braket_circuit, self.s3_destination_folder, shots=n_samples
+            kwargs["s3_destination_folder"] = self.s3_destination_folder
+        with self.metrics.phase("submission"):
+            task_batch = self.device.run_batch(
+                task_specifications,
+                shots=n_samples,
+                max_parallel=self.max_parallel,
+                **kwargs,
+            )
+        with self.metrics.phase("result"):
+            results = self._batch_results(task_batch)
+        if self.metrics.enabled:
+            if not isinstance(task_specifications, list):
+                task_specifications = [task_specifications] * len(results)
+            for task, task_specification in zip(
+                getattr(task_batch, "tasks", [None] * len(results)),
+                task_specifications,
+            ):
+                self.metrics.record_task(
+                    _task_record(task, task_specification, n_samples)
+                )
+        return results
+
+    def _batch_results(self, task_batch) -> List:
+        tasks = getattr(task_batch, "tasks", None)
+        if (
+            self.result_collector is None
+            or self.s3_destination_folder is None
+            or tasks is None
+        ):
+            results = task_batch.results()
+        else:
+            results = self.result_collector.task_results(tasks)
+        self._record_result_bytes(results)
+        return results
+
+    def _run_journaled_task_batch(
+        self, task_specifications, n_samples: int, inputs=None, **kwargs
+    ) -> List:
+        # Tasks of previous processes are reattached to one by one, and the
+        # remaining ones are submitted as a single batch.
+        n_tasks = (
+            len(task_specifications)
+            if isinstance(task_specifications, list)
+            else len(inputs)
+        )
+        if not isinstance(task_specifications, list):
+            task_specifications = [task_specifications] * n_tasks
+        task_inputs = inputs if inputs is not None else [None] * n_tasks
+        journal = cast(TaskJournal, self.journal)
+        keys = [
+            self._journal_key(task_specification, n_samples, task_input)
+            for task_specification, task_input in zip(task_specifications, task_inputs)
+        ]
+        reattached = {}
+        for index, key in enumerate(keys):
+            task = journal.reattach(key)
+            if task is not None:
+                reattached[index] = task
+        self.metrics.increment("tasks_reattached", len(reattached))
+
+        submitted = [index for index in range(n_tasks) if index not in reattached]
+        results: List = [None] * n_tasks
+        if submitted:
+            if inputs is not None:
+                kwargs["inputs"] = [inputs[index] for index in submitted]
+            if self.s3_destination_folder is not None:
+                kwargs["s3_destination_folder"] = self.s3_destination_folder
+            with self.metrics.phase("submission"):
+                task_batch = self.device.run_batch(
+                    [task_specifications[index] for index in submitted],
+                    shots=n_samples,
+                    max_parallel=self.max_parallel,
+                    **kwargs,
+                )
+            tasks = getattr(task_batch, "tasks", None)
+            if tasks is not None:
+                # Tasks of local batches can't be reattached to anyway.
+                for index, task in zip(submitted, tasks):
+                    self._record_task(keys[index], task, n_samples)
+                    if self.metrics.enabled:
+                        self.metrics.record_task(
+                            _task_record(task, task_specifications[index], n_samples)
+                        )
+            with self.metrics.phase("result"):
+                for index, result in zip(submitted, self._batch_results(task_batch)):
+                    results[index] = result
+            for task in tasks or []:
+                journal.complete(task.id)
+
+        with self.metrics.phase("result"):
+            for index, task in reattached.items():
+                results[index] = task.result()
+                self._record_result_bytes([results[index]])
+                journal.complete(task.id)
+        return results
+
+    def _run_batch_and_measure(
+        self, batch: Sequence[Circuit], samples_per_circuit: Sequence[int]
+    ) -> List[Measurements]:
+        """
+        Runs the circuits using the device's native batch submission
+
+        All circuits are converted up front. Circuits whose results are
+        cached are not run again, the remaining ones are run by
+        `_run_braket_batch` and counted as a single job.
+
+        Args:
+            batch: the circuits to run
+            samples_per_circuit: number of samples for each circuit
+
+        Returns:
+            List of Measurements, in the same order as the circuits
+        """
+        braket_circuits = [self._export_circuit(circuit) for circuit in batch]
+        cache_keys = [
+            self._cache_key(braket_circuit, n_samples)
+            for braket_circuit, n_samples in zip(braket_circuits, samples_per_circuit)
+        ]
+
+        measurements: List[Optional[Measurements]] = [None] * len(batch)
+        indices_to_run = []
+        for index, cache_key in enumerate(cache_keys):
+            counts = self._load_cached_counts(cache_key)
+            if counts is not None:
+                measurements[index] = self._measurements_from_counts(counts)
+            else:
+                indices_to_run.append(index)
+
+        counts_list = self._run_sharded(
+            [braket_circuits[index] for index in indices_to_run],
+            [samples_per_circuit[index] for index in indices_to_run],
+        )
+        for index, counts in zip(indices_to_run, counts_list):
+            measurements[index] = self._measurements_from_counts(counts)
+            self._save_cached_counts(cache_keys[index], counts)
+        if indices_to_run:
+            self._n_jobs_executed += 1
+            self._n_circuits_executed += len(indices_to_run)
+
+        return measurements  # type: ignore
+
+    def _run_braket_batch(
+        self, braket_circuits: Sequence, samples_per_circuit: Sequence[int]
+    ) -> List[Dict[str, int]]:
+        """
+        Runs converted circuits and returns their measurement counts
+
+        Braket batches share a single number of shots, so circuits are
+        grouped by their number of samples and each group is submitted as one
+        batch. Groups are submitted concurrently, so that none of them waits
+        for results of the others.
+        """
+        indices_per_n_samples: Dict[int, List[int]] = defaultdict(list)
+        for index, n_samples in enumerate(samples_per_circuit):
+            indices_per_n_samples[n_samples].append(index)
+
+        def run_group(n_samples: int) -> List:
+            return self._run_task_batch(
+                [braket_circuits[index] for index in indices_per_n_samples[n_samples]],
+                n_samples,
             )
 
-        result = self.device.run(braket_circuit, shots=n_samples).result()
-        return Measurements.from_counts(result.measurement_counts)
+        if len(indices_per_n_samples) > 1:
+            with ThreadPoolExecutor(len(indices_per_n_samples)) as executor:
+                results_per_n_samples = dict(
+                    zip(
+                        indices_per_n_samples,
+                        executor.map(run_group, indices_per_n_samples),
+                    )
+                )
+        else:
+            results_per_n_samples = {
+                n_samples: run_group(n_samples) for n_samples in indices_per_n_samples
+            }
+
+        counts_list: List[Optional[Dict[str, int]]] = [None] * len(braket_circuits)
+        for n_samples, indices in indices_per_n_samples.items():
+            for index, result in zip(indices, results_per_n_samples[n_samples]):
+                if result is None:
+                    raise RuntimeError(
+                        f"Braket task for circuit {index} in the batch did not "
+                        "return a result"
+                    )
+                counts_list[index] = result.measurement_counts
+
+        return counts_list  # type: ignore
+
+
+def _split_shots(n_samples: int, max_shots: float) -> List[int]:
+    # Shards differ by at most one shot, so a circuit uses at most two
+    # distinct numbers of shots.
+    if n_samples <= max_shots:
+        return [n_samples]
+    n_shards = math.ceil(n_samples / max_shots)
+    shard_size, n_larger = divmod(n_samples, n_shards)
+    return [shard_size + 1] * n_larger + [shard_size] * (n_shards - n_larger)
+
+
+def _task_record(task, task_specification, n_samples: int) -> TaskRecord:
+    if isinstance(task_specification, BraketCircuit):
+        return TaskRecord(
+            getattr(task, "id", None),
+            n_samples,
+            task_specification.qubit_count,
+            len(task_specification.instructions),
+            len(task_specification.to_ir(IRType.OPENQASM).source.encode()),
+        )
+    source = getattr(task_specification, "source", None)
+    return TaskRecord(
+        getattr(task, "id", None),
+        n_samples,
+        None,
+        None,
+        None if source is None else len(source.encode()),
+    )
+
+
+def _result_bytes(result) -> int:
+    """Number of bytes of the result downloaded from the device.
+
+    Results parsed by S3ResultCollector know the size of their download.
+    For others it is the size of their measurements serialized as in a
+    results.json, i.e. rows like "[0, 1]" separated by ", ", computed without
+    serializing them.
+    """
+    n_bytes = getattr(result, "n_bytes", None)
+    if n_bytes is not None:
+        return n_bytes
+    measurements = getattr(result, "measurements", None)
+    if not isinstance(measurements, np.ndarray) or measurements.ndim != 2:
+        return 0
+    n_rows, n_columns = measurements.shape
+    if n_rows == 0:
+        return 2
+    row_bytes = 3 * n_columns if n_columns else 2
+    return n_rows * row_bytes + 2 * (n_rows - 1) + 2
+
+
+def _program_source(task_specification) -> str:
+    if isinstance(task_specification, BraketCircuit):
+        return task_specification.to_ir(IRType.OPENQASM).source
+    return task_specification.source
+
+
+def _counts_from_result(result) -> Dict[str, int]:
+    return result.measurement_counts
+
+
+def _merged_future(shard_futures: List[Future]) -> "Future[Measurements]":
+    """Future of measurements merging counts of all shards.
+
+    It fails with the first error of a shard, and cancelling it cancels the
+    shards.
+    """
+    future: "Future[Measurements]" = Future()
+    remaining = [len(shard_futures)]
+    lock = threading.Lock()
+
+    def on_shard_done(shard_future: Future):
+        if future.done():
+            return
+        if shard_future.cancelled():
+            future.cancel()
+            return
+        error = shard_future.exception()
+        if error is not None:
+            _resolve(future.set_exception, error)
+            return
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] > 0:
+                return
+        merged: Dict[str, int] = defaultdict(int)
+        for done_future in shard_futures:
+            for bitstring, count in done_future.result().items():
+                merged[bitstring] += count
+        _resolve(future.set_result, CountsMeasurements(dict(merged)))
+
+    def on_done(_):
+        if future.cancelled():
+            for shard_future in shard_futures:
+                shard_future.cancel()
+
+    future.add_done_callback(on_done)
+    for shard_future in shard_futures:
+        shard_future.add_done_callback(on_shard_done)
+    return future
+
+
+def _choose_local_backend(
+    backend: Optional[str], noise_model: Optional[Type[Noise]]
+) -> str:
+    if backend is None:
+        backend = "braket_dm" if noise_model is not None else "braket_sv"
+    if backend != "braket_dm" and noise_model is not None:
+        raise ValueError(
+            "Noisy simulations are supported only for density matrix backend"
+        )
+    return backend
 
 
 def braket_local_runner(
-    backend: Optional[str] = None, noise_model: Optional[Type[Noise]] = None
+    backend: Optional[str] = None,
+    noise_model: Optional[Type[Noise]] = None,
+    max_parallel: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+    seed: Optional[int] = None,
+    metrics: Optional[MetricsSink] = None,
+    optimizer: Optional[CircuitOptimizer] = None,
 ) -> BraketRunner:
     """
     Create a braket runner for Braket local simulator
@@ -69,25 +833,41 @@ def braket_local_runner(
     Args:
         backend: name of the Braket local simulator
         noise_model: optional noise model for the simulator
+        max_parallel: maximum number of circuits simulated in parallel
+            when running a batch. Defaults to the number of CPUs.
+        cache: optional on-disk cache of results
+        seed: optional seed making the results reproducible
+        metrics: optional sink receiving durations of phases and descriptions
+            of submitted tasks
+        optimizer: optional pipeline of optimization passes applied to
+            circuits before they are converted
 
     Returns:
         BraketRunner
     """
-    if backend is None:
-        backend = "braket_dm" if noise_model is not None else "braket_sv"
-    if backend != "braket_dm" and noise_model is not None:
-        raise ValueError(
-            "Noisy simulations are supported only for density matrix backend"
-        )
-    device = LocalSimulator(backend=backend)
-    return BraketRunner(device, noise_model)
+    device = LocalSimulator(backend=_choose_local_backend(backend, noise_model))
+    return BraketRunner(
+        device,
+        noise_model,
+        max_parallel=max_parallel,
+        cache=cache,
+        seed=seed,
+        metrics=metrics,
+        optimizer=optimizer,
+    )
 
 
 def aws_runner(
-    boto_session: Session,
+    boto_session: "Session",
     name: str = "SV1",
     noise_model: Optional[Type[Noise]] = None,
     s3_destination_folder: Optional[Union[str, Tuple]] = None,
+    max_parallel: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+    metrics: Optional[MetricsSink] = None,
+    optimizer: Optional[CircuitOptimizer] = None,
+    journal: Optional[TaskJournal] = None,
+    result_collector: Optional[S3ResultCollector] = None,
 ) -> BraketRunner:
     """
     Create a braket runner for Braket on-demand simulators and QPU
@@ -102,13 +882,32 @@ def aws_runner(
         string. The bucket name and the folder can be supplied
         as a tuple. If nothing was provided, the results will be
         stored in the default Braket bucket.
+        max_parallel: maximum number of tasks run in parallel when a batch
+        of circuits is submitted.
+        cache: optional on-disk cache of results
+        metrics: optional sink receiving durations of phases and descriptions
+            of submitted tasks
+        optimizer: optional pipeline of optimization passes applied to
+            circuits before they are converted
+        journal: optional journal of submitted tasks, letting a restarted
+            process reattach to tasks instead of submitting them again
+        result_collector: optional collector downloading results of batches
+            from s3_destination_folder concurrently
 
     Returns:
         BraketRunner for on-demand simulator or QPU
     """
-    aws_session = AwsSession(boto_session)
+    from braket.aws import AwsDeviceType
+
+    from orquestra.integrations.braket._utils import _get_arn
+    from orquestra.integrations.braket.devices import (
+        default_device_catalog,
+        get_aws_session,
+    )
+
+    aws_session = get_aws_session(boto_session)
     arn = _get_arn(name, aws_session)
-    device = AwsDevice(arn, aws_session)
+    device = default_device_catalog.get_device(arn, aws_session)
 
     if noise_model is not None and device.type != AwsDeviceType.SIMULATOR:
         raise ValueError(f"Simulator {name} cannot use noise model.")
@@ -116,10 +915,20 @@ def aws_runner(
     if device.type == AwsDeviceType.QPU and s3_destination_folder is None:
         raise ValueError("S3 destination folder is required for QPU tasks")
 
-    return BraketRunner(device, noise_model, s3_destination_folder)
+    return BraketRunner(
+        device,
+        noise_model,
+        s3_destination_folder,
+        max_parallel,
+        cache,
+        metrics=metrics,
+        optimizer=optimizer,
+        journal=journal,
+        result_collector=result_collector,
+    )
 
 
-def get_QPU_names(boto_session: Session) -> List[str]:
+def get_QPU_names(boto_session: "Session") -> List[str]:
     """This function retrives the names of the QPUs
     that are available on Braket
     Args:
@@ -127,6 +936,16 @@ def get_QPU_names(boto_session: Session) -> List[str]:
     Returns:
         List : list of names for QPUs provided by Braket
     """
-    aws_session = AwsSession(boto_session)
-    QPUs = AwsDevice.get_devices(types=["QPU"], aws_session=aws_session)
-    return [braket_QPU.name for braket_QPU in QPUs]
+    from braket.aws import AwsDeviceType
+
+    from orquestra.integrations.braket.devices import (
+        default_device_catalog,
+        get_aws_session,
+    )
+
+    aws_session = get_aws_session(boto_session)
+    return [
+        device.name
+        for device in default_device_catalog.get_summaries(aws_session)
+        if device.type == AwsDeviceType.QPU.value
+    ]
@@ -0,0 +1,254 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+import json
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from orquestra.integrations.braket._futures import COMPLETED_STATE, TERMINAL_STATES
+
+RESULTS_FILENAME = "results.json"
+
+_MEASUREMENTS_KEY = re.compile(rb'"measurements"\s*:\s*\[')
+# Longest possible suffix of a chunk which may be the start of the key.
+_KEY_OVERLAP = 64
+_OPEN, _CLOSE, _ZERO, _ONE = b"[]01"
+
+
+@dataclass
+class S3TaskResult:
+    """Result of a gate-model task, parsed from its results.json in S3.
+
+    Args:
+        task_id: ARN of the task
+        measured_qubits: qubits whose bits are stored in each row of
+            measurements
+        measurements: array of shape (n_shots, len(measured_qubits)) of bits,
+            or None if the task returned probabilities only
+        measurement_probabilities: probabilities of bitstrings, if the task
+            returned them instead of measurements
+        shots: number of shots of the task
+        n_bytes: number of bytes of the parsed document
+    """
+
+    task_id: Optional[str]
+    measured_qubits: List[int]
+    measurements: Optional[np.ndarray]
+    measurement_probabilities: Optional[Dict[str, float]]
+    shots: int
+    n_bytes: int = 0
+
+    @property
+    def measurement_counts(self) -> Dict[str, int]:
+        """Counts of measured bitstrings, like GateModelQuantumTaskResult's."""
+        if self.measurements is None:
+            return {
+                bitstring: int(round(probability * self.shots))
+                for bitstring, probability in (
+                    self.measurement_probabilities or {}
+                ).items()
+            }
+        if self.measurements.size == 0:
+            return {}
+        rows, counts = np.unique(self.measurements, axis=0, return_counts=True)
+        return {
+            "".join(map(str, row)): int(count)
+            for row, count in zip(rows.tolist(), counts)
+        }
+
+
+def parse_result_stream(chunks: Iterable[bytes]) -> S3TaskResult:
+    """Parses a results.json of a gate-model task, chunk by chunk.
+
+    Bits of the measurements array, by far the largest part of the document,
+    are collected into a uint8 array as chunks arrive, without building a
+    Python list per shot. Everything else is parsed as JSON at the end.
+
+    Args:
+        chunks: consecutive bytes of the document
+
+    Returns:
+        The parsed result
+    """
+    parser = _ResultParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.finish()
+
+
+class _ResultParser:
+    def __init__(self) -> None:
+        self._outside = bytearray()
+        self._search_start = 0
+        self._found = False
+        self._depth = 0
+        self._bits: List[np.ndarray] = []
+        self._n_bytes = 0
+
+    def feed(self, chunk: bytes):
+        self._n_bytes += len(chunk)
+        while chunk:
+            if self._depth == 0:
+                chunk = self._feed_outside(chunk)
+            else:
+                chunk = self._feed_measurements(chunk)
+
+    def _feed_outside(self, chunk: bytes) -> bytes:
+        self._outside += chunk
+        if self._found:
+            return b""
+        match = _MEASUREMENTS_KEY.search(self._outside, self._search_start)
+        if match is None:
+            self._search_start = max(0, len(self._outside) - _KEY_OVERLAP)
+            return b""
+        # The array is replaced with an empty one in the remaining document.
+        rest = bytes(self._outside[match.end() :])
+        del self._outside[match.end() :]
+        self._found = True
+        self._depth = 1
+        return rest
+
+    def _feed_measurements(self, chunk: bytes) -> bytes:
+        data = np.frombuffer(chunk, dtype=np.uint8)
+        steps = (data == _OPEN).astype(np.int64) - (data == _CLOSE)
+        depths = self._depth + np.cumsum(steps)
+        closing = np.flatnonzero(depths == 0)
+        end = int(closing[0]) if len(closing) else len(data)
+        section = data[:end]
+        self._bits.append(section[(section == _ZERO) | (section == _ONE)] - _ZERO)
+        if len(closing):
+            self._depth = 0
+            return chunk[end:]
+        self._depth = int(depths[-1])
+        return b""
+
+    def finish(self) -> S3TaskResult:
+        document = json.loads(bytes(self._outside))
+        measured_qubits = document.get("measuredQubits") or []
+        task_metadata = document.get("taskMetadata", {})
+        measurements = None
+        if self._found:
+            bits = np.concatenate(self._bits) if self._bits else np.empty(0, np.uint8)
+            measurements = bits.reshape(-1, len(measured_qubits))
+        return S3TaskResult(
+            task_id=task_metadata.get("id"),
+            measured_qubits=measured_qubits,
+            measurements=measurements,
+            measurement_probabilities=document.get("measurementProbabilities"),
+            shots=task_metadata.get("shots", 0),
+            n_bytes=self._n_bytes,
+        )
+
+
+class S3ResultCollector:
+    """Downloads and parses results of many tasks stored in S3 concurrently.
+
+    Result objects are streamed over a single S3 client, whose connection
+    pool is sized for the number of workers, and parsed by
+    `parse_result_stream` while they are downloaded.
+
+    Args:
+        s3_client: S3 client. Defaults to a client of the default boto3
+            session.
+        max_workers: number of results downloaded at the same time
+        chunk_size: number of bytes read from S3 at once
+        poll_interval: number of seconds between polls of states of tasks
+    """
+
+    def __init__(
+        self,
+        s3_client=None,
+        max_workers: int = 16,
+        chunk_size: int = 2**20,
+        poll_interval: float = 1.0,
+    ):
+        if s3_client is None:
+            # Imported here, so that local workloads don't import boto3.
+            import boto3  # type: ignore
+            from botocore.config import Config  # type: ignore
+
+            s3_client = boto3.client(
+                "s3", config=Config(max_pool_connections=max_workers)
+            )
+        self.s3_client = s3_client
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval
+
+    def fetch(self, bucket: str, key: str) -> S3TaskResult:
+        """Downloads and parses a single result object."""
+        body = self.s3_client.get_object(Bucket=bucket, Key=key)["Body"]
+        try:
+            return parse_result_stream(body.iter_chunks(self.chunk_size))
+        finally:
+            body.close()
+
+    def iter_folder(self, bucket: str, prefix: str) -> Iterator[S3TaskResult]:
+        """Yields results of all tasks stored under the prefix, as they arrive."""
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        keys = [
+            item["Key"]
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix)
+            for item in page.get("Contents", [])
+            if item["Key"].endswith("/" + RESULTS_FILENAME)
+        ]
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            futures = {executor.submit(self.fetch, bucket, key) for key in keys}
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def iter_task_results(self, tasks: Sequence) -> Iterator[Tuple[int, S3TaskResult]]:
+        """Yields indices and results of tasks, in the order they complete.
+
+        Tasks are polled for their state, and results of each completed task
+        are downloaded as soon as it completes.
+
+        Raises:
+            RuntimeError: if any of the tasks failed or was cancelled
+        """
+        pending = dict(enumerate(tasks))
+        downloads: Dict[Future, int] = {}
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            while pending or downloads:
+                for index, task in list(pending.items()):
+                    state = task.state()
+                    if state not in TERMINAL_STATES:
+                        continue
+                    if state != COMPLETED_STATE:
+                        raise RuntimeError(f"Braket task {task.id} finished as {state}")
+                    del pending[index]
+                    downloads[executor.submit(self.fetch, *_result_location(task))] = (
+                        index
+                    )
+                if not downloads:
+                    time.sleep(self.poll_interval)
+                    continue
+                done, _ = wait(
+                    list(downloads),
+                    timeout=self.poll_interval if pending else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    yield downloads.pop(future), future.result()
+
+    def task_results(self, tasks: Sequence) -> List[S3TaskResult]:
+        """Returns results of the tasks, in the same order."""
+        results: List[Any] = [None] * len(tasks)
+        for index, result in self.iter_task_results(tasks):
+            results[index] = result
+        return results
+
+
+def _result_location(task) -> Tuple[str, str]:
+    metadata = task.metadata()
+    return (
+        metadata["outputS3Bucket"],
+        f"{metadata['outputS3Directory']}/{RESULTS_FILENAME}",
+    )
@@ -1,19 +1,87 @@
-from typing import Optional
+import tempfile
+from concurrent.futures import Future
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
 
 import numpy as np
+from braket.circuits.serialization import IRType
 from braket.devices import Device, LocalSimulator
-from orquestra.quantum.circuits import Circuit
-from orquestra.quantum.operators import PauliRepresentation, get_expectation_value
+from numpy.typing import DTypeLike
+from orquestra.quantum.circuits import Circuit, I, X, Y, Z
+from orquestra.quantum.operators import PauliRepresentation, PauliTerm
 from orquestra.quantum.typing import StateVector
 from orquestra.quantum.wavefunction import Wavefunction
 
-from orquestra.integrations.braket.conversions import export_to_braket
+from orquestra.integrations.braket._futures import _get_task_poller
+from orquestra.integrations.braket.cache import ResultCache
+from orquestra.integrations.braket.conversions import (
+    export_to_braket_observable,
+    export_to_braket_template,
+)
+from orquestra.integrations.braket.conversions._operator_conversions import (
+    _group_identical_terms,
+)
+from orquestra.integrations.braket.light_cone import light_cone_groups
+from orquestra.integrations.braket.metrics import MetricsSink
+from orquestra.integrations.braket.optimization import CircuitOptimizer
+from orquestra.integrations.braket.prefix_cache import PrefixStateCache
 from orquestra.integrations.braket.runner import BraketRunner
+from orquestra.integrations.braket.statevector import (
+    _register,
+    apply_operations,
+    simulate_statevector,
+    simulate_statevectors,
+)
+
+_ENGINES = ("device", "numpy")
+
+_PAULI_GATES = {"X": X, "Y": Y, "Z": Z}
 
 
 class _BraketWavefunctionSimulator(BraketRunner):
-    def __init__(self, device: Device):
-        super().__init__(device)
+    def __init__(
+        self,
+        device: Device,
+        cache: Optional[ResultCache] = None,
+        engine: str = "device",
+        dtype: DTypeLike = np.complex128,
+        metrics: Optional[MetricsSink] = None,
+        optimizer: Optional[CircuitOptimizer] = None,
+        light_cone: bool = False,
+        prefix_cache: Optional[PrefixStateCache] = None,
+    ):
+        """
+        Args:
+            device: Braket device computing wavefunctions and expectation values
+            cache: optional on-disk cache of results
+            engine: "device" to run exact computations on the device, or
+                "numpy" to simulate them in the current process with
+                `simulate_statevector`, without creating any Braket objects.
+                Sampling always uses the device.
+            dtype: complex64 or complex128, precision of the "numpy" engine
+                and of amplitudes returned by the simulator. Wavefunctions
+                are stored as complex128 by orquestra, so with complex128
+                state vectors of the device are never copied.
+            metrics: optional sink receiving durations of phases and
+                descriptions of submitted tasks
+            optimizer: optional pipeline of optimization passes applied to
+                circuits before they are simulated. Fusion of single-qubit
+                gates preserves wavefunctions only up to a global phase.
+                Parameter sweeps aren't optimized.
+            light_cone: whether exact expectation values are computed from
+                the light cones of terms of the operator, see
+                `get_exact_expectation_values`.
+            prefix_cache: optional cache of states prepared by leading blocks
+                of circuits, used by the "numpy" engine to simulate only the
+                operations following a block shared with previous circuits.
+        """
+        if engine not in _ENGINES:
+            raise ValueError(f"Engine has to be one of {_ENGINES}, got {engine}")
+        super().__init__(device, cache=cache, metrics=metrics, optimizer=optimizer)
+        self.engine = engine
+        self.dtype = np.dtype(dtype)
+        self.light_cone = light_cone
+        self.prefix_cache = prefix_cache
 
     def get_wavefunction(
         self, circuit: Circuit, initial_state: Optional[StateVector] = None
@@ -21,28 +89,261 @@ class _BraketWavefunctionSimulator(BraketRunner):
         """
         Creates a wavefunction for a given circuit and initial state
 
+        Braket devices always start from the all-zeros state, so circuits with
+        an initial state are simulated with the "numpy" engine.
+
         Args:
             circuit: the circuit to prepare the state
-            initial_state: initial state of the system
+            initial_state: initial state of the system, a state vector of
+                2 ** n amplitudes over qubits 0 to n - 1. Defaults to the
+                all-zeros state.
 
         Returns:
             Wavefunction
         """
+        if self.engine == "numpy" or initial_state is not None:
+            return Wavefunction(self._simulate(circuit, initial_state=initial_state))
+
+        braket_circuit = self._export_wavefunction_circuit(circuit)
+        return Wavefunction(self._state_vector(braket_circuit))
+
+    def get_wavefunction_with_params(
+        self, circuit: Circuit, params: Sequence[float]
+    ) -> Wavefunction:
+        """
+        Creates a wavefunction for a symbolic circuit bound to the given values
+
+        See `BraketRunner.run_and_measure_with_params` for how the converted
+        circuit is reused between calls.
+
+        Args:
+            circuit: the symbolic circuit to prepare the state
+            params: values of circuit.free_symbols, in the same order
+
+        Returns:
+            Wavefunction
+        """
+        if self.engine == "numpy":
+            return Wavefunction(
+                self._simulate(circuit.bind(dict(zip(circuit.free_symbols, params))))
+            )
+
+        template, inputs = self._parametric_template(circuit, params)
+        program = self._get_parametric_program(template, state_vector=True)
+        result = self._run_task(program, 0, inputs=inputs)
+        self._n_jobs_executed += 1
+        self._n_circuits_executed += 1
+        return Wavefunction(np.asarray(result.values[0], self.dtype))
+
+    def get_wavefunction_async(
+        self, circuit: Circuit, timeout: Optional[float] = None
+    ) -> "Future[Wavefunction]":
+        """
+        Submits the wavefunction computation without waiting for its outcome
+
+        See `BraketRunner.run_and_measure_async` for how the returned future
+        is resolved, cancelled and timed out.
+
+        Args:
+            circuit: the circuit to prepare the state
+            timeout: number of seconds after which the task is cancelled and
+                the future fails with TimeoutError
+
+        Returns:
+            Future of the Wavefunction
+        """
+        if self.engine == "numpy":
+            future: "Future[Wavefunction]" = Future()
+            future.set_result(self.get_wavefunction(circuit))
+            return future
+
+        braket_circuit = self._export_wavefunction_circuit(circuit)
+        self._n_jobs_executed += 1
+        self._n_circuits_executed += 1
+        return _get_task_poller().submit(
+            lambda: self._submit_task(braket_circuit, 0),
+            self._completing(
+                lambda result: Wavefunction(np.asarray(result.values[0], self.dtype))
+            ),
+            timeout,
+        )
+
+    def _run_exact(self, braket_circuit) -> Union[List, np.ndarray]:
+        """Runs the circuit without shots and returns values of its result types."""
+        cache_key = self._cache_key(braket_circuit, 0)
+        if self.cache is not None and cache_key is not None:
+            values = self.cache.load_array(cache_key)
+            if values is not None:
+                return values
+
+        result = self._run_task(braket_circuit, 0)
+        self._n_jobs_executed += 1
+        self._n_circuits_executed += 1
+        # Values are returned as they are, so that state vectors aren't copied.
+        if self.cache is not None and cache_key is not None:
+            self.cache.save_array(cache_key, np.asarray(result.values))
+        return result.values
+
+    def _state_vector(self, braket_circuit) -> np.ndarray:
+        return np.asarray(self._run_exact(braket_circuit)[0], self.dtype)
+
+    def _amplitude_array(self, circuit: Circuit) -> np.ndarray:
+        if self.engine == "numpy":
+            return self._simulate(circuit)
+        return self._state_vector(self._export_wavefunction_circuit(circuit))
+
+    def save_wavefunction(
+        self, circuit: Circuit, path: Union[str, Path], chunk_size: int = 2**20
+    ) -> np.ndarray:
+        """
+        Writes the amplitudes of the state prepared by the circuit to a .npy file
+
+        With the "numpy" engine the circuit is simulated directly in the
+        memory-mapped file, using a memory-mapped temporary file next to it as
+        the second buffer, so the state doesn't have to fit in memory. The
+        "device" engine still returns the whole state in memory, and copying
+        it into the file in chunks of chunk_size entries only avoids a second
+        copy in memory. Either way, the file is returned memory-mapped.
+
+        Args:
+            circuit: the circuit to prepare the state
+            path: path of the .npy file to write
+            chunk_size: number of amplitudes copied at once
+
+        Returns:
+            Read-only memory-mapped array of amplitudes of the given dtype
+        """
+        if self.engine == "numpy":
+            self._simulate_into_file(circuit, Path(path), chunk_size)
+            return np.load(path, mmap_mode="r")
 
-        if initial_state is not None:
-            if initial_state[0] != 1 or initial_state:
+        amplitudes = self._amplitude_array(circuit)
+        output = np.lib.format.open_memmap(
+            path, mode="w+", dtype=self.dtype, shape=amplitudes.shape
+        )
+        _copy_in_chunks(amplitudes, output, chunk_size)
+        output.flush()
+        del output, amplitudes
+        return np.load(path, mmap_mode="r")
+
+    def _simulate_into_file(self, circuit: Circuit, path: Path, chunk_size: int):
+        circuit = self._optimize(circuit)
+        register = _register(circuit)
+        output = np.lib.format.open_memmap(
+            path, mode="w+", dtype=self.dtype, shape=(2 ** len(register),)
+        )
+        output[0] = 1
+        self._n_jobs_executed += 1
+        self._n_circuits_executed += 1
+        with tempfile.TemporaryFile(dir=path.parent) as buffer_file:
+            buffer = np.memmap(
+                buffer_file, dtype=self.dtype, mode="w+", shape=output.shape
+            )
+            with self.metrics.phase("simulation"):
+                state = apply_operations(output, circuit.operations, register, buffer)
+            if not np.may_share_memory(state, output):
+                _copy_in_chunks(state, output, chunk_size)
+            del state, buffer
+        output.flush()
+
+    def get_amplitudes(self, circuit: Circuit, bitstrings: Sequence[str]) -> np.ndarray:
+        """
+        Computes selected amplitudes of the state prepared by the circuit
+
+        With the "device" engine they are requested as Braket's Amplitude
+        result type, so only the selected amplitudes are transferred.
+
+        Args:
+            circuit: the circuit to prepare the state
+            bitstrings: basis states, with a bit for each qubit acted on by
+                the circuit, in increasing order of qubits, e.g. "0110"
+
+        Returns:
+            Array of amplitudes of the basis states, in the same order
+        """
+        register = _expectation_register(circuit, [])
+        for bitstring in bitstrings:
+            if len(bitstring) != len(register) or set(bitstring) - {"0", "1"}:
                 raise ValueError(
-                    "AWS Braket simulators can be initialized only in the zero states"
+                    f"Expected bitstrings of {len(register)} bits, got {bitstring}"
                 )
+        if self.engine == "numpy":
+            state = self._simulate(circuit)
+            return state[[int(bitstring, 2) for bitstring in bitstrings]]
 
-        braket_circuit = export_to_braket(circuit)
+        braket_circuit = self._export_circuit(circuit)
+        braket_circuit.amplitude(state=list(bitstrings))
+        result = self._run_task(braket_circuit, 0)
+        self._n_jobs_executed += 1
+        self._n_circuits_executed += 1
+        amplitudes = result.values[0]
+        return np.array([amplitudes[bitstring] for bitstring in bitstrings], self.dtype)
 
-        # Braket's convention to return statevector result type
-        braket_circuit.state_vector()
-        result = self.device.run(braket_circuit, shots=0).result()
+    def get_probabilities(
+        self, circuit: Circuit, qubits: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        """
+        Computes marginal probabilities of measuring the given qubits
+
+        With the "device" engine they are requested as Braket's Probability
+        result type, so only 2 ** len(qubits) entries are transferred.
+
+        Args:
+            circuit: the circuit to prepare the state
+            qubits: qubits whose outcomes are distributed. Defaults to all
+                qubits acted on by the circuit, in increasing order.
+
+        Returns:
+            Array of 2 ** len(qubits) probabilities, indexed by bitstrings
+            whose first bit is the outcome of the first of the qubits
+        """
+        register = _expectation_register(circuit, [])
+        qubits = register if qubits is None else list(qubits)
+        missing_qubits = sorted(set(qubits) - set(register))
+        # Qubits without gates are in the zero state, but have to be simulated.
+        circuit = circuit + Circuit([I(qubit) for qubit in missing_qubits])
+        register = sorted(register + missing_qubits)
+
+        if self.engine == "numpy":
+            probabilities = np.abs(self._simulate(circuit)) ** 2
+            positions = [register.index(qubit) for qubit in qubits]
+            others = [
+                position
+                for position in range(len(register))
+                if position not in positions
+            ]
+            marginal = probabilities.reshape((2,) * len(register)).sum(
+                axis=tuple(others)
+            )
+            order = np.argsort(np.argsort(positions))
+            return marginal.transpose(order).reshape(-1)
+
+        braket_circuit = self._export_circuit(circuit)
+        braket_circuit.probability(target=qubits)
+        return np.asarray(self._run_exact(braket_circuit)[0])
+
+    def _simulate(
+        self,
+        circuit: Circuit,
+        qubits=None,
+        initial_state: Optional[StateVector] = None,
+    ) -> np.ndarray:
+        circuit = self._optimize(circuit)
         self._n_jobs_executed += 1
         self._n_circuits_executed += 1
-        return Wavefunction(np.array(result.values[0], np.complex64))
+        with self.metrics.phase("simulation"):
+            if self.prefix_cache is not None:
+                return self.prefix_cache.simulate(
+                    circuit, self.dtype, qubits, initial_state
+                )
+            return simulate_statevector(circuit, self.dtype, qubits, initial_state)
+
+    def _export_wavefunction_circuit(self, circuit: Circuit):
+        braket_circuit = self._export_circuit(circuit)
+
+        # Braket's convention to return statevector result type
+        braket_circuit.state_vector()
+        return braket_circuit
 
     def get_exact_expectation_values(
         self, circuit: Circuit, operator: PauliRepresentation
@@ -50,14 +351,242 @@ class _BraketWavefunctionSimulator(BraketRunner):
         """
         Provides the expectation values for a given circuit and operator
 
+        Each distinct term of the operator is requested as a Braket
+        Expectation result type of a single task, so the wavefunction is never
+        transferred. Coefficients are summed locally.
+
+        If the simulator was created with light_cone=True, terms are grouped
+        by `light_cone_groups` and each group is measured on the backward
+        light cone of its qubits only. Operators made of local terms of
+        shallow circuits can then be measured on many more qubits than fit in
+        a single state vector.
+
         Args:
             circuit: circuit to prepare the state
             operator: operator to measure
 
         """
-        wavefunction = self.get_wavefunction(circuit)
-        return get_expectation_value(operator, wavefunction).real
+        constant, grouped_terms = _group_identical_terms(operator)
+        if not grouped_terms:
+            return complex(constant).real
+
+        terms = [term for term, _ in grouped_terms.values()]
+        if self.light_cone:
+            values = np.empty(len(terms), dtype=complex)
+            for cone, indices in light_cone_groups(circuit, terms):
+                values[indices] = self._expectation_values(
+                    cone, [terms[index] for index in indices]
+                )
+        else:
+            values = np.asarray(self._expectation_values(circuit, terms))
+
+        # Casting to real, because any non-zero imaginary part must mean some
+        # numerical inaccuracy.
+        expectation_value = constant + sum(
+            coefficient * value
+            for (_, coefficient), value in zip(grouped_terms.values(), values)
+        )
+        return complex(expectation_value).real
+
+    def _expectation_values(
+        self, circuit: Circuit, terms: Sequence[PauliTerm]
+    ) -> np.ndarray:
+        if self.engine == "numpy":
+            register = _expectation_register(circuit, terms)
+            state = self._simulate(circuit, register)
+            return _pauli_expectation_values(state[None], terms, register)[0]
+
+        braket_circuit = self._export_circuit(circuit)
+        for term in terms:
+            observable, qubits = export_to_braket_observable(term)
+            braket_circuit.expectation(observable, target=qubits)
+        return np.asarray(self._run_exact(braket_circuit))
+
+    def get_wavefunctions_for_params(
+        self,
+        circuit: Circuit,
+        params: np.ndarray,
+        chunk_size: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Computes wavefunctions of a symbolic circuit for many parameter values
+
+        With the "device" engine, the circuit is converted once and each chunk
+        of parameter values is submitted as a single Braket batch of the same
+        program with different inputs. With the "numpy" engine, each chunk is
+        simulated at once with `simulate_statevectors`.
+
+        Args:
+            circuit: the symbolic circuit to prepare the states
+            params: array of shape (N, P) whose rows are values of
+                circuit.free_symbols, in the same order
+            chunk_size: number of rows of params computed at once. Defaults to
+                as many as fit in 2**24 amplitudes.
+
+        Returns:
+            Array of shape (N, 2 ** n_qubits) of amplitudes of the
+            wavefunction for each row of params
+        """
+        params = _check_sweep_params(circuit, params)
+        register = _expectation_register(circuit, [])
+        amplitudes = np.empty((len(params), 2 ** len(register)), dtype=self.dtype)
+        if self.engine == "device":
+            template = export_to_braket_template(circuit)
+            program = self._get_parametric_program(template, state_vector=True)
+
+        for start, chunk in _chunks(params, chunk_size, len(register)):
+            if self.engine == "numpy":
+                amplitudes[start : start + len(chunk)] = self._simulate_sweep(
+                    circuit, chunk, register
+                )
+            else:
+                amplitudes[start : start + len(chunk)] = [
+                    values[0] for values in self._run_sweep(program, template, chunk)
+                ]
+        return amplitudes
+
+    def get_exact_expectation_values_for_params(
+        self,
+        circuit: Circuit,
+        operator: PauliRepresentation,
+        params: np.ndarray,
+        chunk_size: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Computes exact expectation values of a symbolic circuit for many
+        parameter values
+
+        See `get_wavefunctions_for_params` for how the parameter values are
+        evaluated, and `get_exact_expectation_values` for how terms of the
+        operator are measured.
+
+        Args:
+            circuit: the symbolic circuit to prepare the states
+            operator: operator to measure
+            params: array of shape (N, P) whose rows are values of
+                circuit.free_symbols, in the same order
+            chunk_size: number of rows of params computed at once. Defaults to
+                as many as fit in 2**24 amplitudes.
+
+        Returns:
+            Array of shape (N,) of expectation values for each row of params
+        """
+        params = _check_sweep_params(circuit, params)
+        constant, grouped_terms = _group_identical_terms(operator)
+        expectation_values = np.full(len(params), complex(constant).real)
+        if not grouped_terms:
+            return expectation_values
+
+        terms = [term for term, _ in grouped_terms.values()]
+        coefficients = np.array(
+            [coefficient for _, coefficient in grouped_terms.values()]
+        )
+        register = _expectation_register(circuit, terms)
+        if self.engine == "device":
+            template = export_to_braket_template(circuit)
+            braket_circuit = template.circuit.copy()
+            for term in terms:
+                observable, qubits = export_to_braket_observable(term)
+                braket_circuit.expectation(observable, target=qubits)
+            program = braket_circuit.to_ir(IRType.OPENQASM)
+
+        for start, chunk in _chunks(params, chunk_size, len(register)):
+            if self.engine == "numpy":
+                states = self._simulate_sweep(circuit, chunk, register)
+                values = _pauli_expectation_values(states, terms, register)
+            else:
+                values = np.array(self._run_sweep(program, template, chunk))
+            # Casting to real, because any non-zero imaginary part must mean
+            # some numerical inaccuracy.
+            expectation_values[start : start + len(chunk)] += (
+                values @ coefficients
+            ).real
+        return expectation_values
+
+    def _simulate_sweep(
+        self, circuit: Circuit, params: np.ndarray, register: Sequence[int]
+    ) -> np.ndarray:
+        self._n_jobs_executed += 1
+        self._n_circuits_executed += len(params)
+        with self.metrics.phase("simulation"):
+            return simulate_statevectors(circuit, params, self.dtype, register)
+
+    def _run_sweep(self, program, template, params: np.ndarray) -> List:
+        results = self._run_task_batch(
+            program, 0, inputs=[template.inputs(row) for row in params]
+        )
+        self._n_jobs_executed += 1
+        self._n_circuits_executed += len(params)
+        if any(result is None for result in results):
+            raise RuntimeError("Braket task in the sweep did not return a result")
+        return [result.values for result in results]
+
+
+def _copy_in_chunks(source: np.ndarray, target: np.ndarray, chunk_size: int):
+    for start in range(0, len(source), chunk_size):
+        target[start : start + chunk_size] = source[start : start + chunk_size]
+
+
+# Bounds the number of amplitudes computed at once by parameter sweeps.
+_MAX_SWEEP_AMPLITUDES = 2**24
+
+
+def _check_sweep_params(circuit: Circuit, params: np.ndarray) -> np.ndarray:
+    params = np.asarray(params, dtype=float)
+    n_symbols = len(circuit.free_symbols)
+    if params.ndim != 2 or params.shape[1] != n_symbols:
+        raise ValueError(
+            f"Expected params of shape (N, {n_symbols}), got {params.shape}"
+        )
+    return params
+
+
+def _chunks(params: np.ndarray, chunk_size: Optional[int], n_qubits: int):
+    if chunk_size is None:
+        chunk_size = max(1, _MAX_SWEEP_AMPLITUDES // 2**n_qubits)
+    for start in range(0, len(params), chunk_size):
+        yield start, params[start : start + chunk_size]
+
+
+def _expectation_register(circuit: Circuit, terms: Sequence[PauliTerm]) -> List[int]:
+    return sorted(
+        set().union(
+            *(term.qubits for term in terms),
+            *(operation.qubit_indices for operation in circuit.operations),
+        )
+    )
+
+
+def _pauli_expectation_values(
+    states: np.ndarray, terms: Sequence[PauliTerm], register: Sequence[int]
+) -> np.ndarray:
+    # Values of shape (N, len(terms)) for a stack of N states.
+    values = np.empty((len(states), len(terms)), dtype=complex)
+    for index, term in enumerate(terms):
+        pauli_operations = [
+            _PAULI_GATES[term[qubit]](qubit) for qubit in sorted(term.qubits)
+        ]
+        rotated = apply_operations(states.copy(), pauli_operations, register)
+        values[:, index] = np.einsum("ij,ij->i", states.conj(), rotated)
+    return values
 
 
-def braket_local_simulator():
-    return _BraketWavefunctionSimulator(LocalSimulator())
+def braket_local_simulator(
+    cache: Optional[ResultCache] = None,
+    engine: str = "device",
+    dtype: DTypeLike = np.complex128,
+    metrics: Optional[MetricsSink] = None,
+    optimizer: Optional[CircuitOptimizer] = None,
+    light_cone: bool = False,
+    prefix_cache: Optional[PrefixStateCache] = None,
+):
+    return _BraketWavefunctionSimulator(
+        LocalSimulator(),
+        cache,
+        engine,
+        dtype,
+        metrics,
+        optimizer,
+        light_cone,
+        prefix_cache,
+    )
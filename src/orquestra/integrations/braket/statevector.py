@@ -0,0 +1,401 @@
+################################################################################
+# © Copyright 2022 Zapata Computing Inc.
+################################################################################
+"""NumPy statevector simulation of circuits made of gates supported by Braket.
+
+States follow the conventions of Braket's "braket_sv" simulator: only qubits
+acted on by gates are simulated, in increasing order, and the first of them
+is the most significant bit of the index of an amplitude.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import sympy
+from numpy.typing import ArrayLike, DTypeLike
+from orquestra.quantum.circuits import Circuit
+
+# Gates which are diagonal in the computational basis are applied in place by
+# multiplying the state with their diagonal, all others by a contraction into
+# a second buffer of the same size.
+_DIAGONAL = True
+_DENSE = False
+
+_SQRT_HALF = np.sqrt(0.5)
+
+_CONSTANT_GATES: Dict[str, Tuple[bool, np.ndarray]] = {
+    "X": (_DENSE, np.array([[0, 1], [1, 0]])),
+    "Y": (_DENSE, np.array([[0, -1j], [1j, 0]])),
+    "Z": (_DIAGONAL, np.array([1, -1])),
+    "H": (_DENSE, np.array([[_SQRT_HALF, _SQRT_HALF], [_SQRT_HALF, -_SQRT_HALF]])),
+    "S": (_DIAGONAL, np.array([1, 1j])),
+    "T": (_DIAGONAL, np.array([1, np.exp(1j * np.pi / 4)])),
+    "CZ": (_DIAGONAL, np.array([1, 1, 1, -1])),
+    "CNOT": (
+        _DENSE,
+        np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]]),
+    ),
+    "ISWAP": (
+        _DENSE,
+        np.array([[1, 0, 0, 0], [0, 0, 1j, 0], [0, 1j, 0, 0], [0, 0, 0, 1]]),
+    ),
+    "SWAP": (
+        _DENSE,
+        np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]]),
+    ),
+}
+
+
+def _matrix(rows) -> np.ndarray:
+    # Builds matrices from entries which are either numbers or arrays of
+    # angles, so that a single angle gives a single matrix and an array of
+    # angles a stack of matrices along the leading axes.
+    entries = np.broadcast_arrays(*(entry for row in rows for entry in row))
+    return np.stack(entries, axis=-1).reshape(entries[0].shape + (len(rows), len(rows)))
+
+
+def _diagonal(entries) -> np.ndarray:
+    return np.stack(np.broadcast_arrays(*entries), axis=-1)
+
+
+def _rx(angle: np.ndarray) -> np.ndarray:
+    cos, sin = np.cos(angle / 2), np.sin(angle / 2)
+    return _matrix([[cos, -1j * sin], [-1j * sin, cos]])
+
+
+def _ry(angle: np.ndarray) -> np.ndarray:
+    cos, sin = np.cos(angle / 2), np.sin(angle / 2)
+    return _matrix([[cos, -sin], [sin, cos]])
+
+
+def _rz(angle: np.ndarray) -> np.ndarray:
+    return _diagonal([np.exp(-0.5j * angle), np.exp(0.5j * angle)])
+
+
+def _phase(angle: np.ndarray) -> np.ndarray:
+    return _diagonal([1, np.exp(1j * angle)])
+
+
+def _cphase(angle: np.ndarray) -> np.ndarray:
+    return _diagonal([1, 1, 1, np.exp(1j * angle)])
+
+
+def _xx(angle: np.ndarray) -> np.ndarray:
+    cos, sin = np.cos(angle / 2), -1j * np.sin(angle / 2)
+    return _matrix(
+        [[cos, 0, 0, sin], [0, cos, sin, 0], [0, sin, cos, 0], [sin, 0, 0, cos]]
+    )
+
+
+def _yy(angle: np.ndarray) -> np.ndarray:
+    cos, sin = np.cos(angle / 2), 1j * np.sin(angle / 2)
+    return _matrix(
+        [[cos, 0, 0, sin], [0, cos, -sin, 0], [0, -sin, cos, 0], [sin, 0, 0, cos]]
+    )
+
+
+def _zz(angle: np.ndarray) -> np.ndarray:
+    positive, negative = np.exp(0.5j * angle), np.exp(-0.5j * angle)
+    return _diagonal([negative, positive, positive, negative])
+
+
+def _xy(angle: np.ndarray) -> np.ndarray:
+    cos, sin = np.cos(angle / 2), 1j * np.sin(angle / 2)
+    return _matrix([[1, 0, 0, 0], [0, cos, sin, 0], [0, sin, cos, 0], [0, 0, 0, 1]])
+
+
+_PARAMETRIZED_GATES: Dict[str, Tuple[bool, Callable[[np.ndarray], np.ndarray]]] = {
+    "RX": (_DENSE, _rx),
+    "RY": (_DENSE, _ry),
+    "RZ": (_DIAGONAL, _rz),
+    "PHASE": (_DIAGONAL, _phase),
+    "CPHASE": (_DIAGONAL, _cphase),
+    "XX": (_DENSE, _xx),
+    "YY": (_DENSE, _yy),
+    "ZZ": (_DIAGONAL, _zz),
+    "XY": (_DENSE, _xy),
+}
+
+
+def simulate_statevector(
+    circuit: Circuit,
+    dtype: DTypeLike = np.complex128,
+    qubits: Optional[Iterable[int]] = None,
+    initial_state: Optional[ArrayLike] = None,
+) -> np.ndarray:
+    """Computes the state prepared by the circuit from the all-zeros state.
+
+    Gates are applied as contractions of their matrices with the state, which
+    is reshaped without copying. Two buffers of the size of the state are
+    used throughout the simulation.
+
+    Args:
+        circuit: the circuit to simulate. All its parameters have to be bound.
+        dtype: complex64 or complex128, precision of the simulation.
+        qubits: additional qubits to include in the simulated register.
+        initial_state: state vector of 2 ** n amplitudes over qubits 0 to
+            n - 1, ordered like the returned state, from which the simulation
+            starts instead of the all-zeros state. It isn't modified.
+
+    Returns:
+        State vector of the given dtype, over the qubits acted on by the
+        circuit and the additional qubits, in increasing order, or over the
+        qubits of the initial state if one was given.
+    """
+    register, state = _initial_state(circuit, dtype, qubits, initial_state)
+    return apply_operations(state, circuit.operations, register)
+
+
+def simulate_statevectors(
+    circuit: Circuit,
+    params: np.ndarray,
+    dtype: DTypeLike = np.complex128,
+    qubits: Optional[Iterable[int]] = None,
+) -> np.ndarray:
+    """Computes states prepared by a symbolic circuit for many parameter values.
+
+    All the states are simulated at once, as a stack along a leading axis, so
+    each gate is applied to all of them with a single operation.
+
+    Args:
+        circuit: the symbolic circuit to simulate.
+        params: array of shape (N, P) whose rows are values of
+            circuit.free_symbols, in the same order.
+        dtype: complex64 or complex128, precision of the simulation.
+        qubits: additional qubits to include in the simulated register.
+
+    Returns:
+        Array of shape (N, 2 ** n_qubits) whose rows are the state vectors
+        prepared for the rows of params. Qubits are ordered as in
+        `simulate_statevector`.
+    """
+    params = np.asarray(params, dtype=float)
+    symbols = circuit.free_symbols
+    if params.ndim != 2 or params.shape[1] != len(symbols):
+        raise ValueError(
+            f"Expected params of shape (N, {len(symbols)}), got {params.shape}"
+        )
+    values = dict(zip(symbols, params.T))
+
+    def angle(param) -> Union[float, np.ndarray]:
+        if isinstance(param, sympy.Expr) and param.free_symbols:
+            param_symbols = sorted(param.free_symbols, key=str)
+            function = sympy.lambdify(param_symbols, param, "numpy")
+            return np.asarray(function(*(values[symbol] for symbol in param_symbols)))
+        return _bound_angle(param)
+
+    register = _register(circuit, qubits)
+    states = np.zeros((len(params), 2 ** len(register)), dtype=dtype)
+    states[:, 0] = 1
+    return _apply_operations(states, circuit.operations, register, angle)
+
+
+def apply_operations(
+    state: np.ndarray,
+    operations: Iterable,
+    register: Sequence[int],
+    buffer: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Applies operations to a state over the given register of qubits.
+
+    The given state, and buffer if one was given, may be overwritten.
+
+    Args:
+        state: state vector over the qubits of the register, or an array of
+            shape (N, 2 ** len(register)) of such state vectors.
+        operations: gate operations acting on qubits of the register
+        register: qubits of the state, in increasing order
+        buffer: optional array of the shape and dtype of state, e.g. a
+            memory-mapped one, used instead of allocating a second buffer.
+
+    Returns:
+        State vector (or vectors) after applying the operations, which is
+        either state or buffer.
+    """
+    if state.ndim == 1:
+        return _apply_operations(
+            state[None],
+            operations,
+            register,
+            _bound_angle,
+            None if buffer is None else buffer[None],
+        )[0]
+    return _apply_operations(state, operations, register, _bound_angle, buffer)
+
+
+def _apply_operations(
+    states: np.ndarray,
+    operations: Iterable,
+    register: Sequence[int],
+    angle: Callable,
+    buffer: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    positions = {qubit: position for position, qubit in enumerate(register)}
+    n_qubits = len(register)
+    for operation in operations:
+        name = operation.gate.name
+        if name == "I":
+            continue
+        is_diagonal, matrix = _gate_matrix(name, operation.params, states.dtype, angle)
+        targets = [positions[qubit] for qubit in operation.qubit_indices]
+        if is_diagonal:
+            _apply_diagonal(states, matrix, targets, n_qubits)
+        else:
+            if buffer is None:
+                buffer = np.empty_like(states)
+            _apply_dense(states, matrix, targets, n_qubits, out=buffer)
+            states, buffer = buffer, states
+    return states
+
+
+def _initial_state(
+    circuit: Circuit,
+    dtype: DTypeLike,
+    qubits: Optional[Iterable[int]] = None,
+    initial_state: Optional[ArrayLike] = None,
+) -> Tuple[List[int], np.ndarray]:
+    register = _register(circuit, qubits)
+    if initial_state is None:
+        state = np.zeros(2 ** len(register), dtype=dtype)
+        state[0] = 1
+        return register, state
+
+    state = np.array(initial_state, dtype=dtype).reshape(-1)
+    n_qubits = len(state).bit_length() - 1
+    if len(state) != 2**n_qubits:
+        raise ValueError(
+            f"Initial state has to have 2 ** n amplitudes, got {len(state)}"
+        )
+    if register and register[-1] >= n_qubits:
+        raise ValueError(
+            f"Initial state of {n_qubits} qubits doesn't include qubit {register[-1]}"
+        )
+    return list(range(n_qubits)), state
+
+
+def _register(circuit: Circuit, qubits: Optional[Iterable[int]] = None):
+    used_qubits = {
+        qubit for operation in circuit.operations for qubit in operation.qubit_indices
+    }
+    if qubits is not None:
+        used_qubits.update(qubits)
+    return sorted(used_qubits)
+
+
+def _bound_angle(param) -> float:
+    try:
+        return float(param)
+    except TypeError:
+        raise ValueError(
+            f"Parameter {param} has to be bound before simulating the circuit"
+        ) from None
+
+
+_constant_matrices: Dict[Tuple[str, np.dtype], Tuple[bool, np.ndarray]] = {}
+
+
+def _gate_matrix(name: str, params, dtype, angle: Callable) -> Tuple[bool, np.ndarray]:
+    try:
+        return _constant_matrices[name, dtype]
+    except KeyError:
+        pass
+    if name in _CONSTANT_GATES:
+        is_diagonal, matrix = _CONSTANT_GATES[name]
+        entry = (is_diagonal, matrix.astype(dtype))
+        _constant_matrices[name, dtype] = entry
+        return entry
+    try:
+        is_diagonal, make_matrix = _PARAMETRIZED_GATES[name]
+    except KeyError:
+        raise RuntimeError(
+            "Gate: {} is not supported in Braket Circuits".format(name)
+        ) from None
+    return is_diagonal, make_matrix(angle(params[0])).astype(dtype)
+
+
+def _split_shape(targets: Sequence[int], n_qubits: int) -> Tuple[int, ...]:
+    # Shape viewing a state as (rest, 2, rest, 2, ..., rest), with the axes
+    # of size 2 corresponding to the sorted targets.
+    shape = []
+    previous = -1
+    for target in sorted(targets):
+        shape += [2 ** (target - previous - 1), 2]
+        previous = target
+    shape.append(2 ** (n_qubits - previous - 1))
+    return tuple(shape)
+
+
+def _sorted_tensor(matrix: np.ndarray, targets: Sequence[int], n_axes: int):
+    # Reorders axes of a gate tensor so that they follow sorted targets. Axes
+    # preceding the n_axes matrix axes index parameter values and are kept.
+    n_targets = len(targets)
+    n_leading = matrix.ndim - n_axes
+    order = list(np.argsort(targets))
+    tensor = matrix.reshape(matrix.shape[:n_leading] + (2,) * (n_axes * n_targets))
+    axes = list(range(n_leading))
+    axes += [n_leading + n * n_targets + axis for n in range(n_axes) for axis in order]
+    return tensor.transpose(axes)
+
+
+def _apply_diagonal(
+    states: np.ndarray, diagonal: np.ndarray, targets: Sequence[int], n_qubits: int
+):
+    view = states.reshape((len(states),) + _split_shape(targets, n_qubits))
+    factors = _sorted_tensor(diagonal, targets, 1)
+    broadcast_shape = [len(factors) if diagonal.ndim > 1 else 1] + [1] * (view.ndim - 1)
+    for axis in range(len(targets)):
+        broadcast_shape[2 * axis + 2] = 2
+    view *= factors.reshape(broadcast_shape)
+
+
+def _apply_dense(
+    states: np.ndarray,
+    matrix: np.ndarray,
+    targets: Sequence[int],
+    n_qubits: int,
+    out: np.ndarray,
+):
+    # Each slice of the output with fixed values of the target qubits is a
+    # combination of slices of the input. Zero entries of the matrix are
+    # skipped, so permutation gates like CNOT only copy slices.
+    shape = (len(states),) + _split_shape(targets, n_qubits)
+    view = states.reshape(shape)
+    out_view = out.reshape(shape)
+    dimension = 2 ** len(targets)
+    tensor = _sorted_tensor(matrix, targets, 2)
+    tensor = tensor.reshape(tensor.shape[: matrix.ndim - 2] + (dimension, dimension))
+    # Coefficients for a stack of states broadcast along their other axes.
+    coefficient_shape = (-1,) + (1,) * (len(targets) + 1)
+    slices = [_basis_slice(index, len(targets)) for index in range(dimension)]
+    # Products are accumulated through a single buffer, allocated once.
+    scratch: Optional[np.ndarray] = None
+    for row, out_slice in enumerate(slices):
+        target = out_view[out_slice]
+        is_empty = True
+        for column, in_slice in enumerate(slices):
+            coefficient = tensor[..., row, column]
+            if not coefficient.any():
+                continue
+            if coefficient.ndim:
+                coefficient = coefficient.reshape(coefficient_shape)
+            if is_empty:
+                np.multiply(view[in_slice], coefficient, out=target)
+                is_empty = False
+            else:
+                if scratch is None:
+                    scratch = np.empty_like(target)
+                np.multiply(view[in_slice], coefficient, out=scratch)
+                np.add(target, scratch, out=target)
+        if is_empty:
+            target[...] = 0
+
+
+def _basis_slice(index: int, n_targets: int) -> Tuple:
+    # Selects all the states and values of sorted targets given by bits of the
+    # index, the first target being the most significant bit.
+    bits = [(index >> (n_targets - 1 - axis)) & 1 for axis in range(n_targets)]
+    items: List = [slice(None)]
+    for bit in bits:
+        items += [slice(None), bit]
+    items.append(slice(None))
+    return tuple(items)
@@ -0,0 +1,131 @@
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from orquestra.quantum.circuits import CNOT, RX, Circuit, H, X
+from orquestra.quantum.operators import PauliSum
+
+from orquestra.integrations.braket.cache import ResultCache
+from orquestra.integrations.braket.runner import braket_local_runner
+from orquestra.integrations.braket.simulator import braket_local_simulator
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return ResultCache(tmp_path / "cache")
+
+
+@pytest.mark.local
+def test_stored_entries_can_be_loaded(cache):
+    counts_key = ResultCache.key("circuit", "device", "100")
+    array_key = ResultCache.key("circuit", "device", "0")
+    array = np.array([0.5, 0.5j, -0.5, 0.5], dtype=np.complex128)
+
+    cache.save_counts(counts_key, {"00": 60, "11": 40})
+    cache.save_array(array_key, array)
+
+    assert cache.load_counts(counts_key) == {"00": 60, "11": 40}
+    np.testing.assert_array_equal(cache.load_array(array_key), array)
+
+
+@pytest.mark.local
+def test_missing_and_corrupted_entries_are_misses(cache):
+    key = ResultCache.key("circuit")
+    (cache.directory / f"{key}.json").write_text("{not json")
+
+    assert cache.load_counts(key) is None
+    assert cache.load_array(key) is None
+
+
+@pytest.mark.local
+def test_key_depends_on_every_part():
+    assert ResultCache.key("ab", "c") != ResultCache.key("a", "bc")
+    assert ResultCache.key("a", "b") == ResultCache.key("a", "b")
+
+
+@pytest.mark.local
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(tmp_path, max_size_bytes=3 * 8 * 100 + 3 * 128)
+    keys = [ResultCache.key(str(i)) for i in range(4)]
+    for time, key in enumerate(keys[:3]):
+        cache.save_array(key, np.zeros(100))
+        os.utime(cache.directory / f"{key}.npy", (time, time))
+
+    # Reading the oldest entry makes it the most recently used one.
+    assert cache.load_array(keys[0]) is not None
+    cache.save_array(keys[3], np.zeros(100))
+
+    assert cache.load_array(keys[1]) is None
+    assert all(cache.load_array(key) is not None for key in (keys[0], keys[3]))
+
+
+@pytest.mark.local
+def test_runner_returns_cached_counts_without_running_tasks(cache):
+    circuits = [Circuit([H(0), CNOT(0, 1)]), Circuit([X(0)])]
+    first_runner = braket_local_runner(cache=cache)
+    second_runner = braket_local_runner(cache=cache)
+
+    first = first_runner.run_batch_and_measure(circuits, 50)
+    second = second_runner.run_batch_and_measure(circuits, 50)
+
+    assert [m.get_counts() for m in first] == [m.get_counts() for m in second]
+    assert second_runner.n_circuits_executed == 0
+    assert second_runner.run_and_measure(circuits[0], 50).get_counts() == (
+        first[0].get_counts()
+    )
+
+
+@pytest.mark.local
+def test_number_of_shots_is_part_of_the_key(cache):
+    runner = braket_local_runner(cache=cache)
+    runner.run_batch_and_measure([Circuit([X(0)])], 10)
+
+    measurements = runner.run_batch_and_measure([Circuit([X(0)])], 20)
+
+    assert measurements[0].get_counts() == {"1": 20}
+
+
+@pytest.mark.local
+def test_simulator_returns_cached_wavefunctions_and_expectation_values(cache):
+    circuit = Circuit([H(0), CNOT(0, 1), RX(0.3)(1)])
+    operator = PauliSum("Z0*Z1 + 0.5*X1")
+    first_simulator = braket_local_simulator(cache)
+    second_simulator = braket_local_simulator(cache)
+
+    wavefunction = first_simulator.get_wavefunction(circuit)
+    expectation_value = first_simulator.get_exact_expectation_values(circuit, operator)
+
+    np.testing.assert_array_equal(
+        second_simulator.get_wavefunction(circuit).amplitudes, wavefunction.amplitudes
+    )
+    assert (
+        second_simulator.get_exact_expectation_values(circuit, operator)
+        == expectation_value
+    )
+    assert second_simulator.n_jobs_executed == 0
+
+
+@pytest.mark.local
+def test_directory_is_scanned_only_when_limit_is_exceeded(tmp_path):
+    cache = ResultCache(tmp_path, max_size_bytes=3 * 8 * 100 + 3 * 128)
+
+    with patch.object(ResultCache, "_evict", wraps=cache._evict) as evict:
+        for index in range(4):
+            cache.save_array(ResultCache.key(str(index)), np.zeros(100))
+
+    # The first write measures the directory, the fourth one exceeds the limit.
+    assert evict.call_count == 2
+    assert len(list(tmp_path.iterdir())) == 3
+
+
+@pytest.mark.local
+def test_seeded_runners_do_not_use_cache(cache):
+    runner = braket_local_runner(cache=cache, seed=1234)
+    circuit = Circuit([RX(1.0)(0)])
+
+    first = runner.run_and_measure(circuit, 1000).get_counts()
+    second = runner.run_and_measure(circuit, 1000).get_counts()
+
+    assert first != second
+    assert list(cache.directory.iterdir()) == []
@@ -0,0 +1,141 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from braket.circuits.serialization import IRType
+
+
+class StubTask:
+    """Task of a StubDevice, returning all-ones bitstrings."""
+
+    def __init__(self, device, task_id, n_bits, shots, s3_directory=None):
+        self._device = device
+        self.id = task_id
+        self._counts = {"1" * n_bits: shots}
+        self._s3_directory = s3_directory
+        # States returned by consecutive polls, the last one repeatedly.
+        self.states = ["COMPLETED"]
+
+    def state(self):
+        if self._device.crashing:
+            return "RUNNING"
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+    def result(self):
+        if self._device.crashing:
+            raise ConnectionError("stub device crashed")
+        return SimpleNamespace(
+            measurement_counts=self._counts,
+            task_metadata=SimpleNamespace(id=self.id),
+        )
+
+    def metadata(self):
+        bucket, directory = self._s3_directory
+        return {"outputS3Bucket": bucket, "outputS3Directory": directory}
+
+
+class StubBatch:
+    def __init__(self, tasks):
+        self.tasks = tasks
+
+    def results(self):
+        return [task.result() for task in self.tasks]
+
+
+class StubDevice:
+    """Local stand-in for an AwsDevice and the task service behind it.
+
+    Programs are serialized to OpenQASM, like AwsDevice does before every
+    submission, and every task measures all ones. Tasks outlive runners and
+    can be loaded by their ids, as by a TaskJournal. While `crashing` is set,
+    tasks stay running and fetching their results raises ConnectionError.
+
+    Args:
+        name: name of the device
+        qubit_count: number of qubits of the device
+        queue_size: number of tasks reported by queue_depth
+        delay: number of seconds each submission takes
+        s3_client: client to which results.json of tasks are written, if
+            they are given an s3_destination_folder
+    """
+
+    arn = "arn:aws:braket:::device/quantum-simulator/stub/sv1"
+
+    def __init__(
+        self, name="StubSV1", qubit_count=34, queue_size="0", delay=0.0, s3_client=None
+    ):
+        self.name = name
+        self.properties = SimpleNamespace(
+            paradigm=SimpleNamespace(qubitCount=qubit_count),
+            service=SimpleNamespace(shotsRange=(1, 100_000)),
+        )
+        self.queue_size = queue_size
+        self.delay = delay
+        self.s3_client = s3_client
+        self.tasks = {}
+        self.s3_destination_folders = []
+        self.crashing = False
+        self.n_circuits_run = 0
+        self.n_queue_depth_calls = 0
+
+    def run(self, task_specification, s3_destination_folder=None, shots=0, **kwargs):
+        time.sleep(self.delay)
+        return self._create(task_specification, shots, s3_destination_folder)
+
+    def run_batch(
+        self, task_specifications, shots=0, s3_destination_folder=None, **kwargs
+    ):
+        time.sleep(self.delay)
+        return StubBatch(
+            [
+                self._create(task_specification, shots, s3_destination_folder)
+                for task_specification in task_specifications
+            ]
+        )
+
+    def load(self, task_id):
+        return self.tasks[task_id]
+
+    def queue_depth(self):
+        self.n_queue_depth_calls += 1
+        return SimpleNamespace(quantum_tasks={"Normal": self.queue_size})
+
+    def _create(self, task_specification, shots, s3_destination_folder):
+        if hasattr(task_specification, "to_ir"):
+            task_specification = task_specification.to_ir(IRType.OPENQASM)
+        n_bits = task_specification.source.count("measure")
+        index = len(self.tasks)
+        task_id = f"arn:aws:braket:us-east-1:000000000000:quantum-task/{index}"
+        s3_directory = None
+        if s3_destination_folder is not None:
+            bucket, folder = s3_destination_folder
+            s3_directory = (bucket, f"{folder}/task-{index}")
+        task = StubTask(self, task_id, n_bits, shots, s3_directory)
+        if self.s3_client is not None and s3_directory is not None:
+            self.s3_client.put_object(
+                Bucket=s3_directory[0],
+                Key=f"{s3_directory[1]}/results.json",
+                Body=json.dumps(
+                    {
+                        "measurements": [[1] * n_bits] * shots,
+                        "measuredQubits": list(range(n_bits)),
+                        "taskMetadata": {"id": task_id, "shots": shots},
+                    }
+                ),
+            )
+        self.tasks[task_id] = task
+        self.s3_destination_folders.append(s3_destination_folder)
+        self.n_circuits_run += 1
+        return task
+
+
+@pytest.fixture
+def make_stub_device():
+    """Factory of StubDevices, taking the same arguments as StubDevice."""
+    return StubDevice
+
+
+@pytest.fixture
+def stub_device():
+    return StubDevice()
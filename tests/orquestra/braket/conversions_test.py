@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+import sympy
+from braket.circuits.serialization import IRType
+from orquestra.quantum.circuits import (
+    CNOT,
+    CPHASE,
+    CZ,
+    ISWAP,
+    PHASE,
+    RH,
+    RX,
+    RY,
+    RZ,
+    SWAP,
+    XX,
+    XY,
+    YY,
+    ZZ,
+    Circuit,
+    H,
+    I,
+    S,
+    T,
+    X,
+    Y,
+    Z,
+)
+
+from orquestra.integrations.braket.conversions import (
+    export_to_braket,
+    export_to_braket_template,
+    export_to_openqasm,
+)
+
+ALPHA, BETA = sympy.symbols("alpha beta")
+
+
+def _symbolic_circuit():
+    return Circuit([H(0), RY(BETA)(1), RX(ALPHA)(0), CNOT(0, 1), RX(2 * BETA)(1)])
+
+
+@pytest.mark.local
+def test_template_symbols_are_ordered_as_circuit_free_symbols():
+    circuit = _symbolic_circuit()
+
+    assert list(export_to_braket_template(circuit).symbols) == circuit.free_symbols
+
+
+@pytest.mark.local
+def test_templates_are_cached_by_circuit_structure():
+    assert export_to_braket_template(_symbolic_circuit()) is export_to_braket_template(
+        _symbolic_circuit()
+    )
+
+
+@pytest.mark.local
+def test_bound_template_matches_conversion_of_bound_circuit():
+    circuit = _symbolic_circuit()
+    params = [0.3, -1.2]
+
+    bound_template = export_to_braket_template(circuit).bind(params)
+    expected = export_to_braket(circuit.bind(dict(zip(circuit.free_symbols, params))))
+
+    np.testing.assert_allclose(bound_template.to_unitary(), expected.to_unitary())
+
+
+@pytest.mark.local
+def test_template_raises_for_wrong_number_of_params():
+    with pytest.raises(ValueError):
+        export_to_braket_template(_symbolic_circuit()).inputs([0.1])
+
+
+def _circuit_with_all_supported_gates():
+    return Circuit(
+        [
+            I(3),
+            X(0),
+            Y(1),
+            Z(2),
+            H(0),
+            S(1),
+            T(2),
+            CZ(0, 1),
+            CNOT(1, 2),
+            ISWAP(2, 0),
+            SWAP(0, 2),
+            XX(0.1)(0, 1),
+            XY(-0.2)(1, 2),
+            YY(0.3)(0, 2),
+            ZZ(np.float64(0.4))(2, 1),
+            PHASE(0.5)(0),
+            RX(0.6)(1),
+            RY(1e-20)(2),
+            RZ(np.pi)(0),
+            CPHASE(0.8)(0, 2),
+        ]
+    )
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("state_vector", [False, True])
+def test_openqasm_export_matches_serialized_braket_circuit(state_vector):
+    circuit = _circuit_with_all_supported_gates()
+    braket_circuit = export_to_braket(circuit)
+    if state_vector:
+        braket_circuit.state_vector()
+
+    program = export_to_openqasm(circuit, state_vector=state_vector)
+
+    assert program.source == braket_circuit.to_ir(IRType.OPENQASM).source
+
+
+@pytest.mark.local
+def test_openqasm_export_measures_only_used_qubits():
+    circuit = Circuit([H(0), CNOT(0, 3)])
+    expected_source = export_to_braket(circuit).to_ir(IRType.OPENQASM).source
+
+    assert export_to_openqasm(circuit).source == expected_source
+
+
+@pytest.mark.local
+def test_openqasm_export_raises_for_unbound_params():
+    with pytest.raises(ValueError):
+        export_to_openqasm(_symbolic_circuit())
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("export", [export_to_braket, export_to_openqasm])
+def test_export_raises_for_unsupported_gate(export):
+    with pytest.raises(RuntimeError):
+        export(Circuit([RH(0.1)(0)]))
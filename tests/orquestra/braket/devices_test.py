@@ -0,0 +1,182 @@
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from boto3 import Session  # type: ignore
+
+from orquestra.integrations.braket import devices
+from orquestra.integrations.braket.devices import (
+    DeviceCatalog,
+    DeviceSummary,
+    get_aws_session,
+)
+
+SV1_ARN = "arn:aws:braket:::device/quantum-simulator/amazon/sv1"
+QPU_ARN = "arn:aws:braket:us-east-1::device/qpu/ionq/Harmony"
+
+
+STUB_SEARCH_RESULTS = [
+    {"deviceName": "SV1", "deviceArn": SV1_ARN, "deviceType": "SIMULATOR"},
+    {"deviceName": "Harmony", "deviceArn": QPU_ARN, "deviceType": "QPU"},
+]
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def aws_session():
+    return SimpleNamespace(
+        boto_session=SimpleNamespace(region_name="us-east-1"),
+        search_devices=Mock(return_value=STUB_SEARCH_RESULTS),
+    )
+
+
+@pytest.fixture()
+def device_class():
+    with patch("orquestra.integrations.braket.devices.AwsDevice") as device_class:
+        device_class.REGIONS = ("us-east-1",)
+        yield device_class
+
+
+@pytest.mark.local
+def test_catalog_is_queried_once_within_ttl(aws_session, device_class):
+    clock = _Clock()
+    catalog = DeviceCatalog(ttl_seconds=60, clock=clock)
+
+    assert catalog.get_arn("SV1", aws_session) == SV1_ARN
+    assert catalog.get_arn("Harmony", aws_session) == QPU_ARN
+    assert aws_session.search_devices.call_count == 1
+
+    clock.now = 61
+    catalog.get_summaries(aws_session)
+    assert aws_session.search_devices.call_count == 2
+
+
+@pytest.mark.local
+def test_only_requested_devices_are_created(aws_session, device_class):
+    catalog = DeviceCatalog()
+
+    catalog.get_summaries(aws_session)
+    device_class.assert_not_called()
+
+    assert catalog.get_device(SV1_ARN, aws_session) is device_class.return_value
+    device_class.assert_called_once_with(SV1_ARN, aws_session)
+
+
+@pytest.mark.local
+def test_qpus_of_other_regions_are_listed(aws_session, device_class):
+    device_class.REGIONS = ("us-east-1", "eu-west-2")
+    other_session = SimpleNamespace(
+        search_devices=Mock(
+            return_value=[
+                {"deviceName": "Lucy", "deviceArn": "lucy-arn", "deviceType": "QPU"}
+            ]
+        )
+    )
+
+    with patch(
+        "orquestra.integrations.braket.devices.AwsSession.copy_session",
+        return_value=other_session,
+    ):
+        summaries = DeviceCatalog().get_summaries(aws_session)
+
+    assert [summary.name for summary in summaries] == ["Harmony", "Lucy", "SV1"]
+    assert other_session.search_devices.call_args.kwargs["types"] == ["QPU"]
+
+
+@pytest.mark.local
+def test_entries_are_not_shared_between_sessions(aws_session, device_class):
+    other_session = SimpleNamespace(
+        boto_session=aws_session.boto_session,
+        search_devices=Mock(return_value=STUB_SEARCH_RESULTS[:1]),
+    )
+    device_class.side_effect = lambda arn, session: SimpleNamespace(
+        arn=arn, aws_session=session
+    )
+    catalog = DeviceCatalog()
+
+    assert catalog.get_device(SV1_ARN, aws_session).aws_session is aws_session
+    assert catalog.get_device(SV1_ARN, other_session).aws_session is other_session
+    assert len(catalog.get_summaries(aws_session)) == 2
+    assert len(catalog.get_summaries(other_session)) == 1
+
+
+@pytest.mark.local
+def test_unknown_device_name_raises_error(aws_session, device_class):
+    with pytest.raises(ValueError):
+        DeviceCatalog().get_arn("unknown", aws_session)
+
+
+@pytest.mark.local
+def test_devices_not_in_catalog_are_created_once(aws_session):
+    catalog = DeviceCatalog()
+
+    with patch("orquestra.integrations.braket.devices.AwsDevice") as device_class:
+        first = catalog.get_device(QPU_ARN, aws_session)
+        second = catalog.get_device(QPU_ARN, aws_session)
+
+    assert first is second
+    device_class.assert_called_once_with(QPU_ARN, aws_session)
+
+
+@pytest.mark.local
+def test_catalog_summaries_are_shared_through_cache_file(
+    tmp_path, aws_session, device_class
+):
+    cache_file = tmp_path / "devices.json"
+    DeviceCatalog(cache_file=cache_file).get_summaries(aws_session)
+
+    summaries = DeviceCatalog(cache_file=cache_file).get_summaries(aws_session)
+
+    assert summaries == [
+        DeviceSummary("Harmony", QPU_ARN, "QPU"),
+        DeviceSummary("SV1", SV1_ARN, "SIMULATOR"),
+    ]
+    assert aws_session.search_devices.call_count == 1
+
+
+@pytest.mark.local
+def test_aws_session_is_reused_for_the_same_boto_session():
+    boto_session = Session(region_name="us-east-1")
+
+    assert get_aws_session(boto_session) is get_aws_session(boto_session)
+    assert get_aws_session(boto_session) is not get_aws_session(
+        Session(region_name="us-east-1")
+    )
+
+
+@pytest.mark.local
+def test_only_most_recently_used_aws_sessions_are_kept():
+    boto_sessions = [
+        Session(region_name="us-east-1") for _ in range(devices._MAX_AWS_SESSIONS + 1)
+    ]
+    aws_sessions = [get_aws_session(boto_session) for boto_session in boto_sessions]
+
+    assert len(devices._aws_sessions) == devices._MAX_AWS_SESSIONS
+    assert get_aws_session(boto_sessions[-1]) is aws_sessions[-1]
+    assert get_aws_session(boto_sessions[0]) is not aws_sessions[0]
+
+
+@pytest.mark.local
+def test_summaries_loaded_from_cache_file_are_kept_in_memory(
+    tmp_path, aws_session, device_class
+):
+    cache_file = tmp_path / "devices.json"
+    DeviceCatalog(cache_file=cache_file).get_summaries(aws_session)
+    catalog = DeviceCatalog(cache_file=cache_file)
+
+    with patch.object(
+        DeviceCatalog, "_read_cache_file", wraps=catalog._read_cache_file
+    ) as read_cache_file:
+        first = catalog.get_summaries(aws_session)
+        second = catalog.get_summaries(aws_session)
+
+    assert first == second
+    assert read_cache_file.call_count == 1
+    assert aws_session.search_devices.call_count == 1
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from braket.devices import LocalSimulator
+from orquestra.quantum.api.estimation import EstimationTask
+from orquestra.quantum.circuits import CNOT, RX, RY, Circuit, H
+from orquestra.quantum.operators import PauliSum, PauliTerm
+
+from orquestra.integrations.braket.estimation import (
+    allocate_shots_by_coefficients,
+    estimate_expectation_values_by_qwc_grouping,
+    group_qubitwise_commuting_terms,
+)
+from orquestra.integrations.braket.runner import BraketRunner, braket_local_runner
+from orquestra.integrations.braket.simulator import braket_local_simulator
+
+
+@pytest.mark.local
+def test_terms_are_grouped_into_qubitwise_commuting_groups():
+    operator = PauliSum("2.0*Z0*Z1 + 1.0*X0 + 0.5*Z1 + 0.2*X0*X1 + 3.0")
+
+    groups = group_qubitwise_commuting_terms(operator)
+
+    assert [[str(term) for term in group] for group in groups] == [
+        [str(PauliTerm("2.0*Z0*Z1")), str(PauliTerm("0.5*Z1"))],
+        [str(PauliTerm("1.0*X0")), str(PauliTerm("0.2*X0*X1"))],
+    ]
+
+
+@pytest.mark.local
+def test_shots_are_allocated_proportionally_to_coefficients():
+    groups = [[PauliTerm("3.0*Z0")], [PauliTerm("-1.0*X0")], [PauliTerm("0.0*Y0")]]
+
+    assert allocate_shots_by_coefficients(groups, 1000) == [749, 250, 1]
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("n_shots", [5, 7, 100, 1001])
+def test_allocated_shots_add_up_to_budget(n_shots):
+    groups = [
+        [PauliTerm("0.001*Z0")],
+        [PauliTerm("1.0*X0"), PauliTerm("0.3*X1")],
+        [PauliTerm("0.002*Y0")],
+        [PauliTerm("0.7*Z1")],
+        [PauliTerm("0.7*X1")],
+    ]
+
+    allocation = allocate_shots_by_coefficients(groups, n_shots)
+
+    assert sum(allocation) == n_shots
+    assert min(allocation) >= 1
+
+
+@pytest.mark.local
+def test_each_group_gets_a_shot_when_budget_is_smaller_than_number_of_groups():
+    groups = [[PauliTerm("1.0*Z0")], [PauliTerm("1.0*X0")], [PauliTerm("1.0*Y0")]]
+
+    assert allocate_shots_by_coefficients(groups, 2) == [1, 1, 1]
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("allocate_shots", [True, False])
+def test_estimated_expectation_values_match_exact_ones(allocate_shots):
+    circuit = Circuit([H(0), CNOT(0, 1), RY(0.3)(1), RX(0.7)(2)])
+    operators = [
+        PauliSum("0.5*Z0*Z1 + -1.0*X0*X1 + 0.3*Y2 + 2.0"),
+        PauliTerm("Z1*X2"),
+        PauliSum("0.8*Y0*Y1 + 0.4*Z3"),
+    ]
+    n_shots = 100000
+    tasks = [EstimationTask(operator, circuit, n_shots) for operator in operators]
+
+    estimates = estimate_expectation_values_by_qwc_grouping(
+        braket_local_runner(), tasks, allocate_shots=allocate_shots
+    )
+
+    simulator = braket_local_simulator()
+    for operator, estimate in zip(operators, estimates):
+        assert len(estimate.values) == len(operator.terms)
+        assert np.sum(estimate.values) == pytest.approx(
+            simulator.get_exact_expectation_values(circuit, operator), abs=0.05
+        )
+
+
+@pytest.mark.local
+def test_all_groups_of_all_tasks_are_submitted_as_single_batch():
+    runner = BraketRunner(LocalSimulator("braket_sv"))
+    circuit = Circuit([H(0), H(1)])
+    tasks = [
+        EstimationTask(PauliSum("Z0 + X0 + Y1"), circuit, 100),
+        EstimationTask(PauliTerm("X1"), circuit, 100),
+    ]
+
+    estimate_expectation_values_by_qwc_grouping(runner, tasks, allocate_shots=False)
+
+    assert runner.n_circuits_executed == 3
+    assert runner.n_jobs_executed == 1
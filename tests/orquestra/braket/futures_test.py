@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+
+from orquestra.integrations.braket._futures import _TaskPoller
+
+
+class _StubTask:
+    def __init__(self, states, result=None, result_ready=None):
+        self.id = "stub-task"
+        self._states = list(states)
+        self._result = result
+        self._result_ready = result_ready
+        self.cancelled = False
+
+    def state(self):
+        return self._states.pop(0) if len(self._states) > 1 else self._states[0]
+
+    def result(self):
+        if self._result_ready is not None:
+            self._result_ready.wait(5)
+        return self._result
+
+    def cancel(self):
+        self.cancelled = True
+
+
+@pytest.fixture()
+def poller():
+    return _TaskPoller(poll_interval=0.01)
+
+
+@pytest.mark.local
+def test_future_is_resolved_once_task_completes(poller):
+    task = _StubTask(["QUEUED", "RUNNING", "COMPLETED"], result=21)
+
+    future = poller.submit(lambda: task, lambda result: 2 * result)
+
+    assert future.result(timeout=5) == 42
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("state", ["FAILED", "CANCELLED"])
+def test_future_fails_when_task_does_not_complete(poller, state):
+    future = poller.submit(lambda: _StubTask([state]), lambda result: result)
+
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+
+
+@pytest.mark.local
+def test_future_fails_with_timeout_and_cancels_task(poller):
+    task = _StubTask(["RUNNING"])
+
+    future = poller.submit(lambda: task, lambda result: result, timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        future.result(timeout=5)
+    assert task.cancelled
+
+
+@pytest.mark.local
+def test_cancelling_future_cancels_task(poller):
+    task = _StubTask(["RUNNING"])
+
+    future = poller.submit(lambda: task, lambda result: result)
+    time.sleep(0.05)
+
+    assert future.cancel()
+    deadline = time.monotonic() + 5
+    while not task.cancelled and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert task.cancelled
+
+
+@pytest.mark.local
+def test_submission_errors_are_propagated_to_future(poller):
+    def _failing_submit():
+        raise ValueError("invalid circuit")
+
+    future = poller.submit(_failing_submit, lambda result: result)
+
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+
+
+@pytest.mark.local
+def test_tasks_finished_after_deadline_are_not_reported_as_timeouts():
+    poller = _TaskPoller(poll_interval=0.2)
+    task = _StubTask(["RUNNING", "COMPLETED"], result=1)
+
+    future = poller.submit(lambda: task, lambda result: result, timeout=0.1)
+
+    assert future.result(timeout=5) == 1
+    assert not task.cancelled
+
+
+@pytest.mark.local
+def test_timeout_applies_to_tasks_waiting_for_submission():
+    poller = _TaskPoller(poll_interval=0.01, max_submitters=1)
+    submitter_released = threading.Event()
+    submitted = []
+
+    def _blocking_submit():
+        submitter_released.wait(5)
+        return _StubTask(["COMPLETED"])
+
+    poller.submit(_blocking_submit, lambda result: result)
+    future = poller.submit(
+        lambda: submitted.append(True) or _StubTask(["COMPLETED"]),
+        lambda result: result,
+        timeout=0.05,
+    )
+
+    with pytest.raises(TimeoutError):
+        future.result(timeout=1)
+    submitter_released.set()
+    time.sleep(0.05)
+    assert submitted == []
+
+
+@pytest.mark.local
+def test_slow_results_do_not_delay_other_tasks(poller):
+    result_ready = threading.Event()
+    slow_future = poller.submit(
+        lambda: _StubTask(["COMPLETED"], result=1, result_ready=result_ready),
+        lambda result: result,
+    )
+    time.sleep(0.05)
+
+    fast_future = poller.submit(lambda: _StubTask(["COMPLETED"], 2), lambda x: x)
+
+    assert fast_future.result(timeout=1) == 2
+    assert not slow_future.done()
+    result_ready.set()
+    assert slow_future.result(timeout=5) == 1
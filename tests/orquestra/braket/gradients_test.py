@@ -0,0 +1,149 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+import sympy
+from braket.circuits.serialization import IRType
+from braket.device_schema import DeviceActionType
+from orquestra.quantum.circuits import (
+    CNOT,
+    CPHASE,
+    PHASE,
+    RX,
+    RY,
+    RZ,
+    XX,
+    XY,
+    YY,
+    ZZ,
+    Circuit,
+    H,
+)
+from orquestra.quantum.operators import PauliSum
+
+from orquestra.integrations.braket.gradients import (
+    adjoint_gradient,
+    parameter_shift_gradient,
+)
+from orquestra.integrations.braket.runner import BraketRunner, braket_local_runner
+from orquestra.integrations.braket.simulator import braket_local_simulator
+
+ALPHA, BETA = sympy.symbols("alpha beta")
+PARAMS = [0.4, -0.9]
+OPERATOR = PauliSum("0.5*X0*Y1 + 1.5*Z1*Z2 + -0.3*Y2 + 2.0 + 0.7*X2")
+
+
+def _circuit():
+    return Circuit(
+        [
+            H(0),
+            RX(ALPHA)(0),
+            CNOT(0, 1),
+            XY(2 * BETA)(1, 2),
+            RY(ALPHA + BETA)(2),
+            CPHASE(BETA)(0, 2),
+            PHASE(ALPHA * BETA)(1),
+            ZZ(BETA)(0, 1),
+            XX(ALPHA)(1, 2),
+            YY(-ALPHA)(0, 2),
+            RZ(0.3)(1),
+        ]
+    )
+
+
+def _finite_difference_gradient(circuit, operator, params, epsilon=1e-5):
+    simulator = braket_local_simulator(engine="numpy")
+
+    def expectation_value(values):
+        bound_circuit = circuit.bind(dict(zip(circuit.free_symbols, values)))
+        return simulator.get_exact_expectation_values(bound_circuit, operator)
+
+    gradient = []
+    for index in range(len(params)):
+        shift = np.zeros(len(params))
+        shift[index] = epsilon
+        gradient.append(
+            (
+                expectation_value((np.array(params) + shift).tolist())
+                - expectation_value((np.array(params) - shift).tolist())
+            )
+            / (2 * epsilon)
+        )
+    return np.array(gradient)
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+def test_exact_parameter_shift_gradient_matches_finite_differences(engine):
+    simulator = braket_local_simulator(engine=engine)
+
+    gradient = parameter_shift_gradient(simulator, _circuit(), OPERATOR, PARAMS)
+
+    np.testing.assert_allclose(
+        gradient,
+        _finite_difference_gradient(_circuit(), OPERATOR, PARAMS),
+        atol=1e-5,
+    )
+    # 8 gates depend on symbols, and the XY gate is decomposed into 2 of them.
+    assert simulator.n_jobs_executed == 1
+    assert simulator.n_circuits_executed == 2 * 9
+
+
+@pytest.mark.local
+def test_sampled_parameter_shift_gradient_runs_single_batch():
+    circuit = Circuit([RX(ALPHA)(0), CNOT(0, 1), RY(ALPHA + BETA)(1)])
+    operator = PauliSum("Z0 + 0.5*X1 + 0.5*Z0*Z1")
+    runner = Mock(wraps=braket_local_runner())
+
+    gradient = parameter_shift_gradient(
+        runner, circuit, operator, PARAMS, n_samples=20000
+    )
+
+    np.testing.assert_allclose(
+        gradient, _finite_difference_gradient(circuit, operator, PARAMS), atol=0.1
+    )
+    runner.run_batch_and_measure.assert_called_once()
+
+
+@pytest.mark.local
+def test_gradient_of_circuit_without_symbols_is_empty():
+    gradient = parameter_shift_gradient(
+        braket_local_simulator(), Circuit([RX(0.1)(0)]), OPERATOR, []
+    )
+
+    assert gradient.shape == (0,)
+
+
+@pytest.mark.local
+def test_exact_parameter_shift_gradient_requires_wavefunction_simulator():
+    with pytest.raises(ValueError):
+        parameter_shift_gradient(braket_local_runner(), _circuit(), OPERATOR, PARAMS)
+
+
+@pytest.mark.local
+def test_adjoint_gradient_requires_device_support():
+    with pytest.raises(ValueError):
+        adjoint_gradient(braket_local_runner(), _circuit(), OPERATOR, PARAMS)
+
+
+@pytest.mark.local
+def test_adjoint_gradient_is_requested_in_single_task():
+    result_type = Mock()
+    result_type.name = "AdjointGradient"
+    device = Mock()
+    device.properties.action = {
+        DeviceActionType.OPENQASM: Mock(supportedResultTypes=[result_type])
+    }
+    device.run.return_value.result.return_value.values = [
+        {"expectation": 1.0, "gradient": {"beta": 0.25, "alpha": -0.5}}
+    ]
+    runner = BraketRunner(device)
+
+    gradient = adjoint_gradient(runner, _circuit(), OPERATOR, PARAMS)
+
+    np.testing.assert_allclose(gradient, [-0.5, 0.25])
+    (call,) = device.run.call_args_list
+    program = call.args[0].to_ir(IRType.OPENQASM).source
+    assert "#pragma braket result adjoint_gradient expectation(" in program
+    assert call.kwargs == {"shots": 0, "inputs": {"alpha": 0.4, "beta": -0.9}}
+    assert runner.n_jobs_executed == 1
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+import pytest
+
+LOCAL_MODULES = [
+    "orquestra.integrations.braket.runner",
+    "orquestra.integrations.braket.simulator",
+    "orquestra.integrations.braket.local_pool",
+    "orquestra.integrations.braket.gradients",
+    "orquestra.integrations.braket.routing",
+]
+AWS_MODULES = ("boto3", "botocore", "s3transfer", "braket.aws")
+
+
+def _imported_modules(module):
+    """Returns names of all modules imported by a fresh interpreter importing module."""
+    command = [
+        sys.executable,
+        "-c",
+        f"import sys, {module}; print('\\n'.join(sys.modules))",
+    ]
+    output = subprocess.run(command, capture_output=True, text=True, check=True)
+    return output.stdout.splitlines()
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("module", LOCAL_MODULES)
+def test_local_workloads_do_not_import_aws_modules(module):
+    aws_modules = [
+        name
+        for name in _imported_modules(module)
+        if any(
+            name == prefix or name.startswith(prefix + ".") for prefix in AWS_MODULES
+        )
+    ]
+    assert aws_modules == []
@@ -0,0 +1,187 @@
+import json
+import time
+
+import pytest
+from orquestra.quantum.circuits import CNOT, Circuit, H, X
+from orquestra.quantum.measurements import Measurements
+
+from orquestra.integrations.braket.journal import TaskJournal
+from orquestra.integrations.braket.runner import BraketRunner
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return tmp_path / "journal.jsonl"
+
+
+def _runner(device, journal_path, **kwargs):
+    return BraketRunner(
+        device, journal=TaskJournal(journal_path, device.load), **kwargs
+    )
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 10
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def _crash(runner_call):
+    with pytest.raises(ConnectionError, match="crashed"):
+        runner_call()
+
+
+CIRCUITS = [
+    Circuit([X(0), X(1)]),
+    Circuit([H(0), CNOT(0, 1)]),
+    Circuit([X(0), H(1), X(2)]),
+]
+
+
+@pytest.mark.local
+class TestTaskJournal:
+    def test_restarted_runner_reattaches_to_submitted_task(
+        self, stub_device, journal_path
+    ):
+        stub_device.crashing = True
+        _crash(
+            lambda: _runner(stub_device, journal_path).run_and_measure(CIRCUITS[0], 10)
+        )
+        stub_device.crashing = False
+
+        journal = TaskJournal(journal_path, stub_device.load)
+        runner = BraketRunner(stub_device, journal=journal)
+        assert journal.n_pending == 1
+        measurements = runner.run_and_measure(CIRCUITS[0], 10)
+
+        assert measurements.bitstrings == [(1, 1)] * 10
+        assert len(stub_device.tasks) == 1
+        assert journal.n_pending == 0
+        assert TaskJournal(journal_path, stub_device.load).n_pending == 0
+
+    def test_tasks_are_not_reattached_to_different_circuits_or_shots(
+        self, stub_device, journal_path
+    ):
+        stub_device.crashing = True
+        _crash(
+            lambda: _runner(stub_device, journal_path).run_and_measure(CIRCUITS[0], 10)
+        )
+        stub_device.crashing = False
+
+        runner = _runner(stub_device, journal_path)
+        runner.run_and_measure(CIRCUITS[0], 20)
+        runner.run_and_measure(CIRCUITS[1], 10)
+
+        assert len(stub_device.tasks) == 3
+        assert runner.journal.n_pending == 1
+
+    def test_tasks_of_current_process_are_not_reattached(
+        self, stub_device, journal_path
+    ):
+        runner = _runner(stub_device, journal_path)
+
+        runner.run_and_measure(CIRCUITS[0], 10)
+        runner.run_and_measure(CIRCUITS[0], 10)
+
+        assert len(stub_device.tasks) == 2
+        assert TaskJournal(journal_path, stub_device.load).n_pending == 0
+
+    @pytest.mark.parametrize("state", ["FAILED", "CANCELLED"])
+    def test_unusable_tasks_are_resubmitted(self, stub_device, journal_path, state):
+        stub_device.crashing = True
+        _crash(
+            lambda: _runner(stub_device, journal_path).run_and_measure(CIRCUITS[0], 10)
+        )
+        stub_device.crashing = False
+        next(iter(stub_device.tasks.values())).states = [state]
+
+        _runner(stub_device, journal_path).run_and_measure(CIRCUITS[0], 10)
+
+        assert len(stub_device.tasks) == 2
+
+    def test_tasks_which_cant_be_loaded_are_resubmitted(
+        self, stub_device, journal_path
+    ):
+        stub_device.crashing = True
+        _crash(
+            lambda: _runner(stub_device, journal_path).run_and_measure(CIRCUITS[0], 10)
+        )
+        stub_device.crashing = False
+        stub_device.tasks.clear()
+
+        _runner(stub_device, journal_path).run_and_measure(CIRCUITS[0], 10)
+
+        assert len(stub_device.tasks) == 1
+
+    def test_restarted_runner_reattaches_to_tasks_of_batch(
+        self, stub_device, journal_path
+    ):
+        stub_device.crashing = True
+        _crash(
+            lambda: _runner(stub_device, journal_path).run_batch_and_measure(
+                CIRCUITS[:2], 10
+            )
+        )
+        stub_device.crashing = False
+
+        measurements = _runner(stub_device, journal_path).run_batch_and_measure(
+            CIRCUITS, 10
+        )
+
+        assert [len(measurement.bitstrings) for measurement in measurements] == [
+            10,
+            10,
+            10,
+        ]
+        assert measurements[2].bitstrings == [(1, 1, 1)] * 10
+        assert len(stub_device.tasks) == 3
+        assert TaskJournal(journal_path, stub_device.load).n_pending == 0
+
+    def test_restarted_runner_reattaches_to_async_task(self, stub_device, journal_path):
+        # The first runner keeps polling its task, as if its process had died.
+        stub_device.crashing = True
+        _runner(stub_device, journal_path).run_and_measure_async(CIRCUITS[1], 10)
+        _wait_for(lambda: journal_path.read_text())
+        runner = _runner(stub_device, journal_path)
+        stub_device.crashing = False
+
+        measurements = runner.run_and_measure_async(CIRCUITS[1], 10).result(timeout=10)
+
+        assert len(measurements.bitstrings) == 10
+        assert len(stub_device.tasks) == 1
+        assert TaskJournal(journal_path, stub_device.load).n_pending == 0
+
+    def test_journal_records_submissions(self, stub_device, journal_path):
+        stub_device.crashing = True
+        _crash(
+            lambda: _runner(
+                stub_device, journal_path, s3_destination_folder=("bucket", "folder")
+            ).run_and_measure(CIRCUITS[0], 10)
+        )
+
+        (entry,) = [json.loads(line) for line in journal_path.read_text().splitlines()]
+        assert entry["task_id"] in stub_device.tasks
+        assert entry["shots"] == 10
+        assert entry["s3_destination_folder"] == ["bucket", "folder"]
+
+    def test_truncated_entries_are_ignored(self, stub_device, journal_path):
+        stub_device.crashing = True
+        _crash(
+            lambda: _runner(stub_device, journal_path).run_and_measure(CIRCUITS[0], 10)
+        )
+        with open(journal_path, "a") as file:
+            file.write('{"event": "subm')
+
+        assert TaskJournal(journal_path, stub_device.load).n_pending == 1
+
+
+@pytest.mark.local
+def test_runner_with_s3_destination_folder_returns_measurements(stub_device):
+    runner = BraketRunner(stub_device, s3_destination_folder=("bucket", "folder"))
+
+    measurements = runner.run_and_measure(CIRCUITS[0], 10)
+
+    assert isinstance(measurements, Measurements)
+    assert measurements.bitstrings == [(1, 1)] * 10
+    assert stub_device.s3_destination_folders == [("bucket", "folder")]
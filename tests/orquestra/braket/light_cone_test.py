@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from orquestra.quantum.circuits import CNOT, CZ, RX, RY, Circuit, H, I, X
+from orquestra.quantum.operators import PauliSum, PauliTerm
+
+from orquestra.integrations.braket.light_cone import light_cone, light_cone_groups
+from orquestra.integrations.braket.simulator import braket_local_simulator
+
+
+def _brickwork_circuit(n_qubits, depth, seed):
+    rng = np.random.default_rng(seed)
+    circuit = Circuit()
+    for layer in range(depth):
+        for qubit in range(n_qubits):
+            circuit += RY(float(rng.uniform(-np.pi, np.pi)))(qubit)
+            circuit += RX(float(rng.uniform(-np.pi, np.pi)))(qubit)
+        for qubit in range(layer % 2, n_qubits - 1, 2):
+            circuit += CNOT(qubit, qubit + 1)
+    return circuit
+
+
+def _local_operator(n_qubits):
+    terms = [PauliTerm({qubit: "X"}, 0.5) for qubit in range(n_qubits)]
+    terms += [
+        PauliTerm({qubit: "Z", qubit + 1: "Y"}, -0.7) for qubit in range(n_qubits - 1)
+    ]
+    return PauliSum(terms)
+
+
+@pytest.mark.local
+class TestLightCone:
+    def test_keeps_only_operations_which_can_affect_qubits(self):
+        circuit = Circuit([H(0), H(1), CNOT(1, 2), X(3), CNOT(0, 1), X(2)])
+
+        assert light_cone(circuit, [0]).operations == [
+            H(0),
+            H(1),
+            CNOT(1, 2),
+            CNOT(0, 1),
+        ]
+        assert light_cone(circuit, [2]).operations == [H(1), CNOT(1, 2), X(2)]
+        assert light_cone(circuit, [3]).operations == [X(3)]
+
+    def test_adds_identities_on_qubits_without_operations(self):
+        circuit = Circuit([H(0), X(1)])
+
+        assert light_cone(circuit, [0, 5]).operations == [H(0), I(5)]
+
+    def test_groups_terms_sharing_light_cones(self):
+        circuit = Circuit([H(0), CNOT(0, 1), H(2), CNOT(2, 3), X(4)])
+        terms = [
+            PauliTerm("Z0"),
+            PauliTerm("Z2"),
+            PauliTerm("Z0*Z1"),
+            PauliTerm("X3"),
+            PauliTerm("Z1"),
+        ]
+
+        groups = light_cone_groups(circuit, terms)
+
+        assert sorted(indices for _, indices in groups) == [[0, 2, 4], [1, 3]]
+        for cone, indices in groups:
+            cone_qubits = {
+                qubit
+                for operation in cone.operations
+                for qubit in operation.qubit_indices
+            }
+            assert len(cone_qubits) == 2
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+class TestLightConeExpectationValues:
+    @pytest.mark.parametrize("seed", range(3))
+    def test_match_expectation_values_of_whole_circuits(self, engine, seed):
+        circuit = _brickwork_circuit(8, 2, seed)
+        operator = _local_operator(8) + PauliSum("0.3*Z0*Z7 + 1.5")
+        simulator = braket_local_simulator(engine=engine)
+        light_cone_simulator = braket_local_simulator(engine=engine, light_cone=True)
+
+        np.testing.assert_allclose(
+            light_cone_simulator.get_exact_expectation_values(circuit, operator),
+            simulator.get_exact_expectation_values(circuit, operator),
+            atol=1e-6,
+        )
+        assert light_cone_simulator.n_jobs_executed > 1
+
+    def test_measure_terms_on_qubits_without_operations(self, engine):
+        circuit = Circuit([X(0), H(1)])
+        operator = PauliSum("1.0*Z0 + 2.0*Z4 + 0.5*X1")
+        simulator = braket_local_simulator(engine=engine, light_cone=True)
+
+        np.testing.assert_allclose(
+            simulator.get_exact_expectation_values(circuit, operator), 1.5, atol=1e-6
+        )
+
+
+@pytest.mark.local
+def test_light_cones_make_local_expectation_values_of_many_qubits_feasible():
+    # CZ gates don't change expectation values of Z, but they widen the cones.
+    n_qubits = 40
+    angles = np.linspace(-np.pi, np.pi, n_qubits)
+    circuit = Circuit([RY(float(angle))(qubit) for qubit, angle in enumerate(angles)])
+    for layer in range(2):
+        for qubit in range(layer, n_qubits - 1, 2):
+            circuit += CZ(qubit, qubit + 1)
+    operator = PauliSum([PauliTerm({qubit: "Z"}) for qubit in range(n_qubits)])
+    simulator = braket_local_simulator(engine="numpy", light_cone=True)
+
+    np.testing.assert_allclose(
+        simulator.get_exact_expectation_values(circuit, operator),
+        np.sum(np.cos(angles)),
+        atol=1e-10,
+    )
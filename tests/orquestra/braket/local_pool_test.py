@@ -0,0 +1,51 @@
+import pytest
+from braket.circuits import Noise
+from orquestra.quantum.api.circuit_runner_contracts import CIRCUIT_RUNNER_CONTRACTS
+from orquestra.quantum.circuits import Circuit, I, X
+
+from orquestra.integrations.braket.local_pool import braket_local_pool_runner
+
+
+@pytest.fixture(scope="module")
+def runner():
+    with braket_local_pool_runner(n_workers=2, chunksize=2) as runner:
+        yield runner
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("contract", CIRCUIT_RUNNER_CONTRACTS)
+def test_local_pool_runner_fulfills_circuit_runner_contracts(contract, runner):
+    assert contract(runner)
+
+
+@pytest.mark.local
+def test_local_pool_runner_returns_results_in_input_order(runner):
+    circuits = [Circuit([X(0), I(1)]), Circuit([I(0), X(1)]), Circuit([X(0), X(1)])]
+    circuits = circuits * 3
+
+    measurements = runner.run_batch_and_measure(circuits, [10, 20, 30] * 3)
+
+    assert [m.get_counts() for m in measurements] == [
+        {"10": 10},
+        {"01": 20},
+        {"11": 30},
+    ] * 3
+
+
+@pytest.mark.local
+def test_noisy_local_pool_runner_uses_density_matrix_workers():
+    with braket_local_pool_runner(
+        noise_model=Noise.AmplitudeDamping(gamma=1.0), n_workers=1
+    ) as runner:
+        measurements = runner.run_batch_and_measure([Circuit([X(0)])], 10)
+
+    assert runner.backend == "braket_dm"
+    assert measurements[0].get_counts() == {"0": 10}
+
+
+@pytest.mark.local
+def test_sv_local_pool_runner_cannot_be_initialized_with_noise_model():
+    with pytest.raises(ValueError):
+        braket_local_pool_runner(
+            backend="braket_sv", noise_model=Noise.Depolarizing(probability=0.2)
+        )
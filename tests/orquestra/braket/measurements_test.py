@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from orquestra.quantum.measurements import Measurements
+from orquestra.quantum.operators import PauliSum
+
+from orquestra.integrations.braket.measurements import CountsMeasurements
+
+COUNTS = {"00": 3, "01": 1, "11": 4}
+
+
+@pytest.mark.local
+def test_counts_measurements_behave_like_expanded_measurements():
+    compact = CountsMeasurements(COUNTS)
+    expanded = Measurements.from_counts(COUNTS)
+    operator = PauliSum("Z0 + 0.5*Z0*Z1 + -2.0*Z1")
+
+    assert compact.get_counts() == expanded.get_counts()
+    assert len(compact.bitstrings) == len(expanded.bitstrings)
+    assert sorted(compact.bitstrings) == sorted(expanded.bitstrings)
+    assert (
+        compact.get_distribution().distribution_dict
+        == expanded.get_distribution().distribution_dict
+    )
+    np.testing.assert_allclose(
+        compact.get_expectation_values(operator).values,
+        expanded.get_expectation_values(operator).values,
+    )
+
+
+@pytest.mark.local
+def test_counts_measurements_do_not_expand_shots_for_counts():
+    measurements = CountsMeasurements({"0" * 20: 10**9})
+
+    assert measurements.get_counts() == {"0" * 20: 10**9}
+    assert len(measurements.bitstrings) == 10**9
+    assert measurements.get_distribution().distribution_dict == {(0,) * 20: 1.0}
+
+
+@pytest.mark.local
+def test_counts_measurements_round_trip_through_bit_array():
+    measurements = CountsMeasurements(COUNTS)
+
+    array = measurements.get_bitstrings_array()
+
+    assert array.shape == (8, 2)
+    assert CountsMeasurements.from_array(array).get_counts() == COUNTS
+
+
+@pytest.mark.local
+def test_adding_counts_and_assigning_bitstrings_updates_counts():
+    measurements = CountsMeasurements(COUNTS)
+
+    measurements.add_counts({"11": 1, "10": 2})
+    assert measurements.get_counts() == {"00": 3, "01": 1, "11": 5, "10": 2}
+
+    measurements.bitstrings = [(1, 0), (1, 0), (0, 1)]
+    assert measurements.get_counts() == {"10": 2, "01": 1}
@@ -0,0 +1,151 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+from braket.circuits import Noise
+from braket.circuits.serialization import IRType
+from orquestra.quantum.circuits import CNOT, Circuit, H, X
+
+from orquestra.integrations.braket.cache import ResultCache
+from orquestra.integrations.braket.conversions import export_to_braket
+from orquestra.integrations.braket.metrics import (
+    NULL_METRICS,
+    InMemoryMetrics,
+    OpenTelemetryMetrics,
+    TaskRecord,
+)
+from orquestra.integrations.braket.runner import braket_local_runner
+from orquestra.integrations.braket.simulator import braket_local_simulator
+
+
+@pytest.mark.local
+def test_runners_record_nothing_by_default():
+    runner = braket_local_runner()
+
+    assert runner.metrics is NULL_METRICS
+    assert runner.metrics.phase("conversion") is runner.metrics.phase("result")
+
+
+@pytest.mark.local
+def test_run_and_measure_records_phases_and_task():
+    metrics = InMemoryMetrics()
+    runner = braket_local_runner(metrics=metrics)
+
+    runner.run_and_measure(Circuit([H(0), CNOT(0, 1)]), n_samples=10)
+
+    assert set(metrics.phases) == {"conversion", "submission", "result", "measurements"}
+    assert all(stats.count == 1 for stats in metrics.phases.values())
+    (task,) = metrics.tasks
+    assert task.task_id is not None
+    assert (task.shots, task.n_qubits, task.n_gates) == (10, 2, 2)
+    assert task.program_bytes > 0
+    assert metrics.counters["shots"] == 10
+    # Measurements of 10 shots of 2 qubits, as a JSON array of arrays.
+    assert metrics.counters["result_bytes"] == len(json.dumps([[0, 0]] * 10))
+
+
+@pytest.mark.local
+def test_program_bytes_count_bytes_of_encoded_program():
+    metrics = InMemoryMetrics()
+    runner = braket_local_runner(metrics=metrics)
+    circuit = Circuit([H(0), CNOT(0, 1)])
+
+    runner.run_and_measure(circuit, n_samples=10)
+
+    source = export_to_braket(circuit).to_ir(IRType.OPENQASM).source
+    (task,) = metrics.tasks
+    assert task.program_bytes == len(source.encode())
+
+
+@pytest.mark.local
+def test_results_of_async_runs_are_counted():
+    metrics = InMemoryMetrics()
+    runner = braket_local_runner(metrics=metrics)
+
+    runner.run_and_measure_async(Circuit([X(0)]), n_samples=4).result()
+
+    assert metrics.counters["result_bytes"] == len(json.dumps([[1]] * 4))
+
+
+@pytest.mark.local
+def test_noise_application_is_recorded_as_separate_phase():
+    metrics = InMemoryMetrics()
+    runner = braket_local_runner(
+        noise_model=Noise.AmplitudeDamping(gamma=0.1), metrics=metrics
+    )
+
+    runner.run_and_measure(Circuit([X(0)]), n_samples=10)
+
+    assert metrics.phases["noise"].count == 1
+
+
+@pytest.mark.local
+def test_batches_record_each_task():
+    metrics = InMemoryMetrics()
+    runner = braket_local_runner(metrics=metrics)
+
+    runner.run_batch_and_measure([Circuit([X(0)]), Circuit([H(0), X(1)])], [5, 7])
+
+    assert sorted((task.shots, task.n_gates) for task in metrics.tasks) == [
+        (5, 1),
+        (7, 2),
+    ]
+    assert metrics.phases["submission"].count == 2
+
+
+@pytest.mark.local
+def test_cache_hits_and_misses_are_counted(tmp_path):
+    metrics = InMemoryMetrics()
+    runner = braket_local_runner(cache=ResultCache(tmp_path), metrics=metrics)
+
+    for _ in range(3):
+        runner.run_and_measure(Circuit([X(0)]), n_samples=10)
+
+    assert metrics.counters["cache_misses"] == 1
+    assert metrics.counters["cache_hits"] == 2
+
+
+@pytest.mark.local
+def test_numpy_engine_records_simulation_phase():
+    metrics = InMemoryMetrics()
+    simulator = braket_local_simulator(engine="numpy", metrics=metrics)
+
+    simulator.get_wavefunction(Circuit([H(0)]))
+
+    assert set(metrics.phases) == {"simulation"}
+
+
+@pytest.mark.local
+def test_metrics_are_exported_in_prometheus_format():
+    metrics = InMemoryMetrics()
+    metrics.record_duration("result", 0.5)
+    metrics.record_duration("result", 0.25)
+    metrics.record_task(TaskRecord("task", 100, 2, 3, 40))
+
+    exported = metrics.to_prometheus()
+
+    assert 'orquestra_braket_phase_seconds_sum{phase="result"} 0.75' in exported
+    assert 'orquestra_braket_phase_seconds_count{phase="result"} 2' in exported
+    assert "# TYPE orquestra_braket_shots_total counter" in exported
+    assert "orquestra_braket_shots_total 100" in exported
+
+
+@pytest.mark.local
+def test_metrics_are_forwarded_to_opentelemetry_meter():
+    meter = Mock()
+    metrics = OpenTelemetryMetrics(meter)
+    runner = braket_local_runner(metrics=metrics)
+
+    runner.run_and_measure(Circuit([X(0)]), n_samples=10)
+
+    histogram_names = [call.args[0] for call in meter.create_histogram.call_args_list]
+    assert "orquestra.braket.phase.duration" in histogram_names
+    recorded = meter.create_histogram.return_value.record.call_args_list
+    assert {"phase": "result"} in [call.args[-1] for call in recorded]
+    counter_names = [call.args[0] for call in meter.create_counter.call_args_list]
+    assert counter_names == [
+        "orquestra.braket.tasks",
+        "orquestra.braket.shots",
+        "orquestra.braket.program_bytes",
+        "orquestra.braket.result_bytes",
+    ]
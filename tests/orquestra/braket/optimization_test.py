@@ -0,0 +1,239 @@
+import numpy as np
+import pytest
+import sympy
+from braket.devices import LocalSimulator
+from orquestra.quantum.circuits import (
+    CNOT,
+    CPHASE,
+    CZ,
+    PHASE,
+    RX,
+    RY,
+    RZ,
+    SWAP,
+    XX,
+    ZZ,
+    Circuit,
+    H,
+    I,
+    S,
+    T,
+    X,
+    Z,
+)
+from orquestra.quantum.operators import PauliSum
+
+from orquestra.integrations.braket.metrics import InMemoryMetrics
+from orquestra.integrations.braket.optimization import (
+    CircuitOptimizer,
+    cancel_inverse_pairs,
+    fuse_single_qubit_gates,
+    merge_rotations,
+    strip_identities,
+)
+from orquestra.integrations.braket.runner import BraketRunner
+from orquestra.integrations.braket.simulator import braket_local_simulator
+from orquestra.integrations.braket.statevector import simulate_statevector
+
+
+def _redundant_circuit(n_qubits, n_gates, seed):
+    # Few distinct gates on few qubits, so that many of them can be optimized.
+    rng = np.random.default_rng(seed)
+    angles = [np.pi / 4, -np.pi / 4, np.pi / 2]
+    circuit = Circuit()
+    for _ in range(n_gates):
+        qubits = [int(qubit) for qubit in rng.choice(n_qubits, 2, replace=False)]
+        angle = float(rng.choice(angles))
+        kind = rng.integers(4)
+        if kind == 0:
+            circuit += [X, Z, H, S, T, I][rng.integers(6)](qubits[0])
+        elif kind == 1:
+            circuit += [CNOT, CZ, SWAP][rng.integers(3)](*qubits)
+        elif kind == 2:
+            circuit += [RX, RY, RZ, PHASE][rng.integers(4)](angle)(qubits[0])
+        else:
+            circuit += [XX, ZZ, CPHASE][rng.integers(3)](angle)(*qubits)
+    return circuit
+
+
+def _assert_equal_up_to_phase(state, other_state):
+    assert state.shape == other_state.shape
+    np.testing.assert_allclose(abs(np.vdot(state, other_state)), 1.0, atol=1e-10)
+
+
+@pytest.mark.local
+class TestPasses:
+    def test_strip_identities_removes_identities_and_zero_rotations(self):
+        operations = [I(0), RX(0.0)(0), RZ(4 * np.pi)(1), PHASE(2 * np.pi)(0), H(1)]
+
+        assert strip_identities(operations) == [H(1)]
+
+    def test_strip_identities_keeps_rotations_by_two_pi(self):
+        # RX(2 * pi) = -I, which matters when the gate is controlled.
+        operations = [RX(2 * np.pi)(0)]
+
+        assert strip_identities(operations) == operations
+
+    def test_cancel_inverse_pairs_cascades(self):
+        operations = [H(0), CNOT(0, 1), X(1), X(1), CNOT(0, 1), H(0), Z(1)]
+
+        assert cancel_inverse_pairs(operations) == [Z(1)]
+
+    def test_cancel_inverse_pairs_respects_gates_in_between(self):
+        operations = [CNOT(0, 1), X(1), CNOT(0, 1)]
+
+        assert cancel_inverse_pairs(operations) == operations
+
+    def test_cancel_inverse_pairs_respects_qubit_order(self):
+        assert cancel_inverse_pairs([CNOT(0, 1), CNOT(1, 0)]) == [
+            CNOT(0, 1),
+            CNOT(1, 0),
+        ]
+        assert cancel_inverse_pairs([CZ(0, 1), CZ(1, 0)]) == []
+
+    def test_merge_rotations_adds_angles(self):
+        theta = sympy.Symbol("theta")
+        operations = [RX(0.25)(0), RX(0.5)(0), ZZ(theta)(0, 1), ZZ(1.0)(1, 0)]
+
+        assert merge_rotations(operations) == [RX(0.75)(0), ZZ(theta + 1.0)(0, 1)]
+
+    def test_merge_rotations_removes_rotations_adding_up_to_identity(self):
+        operations = [PHASE(np.pi)(0), PHASE(np.pi)(0), H(0)]
+
+        assert merge_rotations(operations) == [H(0)]
+
+    def test_fuse_single_qubit_gates_shortens_runs(self):
+        operations = [H(0), T(0), H(0), S(0), CNOT(0, 1), X(1)]
+
+        fused = fuse_single_qubit_gates(operations)
+
+        assert len(fused) < len(operations)
+        assert fused[-2:] == [CNOT(0, 1), X(1)]
+        _assert_equal_up_to_phase(
+            simulate_statevector(Circuit(fused)),
+            simulate_statevector(Circuit(operations)),
+        )
+
+    def test_fuse_single_qubit_gates_keeps_symbolic_gates(self):
+        theta = sympy.Symbol("theta")
+        operations = [RX(theta)(0), H(0), H(0)]
+
+        assert fuse_single_qubit_gates(operations) == [RX(theta)(0)]
+
+
+@pytest.mark.local
+class TestCircuitOptimizer:
+    @pytest.mark.parametrize("seed", range(10))
+    def test_optimized_circuits_prepare_the_same_states(self, seed):
+        circuit = _redundant_circuit(3, 40, seed)
+
+        optimized = CircuitOptimizer().optimize(circuit)
+
+        assert len(optimized.operations) <= len(circuit.operations)
+        _assert_equal_up_to_phase(
+            simulate_statevector(optimized), simulate_statevector(circuit)
+        )
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_passes_without_fusion_preserve_global_phase(self, seed):
+        circuit = _redundant_circuit(3, 40, seed)
+        optimizer = CircuitOptimizer(
+            passes=[strip_identities, cancel_inverse_pairs, merge_rotations]
+        )
+
+        np.testing.assert_allclose(
+            simulate_statevector(optimizer.optimize(circuit)),
+            simulate_statevector(circuit),
+            atol=1e-10,
+        )
+
+    def test_qubits_losing_all_gates_keep_an_identity(self):
+        circuit = Circuit([H(0), H(0), X(1)])
+
+        optimized = CircuitOptimizer().optimize(circuit)
+
+        assert optimized.operations == [X(1), I(0)]
+        assert optimized.n_qubits == circuit.n_qubits
+
+    def test_reports_gate_and_depth_reduction(self):
+        optimizer = CircuitOptimizer()
+
+        optimizer.optimize(Circuit([H(0), H(0), X(1)]))
+        first_report = optimizer.last_report
+        optimizer.optimize(Circuit([RX(0.1)(0), RX(0.2)(0)]))
+
+        assert first_report.n_gates_before == 3
+        assert first_report.n_gates_after == 2
+        assert first_report.depth_before == 2
+        assert first_report.depth_after == 1
+        assert first_report.depth_reduction == 1
+        assert optimizer.last_report.gate_reduction == 1
+        assert optimizer.total_report.gate_reduction == 2
+        assert optimizer.total_report.n_gates_before == 5
+
+
+@pytest.mark.local
+class TestOptimizingRunners:
+    def test_runner_samples_optimized_circuits(self):
+        metrics = InMemoryMetrics()
+        runner = BraketRunner(
+            LocalSimulator(), optimizer=CircuitOptimizer(), metrics=metrics
+        )
+        circuit = Circuit([X(0), H(1), H(1), CNOT(0, 2), T(2), T(2), S(2), S(2)])
+
+        measurements = runner.run_and_measure(circuit, 10)
+
+        assert measurements.bitstrings == [(1, 0, 1)] * 10
+        assert runner.optimizer.last_report.gate_reduction > 0
+        assert metrics.counters["gates_removed"] > 0
+        assert metrics.phases["optimization"].count == 1
+
+    @pytest.mark.parametrize("engine", ["device", "numpy"])
+    def test_simulator_computes_expectation_values_of_optimized_circuits(self, engine):
+        circuit = _redundant_circuit(3, 30, 0)
+        operator = PauliSum("0.5*Z0*Z1 + 1.5*X2 + -0.3*Y1")
+        simulator = braket_local_simulator(engine=engine)
+        optimizing_simulator = braket_local_simulator(
+            engine=engine, optimizer=CircuitOptimizer()
+        )
+
+        np.testing.assert_allclose(
+            optimizing_simulator.get_exact_expectation_values(circuit, operator),
+            simulator.get_exact_expectation_values(circuit, operator),
+            atol=1e-10,
+        )
+        assert optimizing_simulator.optimizer.total_report.gate_reduction > 0
+
+    @pytest.mark.parametrize(
+        "circuit",
+        [
+            Circuit([RX(sympy.Symbol("beta"))(0), RX(2 * sympy.Symbol("alpha"))(0)]),
+            Circuit(
+                [
+                    RX(sympy.Symbol("alpha"))(0),
+                    RX(-sympy.Symbol("alpha"))(0),
+                    RY(sympy.Symbol("beta"))(1),
+                ]
+            ),
+        ],
+    )
+    def test_params_are_bound_to_symbols_of_original_circuit(self, circuit):
+        params = [0.3, 1.2]
+        optimizer = CircuitOptimizer()
+        simulator = braket_local_simulator()
+        optimizing_simulator = braket_local_simulator(optimizer=optimizer)
+        runner = BraketRunner(LocalSimulator(), optimizer=optimizer)
+
+        for _ in range(2):
+            wavefunction = optimizing_simulator.get_wavefunction_with_params(
+                circuit, params
+            )
+            runner.run_and_measure_with_params(circuit, params, 10)
+
+        np.testing.assert_allclose(
+            wavefunction.amplitudes,
+            simulator.get_wavefunction_with_params(circuit, params).amplitudes,
+            atol=1e-10,
+        )
+        # Both runners optimized the circuit once.
+        assert optimizer.total_report.n_gates_before == 2 * len(circuit.operations)
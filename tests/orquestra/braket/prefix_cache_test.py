@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+from orquestra.quantum.circuits import CNOT, RX, RY, Circuit, H, X
+
+from orquestra.integrations.braket.prefix_cache import PrefixStateCache
+from orquestra.integrations.braket.simulator import braket_local_simulator
+from orquestra.integrations.braket.statevector import simulate_statevector
+
+
+def _preparation(n_qubits):
+    circuit = Circuit([H(qubit) for qubit in range(n_qubits)])
+    for qubit in range(n_qubits - 1):
+        circuit += CNOT(qubit, qubit + 1)
+        circuit += RY(0.1 * qubit)(qubit + 1)
+    return circuit
+
+
+def _ansatz(n_qubits, angle):
+    return Circuit([RX(angle * (qubit + 1))(qubit) for qubit in range(n_qubits)])
+
+
+@pytest.mark.local
+class TestPrefixStateCache:
+    def test_circuits_sharing_preparation_reuse_its_state(self):
+        cache = PrefixStateCache(checkpoint_interval=None)
+        preparation = _preparation(5)
+
+        for angle in np.linspace(0, 1, 5):
+            circuit = preparation + _ansatz(5, float(angle))
+            np.testing.assert_allclose(
+                cache.simulate(circuit), simulate_statevector(circuit), atol=1e-12
+            )
+
+        # The preparation is stored after the second circuit.
+        assert (cache.hits, cache.misses) == (3, 2)
+        assert cache.hit_rate == 0.6
+        assert len(cache) == 1
+
+    def test_checkpoints_are_reused_from_the_second_circuit(self):
+        cache = PrefixStateCache(checkpoint_interval=4)
+        preparation = _preparation(4)  # 10 operations
+
+        for angle in np.linspace(0, 1, 3):
+            circuit = preparation + _ansatz(4, float(angle))
+            np.testing.assert_allclose(
+                cache.simulate(circuit), simulate_statevector(circuit), atol=1e-12
+            )
+
+        assert (cache.hits, cache.misses) == (2, 1)
+        # Checkpoints after 4, 8 and 12 operations of each circuit, the latter
+        # differing between circuits, and the shared preparation.
+        assert len(cache) == 2 + 3 + 1
+
+    def test_checkpoint_interval_has_to_be_positive(self):
+        with pytest.raises(ValueError):
+            PrefixStateCache(checkpoint_interval=0)
+
+    def test_stored_states_are_not_modified(self):
+        cache = PrefixStateCache()
+        circuit = _preparation(3)
+
+        states = [cache.simulate(circuit) for _ in range(3)]
+        states[1][:] = 0
+
+        np.testing.assert_allclose(
+            cache.simulate(circuit), simulate_statevector(circuit), atol=1e-12
+        )
+        np.testing.assert_allclose(states[2], states[0])
+
+    def test_states_are_not_shared_between_initial_states_or_dtypes(self):
+        cache = PrefixStateCache()
+        circuit = Circuit([H(0), CNOT(0, 1)])
+        initial_state = np.array([0, 0, 1, 0])
+
+        for _ in range(3):
+            cache.simulate(circuit)
+        from_initial_state = cache.simulate(circuit, initial_state=initial_state)
+        single_precision = cache.simulate(circuit, np.complex64)
+
+        assert cache.hits == 1
+        np.testing.assert_allclose(
+            from_initial_state,
+            simulate_statevector(circuit, initial_state=initial_state),
+        )
+        assert single_precision.dtype == np.complex64
+
+    def test_only_keys_of_the_previous_circuit_are_kept(self):
+        cache = PrefixStateCache(checkpoint_interval=None)
+        circuit = Circuit([H(0), CNOT(0, 1)])
+
+        for index in range(4):
+            initial_state = np.zeros(4)
+            initial_state[index] = 1
+            cache.simulate(circuit, initial_state=initial_state)
+
+        assert len(cache._last_keys) == len(circuit.operations)
+        assert len(cache) == 0
+
+    def test_least_recently_used_states_are_evicted(self):
+        state_size = 2**4 * np.dtype(np.complex128).itemsize
+        cache = PrefixStateCache(max_bytes=2 * state_size)
+        preparations = [Circuit([X(qubit)]) + _preparation(4) for qubit in range(3)]
+
+        for preparation in preparations:
+            for angle in (0.1, 0.2):
+                cache.simulate(preparation + _ansatz(4, angle))
+        cache.simulate(preparations[0] + _ansatz(4, 0.3))
+
+        assert len(cache) == 2
+        assert cache.n_bytes == 2 * state_size
+        assert cache.hits == 0
+        cache.simulate(preparations[2] + _ansatz(4, 0.3))
+        assert cache.hits == 1
+
+    def test_states_larger_than_limit_are_not_stored(self):
+        cache = PrefixStateCache(max_bytes=16)
+        circuit = _preparation(2)
+
+        cache.simulate(circuit)
+        cache.simulate(circuit)
+
+        assert len(cache) == 0
+        assert cache.hit_rate == 0
+
+
+@pytest.mark.local
+def test_simulator_with_prefix_cache_matches_simulator_without_it():
+    preparation = _preparation(4)
+    circuits = [preparation + _ansatz(4, angle) for angle in (0.2, 0.4, 0.6)]
+    simulator = braket_local_simulator(engine="numpy")
+    cached_simulator = braket_local_simulator(
+        engine="numpy", prefix_cache=PrefixStateCache()
+    )
+
+    for circuit in circuits:
+        np.testing.assert_allclose(
+            cached_simulator.get_wavefunction(circuit).amplitudes,
+            simulator.get_wavefunction(circuit).amplitudes,
+            atol=1e-12,
+        )
+
+    assert cached_simulator.prefix_cache.hit_rate == pytest.approx(1 / 3)
+    assert cached_simulator.n_circuits_executed == 3
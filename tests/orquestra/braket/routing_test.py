@@ -0,0 +1,153 @@
+import pytest
+from braket.circuits import Noise
+from orquestra.quantum.circuits import CNOT, Circuit, H, X
+
+from orquestra.integrations.braket.routing import DeviceRoute, RoutingRunner
+from orquestra.integrations.braket.runner import BraketRunner, braket_local_runner
+
+
+def _flip_circuit(n_qubits):
+    return Circuit([X(qubit) for qubit in range(n_qubits)])
+
+
+@pytest.mark.local
+class TestRoutingRunner:
+    def test_measurements_are_merged_in_order_of_batch(self, make_stub_device):
+        runner = RoutingRunner(
+            [braket_local_runner(), BraketRunner(make_stub_device("SV1", 34))]
+        )
+        batch = [_flip_circuit(n_qubits) for n_qubits in range(1, 7)]
+
+        measurements = runner.run_batch_and_measure(batch, [10, 20, 30, 40, 50, 60])
+
+        for n_qubits, (measurement, n_samples) in enumerate(
+            zip(measurements, [10, 20, 30, 40, 50, 60]), start=1
+        ):
+            assert measurement.get_counts() == {"1" * n_qubits: n_samples}
+        assert [route.n_circuits_routed for route in runner.routes] == [3, 3]
+        assert runner.n_jobs_executed == 2
+        assert runner.n_circuits_executed == 6
+
+    def test_circuits_exceeding_qubit_limit_go_to_larger_devices(
+        self, make_stub_device
+    ):
+        remote = make_stub_device("SV1", 34)
+        runner = RoutingRunner([braket_local_runner(), BraketRunner(remote)])
+        large_circuit = _flip_circuit(30)
+
+        routes = runner.route([large_circuit] * 3 + [_flip_circuit(2)])
+        measurements = runner.run_batch_and_measure([large_circuit], 5)
+
+        assert [route.name for route in routes] == [
+            "SV1",
+            "SV1",
+            "SV1",
+            "StateVectorSimulator",
+        ]
+        assert measurements[0].get_counts() == {"1" * 30: 5}
+        assert remote.n_circuits_run == 1
+
+    def test_noisy_circuits_go_to_runners_with_noise_model(self, make_stub_device):
+        noisy_runner = braket_local_runner(noise_model=Noise.BitFlip(0.0))
+        runner = RoutingRunner(
+            [
+                braket_local_runner(),
+                BraketRunner(make_stub_device("SV1", 34)),
+                noisy_runner,
+            ],
+            noisy=True,
+        )
+
+        routes = runner.route([_flip_circuit(2)] * 4)
+        measurements = runner.run_batch_and_measure([Circuit([H(0), CNOT(0, 1)])], 100)
+
+        assert all(route.runner is noisy_runner for route in routes)
+        assert set(measurements[0].get_counts()) <= {"00", "11"}
+
+    def test_noisy_and_noiseless_runners_share_routes(self):
+        noisy_runner = braket_local_runner(noise_model=Noise.BitFlip(0.0))
+        runner = RoutingRunner([braket_local_runner(), noisy_runner])
+        noisy_routing_runner = RoutingRunner(runner.routes, noisy=True)
+
+        noiseless_measurements = runner.run_batch_and_measure([_flip_circuit(1)], 5)
+        noisy_measurements = noisy_routing_runner.run_batch_and_measure(
+            [_flip_circuit(1)], 5
+        )
+
+        assert noiseless_measurements[0].get_counts() == {"1": 5}
+        assert noisy_measurements[0].get_counts() == {"1": 5}
+        assert [route.n_circuits_routed for route in runner.routes] == [1, 1]
+
+    def test_queued_devices_get_fewer_circuits(self, make_stub_device):
+        runner = RoutingRunner(
+            [
+                BraketRunner(make_stub_device("SV1", 34, queue_size=">4000")),
+                braket_local_runner(),
+            ]
+        )
+
+        routes = runner.route([_flip_circuit(2)] * 10)
+
+        assert all(route.name == "StateVectorSimulator" for route in routes)
+
+    def test_queue_depth_is_read_once_per_ttl(self, make_stub_device):
+        device = make_stub_device("SV1", 34, queue_size="12")
+        now = [0.0]
+        route = DeviceRoute(
+            BraketRunner(device), queue_depth_ttl_seconds=10, clock=lambda: now[0]
+        )
+        runner = RoutingRunner([route, braket_local_runner()])
+
+        runner.route([_flip_circuit(2)] * 3)
+        runner.route([_flip_circuit(2)] * 3)
+        assert route.queue_depth() == 12
+        assert device.n_queue_depth_calls == 1
+
+        now[0] = 10
+        device.queue_size = "3"
+        assert route.queue_depth() == 3
+        assert device.n_queue_depth_calls == 2
+
+    def test_observed_latency_shifts_circuits_to_faster_devices(self, make_stub_device):
+        slow_device = make_stub_device("SV1", 34, delay=0.25)
+        fast_device = make_stub_device("TN1", 50)
+        runner = RoutingRunner(
+            [
+                DeviceRoute(BraketRunner(slow_device), seconds_per_circuit=0.01),
+                DeviceRoute(BraketRunner(fast_device), seconds_per_circuit=0.01),
+            ]
+        )
+        batch = [_flip_circuit(2)] * 10
+
+        runner.run_batch_and_measure(batch, 10)
+        routes = runner.route(batch)
+
+        assert slow_device.n_circuits_run == fast_device.n_circuits_run == 5
+        assert [route.name for route in routes].count("TN1") >= 7
+
+    def test_single_circuits_are_routed(self, make_stub_device):
+        remote = make_stub_device("SV1", 34)
+        runner = RoutingRunner([BraketRunner(remote)])
+
+        measurements = runner.run_and_measure(_flip_circuit(3), 7)
+
+        assert measurements.get_counts() == {"111": 7}
+        assert remote.n_circuits_run == 1
+        assert runner.n_jobs_executed == runner.n_circuits_executed == 1
+
+    def test_async_circuits_are_routed(self):
+        runner = RoutingRunner([braket_local_runner()])
+
+        measurements = runner.run_and_measure_async(_flip_circuit(2), 7).result()
+
+        assert measurements.get_counts() == {"11": 7}
+
+    def test_raises_when_no_device_can_run_circuit(self, make_stub_device):
+        runner = RoutingRunner(
+            [braket_local_runner(), BraketRunner(make_stub_device("SV1", 34))]
+        )
+
+        with pytest.raises(ValueError, match="40 qubits"):
+            runner.run_batch_and_measure([_flip_circuit(2), _flip_circuit(40)], 10)
+        with pytest.raises(ValueError, match="with noise"):
+            RoutingRunner(runner.routes, noisy=True).route([_flip_circuit(2)])
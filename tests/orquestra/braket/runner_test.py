@@ -1,10 +1,14 @@
 import os
+from unittest.mock import Mock
 
+import numpy as np
 import pytest
+import sympy
 from boto3 import Session  # type: ignore
 from braket.circuits import Noise
 from braket.devices import LocalSimulator
 from orquestra.quantum.api.circuit_runner_contracts import CIRCUIT_RUNNER_CONTRACTS
+from orquestra.quantum.circuits import RX, Circuit, I, X
 
 from orquestra.integrations.braket.runner import (
     BraketRunner,
@@ -80,3 +84,191 @@ def test_braket_local_runner_chooses_correct_backend_based_on_input(
 ):
     assert isinstance(runner.device, LocalSimulator)
     assert runner.device.name == expected_simulator_name
+
+
+@pytest.mark.local
+def test_run_batch_and_measure_returns_results_in_input_order():
+    runner = braket_local_runner(max_parallel=2)
+    circuits = [Circuit([X(0)]), Circuit([I(0)]), Circuit([X(0), X(1)])]
+    n_samples = [10, 20, 10]
+
+    measurements = runner.run_batch_and_measure(circuits, n_samples)
+
+    assert [m.get_counts() for m in measurements] == [
+        {"1": 10},
+        {"0": 20},
+        {"11": 10},
+    ]
+
+
+@pytest.mark.local
+def test_run_batch_and_measure_submits_one_batch_per_distinct_n_samples():
+    device = Mock(wraps=LocalSimulator("braket_sv"))
+    runner = BraketRunner(device, max_parallel=3)
+    circuits = [Circuit([X(0)]) for _ in range(4)]
+
+    runner.run_batch_and_measure(circuits, [10, 20, 10, 10])
+
+    calls = device.run_batch.call_args_list
+    assert sorted((len(call.args[0]), call.kwargs["shots"]) for call in calls) == [
+        (1, 20),
+        (3, 10),
+    ]
+    assert all(call.kwargs["max_parallel"] == 3 for call in calls)
+    # A call running circuits as several device batches is still a single job.
+    assert runner.n_jobs_executed == 1
+    assert runner.n_circuits_executed == 4
+
+
+@pytest.mark.local
+def test_run_and_measure_async_resolves_to_measurements():
+    runner = braket_local_runner()
+
+    futures = [
+        runner.run_and_measure_async(Circuit([X(0)]), n_samples=10),
+        runner.run_and_measure_async(Circuit([I(0), X(1)]), n_samples=5),
+    ]
+
+    assert [future.result(timeout=10).get_counts() for future in futures] == [
+        {"1": 10},
+        {"01": 5},
+    ]
+    assert runner.n_jobs_executed == 2
+
+
+@pytest.mark.local
+def test_run_and_measure_async_raises_for_nonpositive_n_samples():
+    with pytest.raises(ValueError):
+        braket_local_runner().run_and_measure_async(Circuit([X(0)]), n_samples=0)
+
+
+@pytest.mark.local
+def test_run_and_measure_with_params_binds_symbols():
+    theta = sympy.Symbol("theta")
+    circuit = Circuit([RX(theta)(0), X(1)])
+    runner = braket_local_runner()
+
+    measurements = runner.run_and_measure_with_params(circuit, [np.pi], n_samples=10)
+
+    assert measurements.get_counts() == {"11": 10}
+    assert runner.n_jobs_executed == 1
+
+
+@pytest.mark.local
+def test_run_and_measure_splits_samples_into_near_equal_shards_merged_into_one_result():
+    device = Mock(wraps=LocalSimulator("braket_sv"))
+    runner = BraketRunner(device, max_shots_per_task=4)
+
+    measurements = runner.run_and_measure(Circuit([X(0), X(1)]), n_samples=10)
+
+    assert measurements.get_counts() == {"11": 10}
+    shards = sorted(
+        (len(call.args[0]), call.kwargs["shots"])
+        for call in device.run_batch.call_args_list
+    )
+    assert shards == [(1, 4), (2, 3)]
+    device.run.assert_not_called()
+    assert runner.n_jobs_executed == runner.n_circuits_executed == 1
+
+
+@pytest.mark.local
+def test_run_batch_and_measure_shards_only_circuits_exceeding_max_shots():
+    device = Mock(wraps=LocalSimulator("braket_sv"))
+    runner = BraketRunner(device, max_shots_per_task=5)
+
+    measurements = runner.run_batch_and_measure(
+        [Circuit([X(0)]), Circuit([I(0)])], [12, 3]
+    )
+
+    assert [m.get_counts() for m in measurements] == [{"1": 12}, {"0": 3}]
+    shards = sorted(
+        (len(call.args[0]), call.kwargs["shots"])
+        for call in device.run_batch.call_args_list
+    )
+    assert shards == [(1, 3), (3, 4)]
+
+
+@pytest.mark.local
+def test_seeded_local_runner_gives_reproducible_sharded_results():
+    circuit = Circuit([RX(np.pi / 3)(0), RX(np.pi / 2)(1)])
+
+    def sample(max_shots_per_task):
+        runner = braket_local_runner(seed=1234)
+        runner.max_shots_per_task = max_shots_per_task
+        return runner.run_and_measure(circuit, n_samples=1000).get_counts()
+
+    counts = sample(300)
+
+    assert counts == sample(300)
+    assert sum(counts.values()) == 1000
+    other_runner = braket_local_runner(seed=4321)
+    other_counts = other_runner.run_and_measure(circuit, n_samples=1000).get_counts()
+    assert counts != other_counts
+
+
+@pytest.mark.local
+def test_seeded_local_runner_draws_new_samples_for_each_call_and_circuit():
+    circuit = Circuit([RX(np.pi / 3)(0), RX(np.pi / 2)(1)])
+
+    def sample_twice():
+        runner = braket_local_runner(seed=1234)
+        batch = runner.run_batch_and_measure([circuit, circuit], 1000)
+        return [measurements.get_counts() for measurements in batch] + [
+            runner.run_and_measure(circuit, n_samples=1000).get_counts()
+        ]
+
+    counts = sample_twice()
+
+    assert counts == sample_twice()
+    assert counts[0] != counts[1]
+    assert counts[2] not in counts[:2]
+
+
+@pytest.mark.local
+def test_seeded_local_runner_computes_distributions_in_one_batch():
+    device = Mock(spec=LocalSimulator, wraps=LocalSimulator("braket_sv"))
+    runner = BraketRunner(device, seed=1234)
+
+    runner.run_batch_and_measure([Circuit([RX(np.pi / 3)(0)]), Circuit([X(0)])], 10)
+
+    device.run.assert_not_called()
+    device.run_batch.assert_called_once()
+    assert len(device.run_batch.call_args.args[0]) == 2
+
+
+@pytest.mark.local
+def test_seeded_runs_with_params_and_async_runs_are_reproducible():
+    theta = sympy.Symbol("theta")
+    circuit = Circuit([RX(theta)(0), RX(np.pi / 2)(1)])
+
+    def sample():
+        runner = braket_local_runner(seed=1234)
+        return [
+            runner.run_and_measure_with_params(circuit, [np.pi / 3], 1000).get_counts(),
+            runner.run_and_measure_async(circuit.bind({theta: 1.0}), 1000)
+            .result(timeout=5)
+            .get_counts(),
+        ]
+
+    assert sample() == sample()
+
+
+@pytest.mark.local
+def test_async_runs_and_runs_with_params_are_sharded():
+    theta = sympy.Symbol("theta")
+    device = Mock(wraps=LocalSimulator("braket_sv"))
+    runner = BraketRunner(device, max_shots_per_task=4)
+
+    async_measurements = runner.run_and_measure_async(Circuit([X(0)]), 10)
+    assert async_measurements.result(timeout=5).get_counts() == {"1": 10}
+    assert sorted(call.kwargs["shots"] for call in device.run.call_args_list) == [
+        3,
+        3,
+        4,
+    ]
+
+    measurements = runner.run_and_measure_with_params(
+        Circuit([RX(theta)(0)]), [np.pi], 10
+    )
+    assert measurements.get_counts() == {"1": 10}
+    assert runner.n_jobs_executed == runner.n_circuits_executed == 2
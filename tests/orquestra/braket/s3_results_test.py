@@ -0,0 +1,216 @@
+import io
+import json
+
+import boto3  # type: ignore
+import numpy as np
+import pytest
+from botocore.response import StreamingBody  # type: ignore
+from braket.ir.openqasm import Program
+from braket.task_result import AdditionalMetadata, GateModelTaskResult, TaskMetadata
+from orquestra.quantum.circuits import Circuit, H, X
+
+from orquestra.integrations.braket.runner import BraketRunner
+from orquestra.integrations.braket.s3_results import (
+    S3ResultCollector,
+    parse_result_stream,
+)
+
+BUCKET = "results-bucket"
+
+
+def _result_document(task_id, measurements=None, probabilities=None, shots=None):
+    if measurements is not None:
+        measurements = np.asarray(measurements)
+        measured_qubits = list(range(measurements.shape[1]))
+        shots = len(measurements)
+    else:
+        measured_qubits = [0, 1]
+    return GateModelTaskResult(
+        measurements=None if measurements is None else measurements.tolist(),
+        measurementProbabilities=probabilities,
+        measuredQubits=measured_qubits,
+        taskMetadata=TaskMetadata(id=task_id, shots=shots, deviceId="stub"),
+        additionalMetadata=AdditionalMetadata(
+            # Programs mentioning measurements mustn't confuse the parser.
+            action=Program(source='bit[2] b; b = measure q; // "measurements": ['),
+        ),
+    ).json()
+
+
+def _chunks(data: bytes, size: int):
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+class _StubS3Client:
+    """Local stand-in for an S3 client, holding objects in memory."""
+
+    def __init__(self):
+        self.objects = {}
+        self.n_downloads = 0
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[Bucket, Key] = Body.encode() if isinstance(Body, str) else Body
+
+    def get_object(self, Bucket, Key):
+        self.n_downloads += 1
+        data = self.objects[Bucket, Key]
+        return {"Body": StreamingBody(io.BytesIO(data), len(data))}
+
+    def get_paginator(self, operation_name):
+        assert operation_name == "list_objects_v2"
+        client = self
+
+        class _Paginator:
+            def paginate(self, Bucket, Prefix):
+                keys = sorted(
+                    key
+                    for bucket, key in client.objects
+                    if bucket == Bucket and key.startswith(Prefix)
+                )
+                # Two pages, like S3 splits long listings.
+                middle = len(keys) // 2
+                return [
+                    {"Contents": [{"Key": key} for key in keys[:middle]]},
+                    {"Contents": [{"Key": key} for key in keys[middle:]]},
+                ]
+
+        return _Paginator()
+
+
+@pytest.fixture
+def s3_client():
+    return _StubS3Client()
+
+
+@pytest.fixture
+def device(make_stub_device, s3_client):
+    return make_stub_device(s3_client=s3_client)
+
+
+def _program(n_bits):
+    measurements = " ".join(f"b[{bit}] = measure q[{bit}];" for bit in range(n_bits))
+    return Program(source=f"bit[{n_bits}] b; qubit[{n_bits}] q; {measurements}")
+
+
+@pytest.mark.local
+class TestParseResultStream:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 2**20])
+    def test_parses_measurements_in_any_chunks(self, chunk_size):
+        rng = np.random.default_rng(0)
+        measurements = rng.integers(2, size=(500, 5))
+        document = _result_document("task-0", measurements).encode()
+
+        result = parse_result_stream(_chunks(document, chunk_size))
+
+        np.testing.assert_array_equal(result.measurements, measurements)
+        assert result.measurements.dtype == np.uint8
+        assert result.measured_qubits == [0, 1, 2, 3, 4]
+        assert result.task_id == "task-0"
+        assert result.shots == 500
+        assert result.n_bytes == len(document)
+
+    def test_counts_match_measurements(self):
+        document = _result_document("task-0", [[0, 1], [1, 1], [0, 1]]).encode()
+
+        result = parse_result_stream([document])
+
+        assert result.measurement_counts == {"01": 2, "11": 1}
+
+    def test_parses_probabilities(self):
+        document = _result_document(
+            "task-0", probabilities={"00": 0.25, "11": 0.75}, shots=100
+        ).encode()
+
+        result = parse_result_stream(_chunks(document, 5))
+
+        assert result.measurements is None
+        assert result.measurement_counts == {"00": 25, "11": 75}
+
+    def test_parses_empty_measurements(self):
+        document = json.dumps(
+            {"measurements": [], "measuredQubits": [0], "taskMetadata": {"id": "t"}}
+        ).encode()
+
+        result = parse_result_stream([document])
+
+        assert result.measurements.shape == (0, 1)
+        assert result.measurement_counts == {}
+
+
+@pytest.mark.local
+class TestS3ResultCollector:
+    def test_iter_folder_yields_results_of_all_tasks(self, s3_client):
+        for index in range(10):
+            s3_client.put_object(
+                BUCKET,
+                f"folder/task-{index}/results.json",
+                _result_document(f"task-{index}", [[index % 2, 1]] * (index + 1)),
+            )
+        s3_client.put_object(BUCKET, "folder/task-0/other.json", "{}")
+        collector = S3ResultCollector(s3_client, max_workers=4, chunk_size=16)
+
+        results = list(collector.iter_folder(BUCKET, "folder/"))
+
+        assert sorted(result.task_id for result in results) == sorted(
+            f"task-{index}" for index in range(10)
+        )
+        assert s3_client.n_downloads == 10
+        for result in results:
+            index = int(result.task_id.split("-")[1])
+            assert result.measurement_counts == {f"{index % 2}1": index + 1}
+
+    def test_task_results_are_in_order_of_tasks(self, s3_client, device):
+        tasks = []
+        for index, n_polls in enumerate([3, 1, 2]):
+            task = device.run(
+                _program(2), shots=index + 1, s3_destination_folder=(BUCKET, "folder")
+            )
+            task.states = ["RUNNING"] * n_polls + ["COMPLETED"]
+            tasks.append(task)
+        collector = S3ResultCollector(s3_client, poll_interval=0.05)
+
+        completion_order = [index for index, _ in collector.iter_task_results(tasks)]
+        results = S3ResultCollector(s3_client).task_results(tasks)
+
+        assert completion_order == [1, 2, 0]
+        assert [result.task_id for result in results] == [task.id for task in tasks]
+        assert [result.shots for result in results] == [1, 2, 3]
+
+    def test_failed_tasks_raise(self, s3_client, device):
+        task = device.run(_program(1), shots=1, s3_destination_folder=(BUCKET, "f"))
+        task.states = ["FAILED"]
+
+        with pytest.raises(RuntimeError, match="FAILED"):
+            S3ResultCollector(s3_client).task_results([task])
+
+    def test_runner_collects_batch_results(self, s3_client, device):
+        runner = BraketRunner(
+            device,
+            s3_destination_folder=(BUCKET, "folder"),
+            result_collector=S3ResultCollector(s3_client),
+        )
+
+        measurements = runner.run_batch_and_measure(
+            [Circuit([X(0)]), Circuit([X(0), H(1), X(2)])], 7
+        )
+
+        assert measurements[0].get_counts() == {"1": 7}
+        assert measurements[1].get_counts() == {"111": 7}
+        assert s3_client.n_downloads == 2
+
+
+@pytest.mark.local
+def test_collector_reads_results_from_moto():
+    moto = pytest.importorskip("moto")
+    with moto.mock_s3():
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket=BUCKET)
+        s3_client.put_object(
+            Bucket=BUCKET,
+            Key="folder/task-0/results.json",
+            Body=_result_document("task-0", [[0, 1]] * 3),
+        )
+
+        (result,) = S3ResultCollector(s3_client).iter_folder(BUCKET, "folder")
+
+    assert result.measurement_counts == {"01": 3}
@@ -1,10 +1,16 @@
+from unittest.mock import patch
+
+import numpy as np
 import pytest
+import sympy
 from orquestra.quantum.api.circuit_runner_contracts import CIRCUIT_RUNNER_CONTRACTS
 from orquestra.quantum.api.wavefunction_simulator_contracts import (
     simulator_contracts_for_tolerance,
     simulator_contracts_with_nontrivial_initial_state,
     simulator_gate_compatibility_contracts,
 )
+from orquestra.quantum.circuits import CNOT, RX, Circuit, H, I, Z
+from orquestra.quantum.operators import PauliSum, PauliTerm, get_expectation_value
 
 from orquestra.integrations.braket.simulator import braket_local_simulator
 
@@ -13,16 +19,34 @@ from orquestra.integrations.braket.simulator import braket_local_simulator
 @pytest.mark.parametrize(
     "contract", simulator_contracts_with_nontrivial_initial_state()
 )
-def test_braket_local_wf_simulator_raises_error(contract):
-    simulator = braket_local_simulator()
-    with pytest.raises(ValueError):
-        contract(simulator)
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+def test_braket_local_wf_simulator_supports_initial_states(contract, engine):
+    simulator = braket_local_simulator(engine=engine)
+    assert contract(simulator)
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+def test_wavefunction_from_initial_state_matches_prepared_state(engine):
+    preparation = Circuit([H(0), RX(0.3)(1), CNOT(0, 2)])
+    circuit = Circuit([CNOT(2, 1), RX(-1.1)(0)])
+    simulator = braket_local_simulator(engine=engine)
+    initial_state = simulator.get_wavefunction(preparation).amplitudes
+
+    wavefunction = simulator.get_wavefunction(circuit, initial_state)
+
+    np.testing.assert_allclose(
+        wavefunction.amplitudes,
+        simulator.get_wavefunction(preparation + circuit).amplitudes,
+        atol=1e-12,
+    )
 
 
 @pytest.mark.local
 @pytest.mark.parametrize("contract", simulator_contracts_for_tolerance())
-def test_braket_local_wf_simulator_fulfills_simulator_contracts(contract):
-    simulator = braket_local_simulator()
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+def test_braket_local_wf_simulator_fulfills_simulator_contracts(contract, engine):
+    simulator = braket_local_simulator(engine=engine)
     assert contract(simulator)
 
 
@@ -38,6 +62,277 @@ def test_braket_local_wf_simulator_fulfills_circuit_runner_contracts(contract):
 @pytest.mark.parametrize(
     "contract", simulator_gate_compatibility_contracts(gates_to_exclude=["RH"])
 )
-def test_braket_simulator_uses_correct_gate_definitionscontract(contract):
-    simulator = braket_local_simulator()
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+def test_braket_simulator_uses_correct_gate_definitionscontract(contract, engine):
+    simulator = braket_local_simulator(engine=engine)
     assert contract(simulator)
+
+
+@pytest.mark.local
+def test_get_wavefunction_async_matches_get_wavefunction():
+    simulator = braket_local_simulator()
+    circuit = Circuit([H(0), CNOT(0, 1), RX(0.3)(2)])
+
+    future = simulator.get_wavefunction_async(circuit)
+
+    np.testing.assert_allclose(
+        future.result(timeout=10).amplitudes,
+        simulator.get_wavefunction(circuit).amplitudes,
+    )
+
+
+@pytest.mark.local
+def test_get_wavefunction_with_params_matches_bound_circuit():
+    alpha, beta = sympy.symbols("alpha beta")
+    circuit = Circuit([H(0), RX(alpha)(0), CNOT(0, 1), RX(alpha + 2 * beta)(1)])
+    simulator = braket_local_simulator()
+
+    for params in ([0.1, 0.2], [-0.5, 1.3]):
+        np.testing.assert_allclose(
+            simulator.get_wavefunction_with_params(circuit, params).amplitudes,
+            simulator.get_wavefunction(
+                circuit.bind(dict(zip(circuit.free_symbols, params)))
+            ).amplitudes,
+            atol=1e-6,
+        )
+
+
+@pytest.mark.local
+@pytest.mark.parametrize(
+    "operator",
+    [
+        PauliTerm("Z0"),
+        PauliSum("0.5*X0*Y1 + 1.5*Z1*Z2 + -0.3*Y2 + 2.0"),
+        PauliSum("Z0*Z1 + 0.5*Z0*Z1 + -1*X2"),
+        PauliSum("0.7*Z3 + X0*X1*X2"),
+    ],
+)
+def test_exact_expectation_values_match_wavefunction_readout(operator):
+    circuit = Circuit([H(0), CNOT(0, 1), RX(0.4)(2), RX(1.1)(1), CNOT(1, 2), I(3)])
+    simulator = braket_local_simulator()
+
+    expected = get_expectation_value(operator, simulator.get_wavefunction(circuit)).real
+
+    assert simulator.get_exact_expectation_values(circuit, operator) == pytest.approx(
+        expected, abs=1e-5
+    )
+    assert simulator.n_jobs_executed == 2
+
+
+@pytest.mark.local
+def test_exact_expectation_value_of_constant_operator_does_not_run_task():
+    simulator = braket_local_simulator()
+
+    value = simulator.get_exact_expectation_values(
+        Circuit([H(0)]), PauliTerm.identity() * 3
+    )
+
+    assert value == 3
+    assert simulator.n_jobs_executed == 0
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("dtype", [np.complex64, np.complex128])
+def test_numpy_engine_matches_device(dtype):
+    alpha = sympy.Symbol("alpha")
+    circuit = Circuit([H(0), CNOT(0, 1), RX(alpha)(2), CNOT(2, 0)])
+    operator = PauliSum("0.5*X0*Y1 + 1.5*Z1*Z2 + -0.3*Y2 + 0.7*Z4")
+    device_simulator = braket_local_simulator()
+    numpy_simulator = braket_local_simulator(engine="numpy", dtype=dtype)
+    bound_circuit = circuit.bind({alpha: 0.4})
+
+    np.testing.assert_allclose(
+        numpy_simulator.get_wavefunction(bound_circuit).amplitudes,
+        device_simulator.get_wavefunction(bound_circuit).amplitudes,
+        atol=1e-6,
+    )
+    np.testing.assert_allclose(
+        numpy_simulator.get_wavefunction_with_params(circuit, [0.4]).amplitudes,
+        device_simulator.get_wavefunction(bound_circuit).amplitudes,
+        atol=1e-6,
+    )
+    assert numpy_simulator.get_exact_expectation_values(
+        bound_circuit, operator
+    ) == pytest.approx(
+        device_simulator.get_exact_expectation_values(bound_circuit, operator),
+        abs=1e-5,
+    )
+
+
+@pytest.mark.local
+def test_simulator_raises_for_unknown_engine():
+    with pytest.raises(ValueError):
+        braket_local_simulator(engine="qiskit")
+
+
+def _sweep_circuit():
+    alpha, beta = sympy.symbols("alpha beta")
+    return Circuit([H(0), RX(alpha)(0), CNOT(0, 1), RX(alpha + 2 * beta)(1)])
+
+
+SWEEP_PARAMS = np.array([[0.1, 0.2], [-0.5, 1.3], [2.0, -0.7]])
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_wavefunctions_for_params_match_bound_circuits(engine, chunk_size):
+    circuit = _sweep_circuit()
+    simulator = braket_local_simulator(engine=engine)
+
+    amplitudes = simulator.get_wavefunctions_for_params(
+        circuit, SWEEP_PARAMS, chunk_size=chunk_size
+    )
+
+    expected = [
+        braket_local_simulator()
+        .get_wavefunction(circuit.bind(dict(zip(circuit.free_symbols, params))))
+        .amplitudes
+        for params in SWEEP_PARAMS.tolist()
+    ]
+    np.testing.assert_allclose(amplitudes, expected, atol=1e-6)
+    assert simulator.n_jobs_executed == (1 if chunk_size is None else 2)
+    assert simulator.n_circuits_executed == 3
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+@pytest.mark.parametrize("chunk_size", [None, 1])
+def test_exact_expectation_values_for_params_match_bound_circuits(engine, chunk_size):
+    circuit = _sweep_circuit()
+    operator = PauliSum("0.5*X0*Y1 + 1.5*Z1 + -0.3*Y0 + 2.0 + 0.7*Z2")
+    simulator = braket_local_simulator(engine=engine)
+
+    values = simulator.get_exact_expectation_values_for_params(
+        circuit, operator, SWEEP_PARAMS, chunk_size=chunk_size
+    )
+
+    expected = [
+        braket_local_simulator().get_exact_expectation_values(
+            circuit.bind(dict(zip(circuit.free_symbols, params))), operator
+        )
+        for params in SWEEP_PARAMS.tolist()
+    ]
+    np.testing.assert_allclose(values, expected, atol=1e-6)
+
+
+@pytest.mark.local
+def test_sweep_raises_for_wrong_shape_of_params():
+    with pytest.raises(ValueError):
+        braket_local_simulator().get_wavefunctions_for_params(
+            _sweep_circuit(), np.zeros((3, 1))
+        )
+
+
+def _large_state_circuit():
+    return Circuit([H(0), CNOT(0, 1), RX(0.3)(2), H(3), CNOT(3, 1), RX(1.1)(0)])
+
+
+def _marginal(amplitudes, n_qubits, qubits):
+    probabilities = np.abs(amplitudes.reshape((2,) * n_qubits)) ** 2
+    others = tuple(qubit for qubit in range(n_qubits) if qubit not in qubits)
+    marginal = probabilities.sum(axis=others)
+    ranks = np.argsort(np.argsort(qubits))
+    return np.moveaxis(marginal, ranks, range(len(qubits))).reshape(-1)
+
+
+@pytest.mark.local
+def test_device_wavefunctions_keep_double_precision():
+    circuit = _large_state_circuit()
+
+    device_amplitudes = braket_local_simulator().get_wavefunction(circuit).amplitudes
+    numpy_amplitudes = (
+        braket_local_simulator(engine="numpy").get_wavefunction(circuit).amplitudes
+    )
+
+    np.testing.assert_allclose(device_amplitudes, numpy_amplitudes, atol=1e-13)
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+@pytest.mark.parametrize("dtype", [np.complex64, np.complex128])
+def test_save_wavefunction_writes_memory_mapped_amplitudes(tmp_path, engine, dtype):
+    circuit = _large_state_circuit()
+    simulator = braket_local_simulator(engine=engine, dtype=dtype)
+    path = tmp_path / "state.npy"
+
+    amplitudes = simulator.save_wavefunction(circuit, path, chunk_size=3)
+
+    assert isinstance(amplitudes, np.memmap)
+    assert amplitudes.dtype == dtype
+    np.testing.assert_allclose(
+        np.load(path),
+        simulator.get_wavefunction(circuit).amplitudes,
+        atol=1e-6 if dtype == np.complex64 else 1e-12,
+    )
+
+
+@pytest.mark.local
+@pytest.mark.parametrize(
+    "circuit", [Circuit([H(0)]), Circuit([H(0), CNOT(0, 1)]), Circuit([Z(0)])]
+)
+def test_numpy_engine_simulates_directly_into_file(tmp_path, circuit):
+    simulator = braket_local_simulator(engine="numpy")
+    path = tmp_path / "state.npy"
+
+    with patch(
+        "orquestra.integrations.braket.simulator.simulate_statevector"
+    ) as simulate:
+        amplitudes = simulator.save_wavefunction(circuit, path)
+
+    simulate.assert_not_called()
+    np.testing.assert_allclose(
+        amplitudes, braket_local_simulator().get_wavefunction(circuit).amplitudes
+    )
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+def test_get_amplitudes_matches_wavefunction(engine):
+    circuit = _large_state_circuit()
+    simulator = braket_local_simulator(engine=engine)
+    bitstrings = ["0000", "1100", "0111", "1011"]
+
+    amplitudes = simulator.get_amplitudes(circuit, bitstrings)
+
+    wavefunction = simulator.get_wavefunction(circuit).amplitudes
+    np.testing.assert_allclose(
+        amplitudes,
+        [wavefunction[int(bitstring, 2)] for bitstring in bitstrings],
+        atol=1e-12,
+    )
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+@pytest.mark.parametrize("bitstring", ["000", "00000", "0120"])
+def test_get_amplitudes_raises_for_invalid_bitstrings(engine, bitstring):
+    simulator = braket_local_simulator(engine=engine)
+
+    with pytest.raises(ValueError):
+        simulator.get_amplitudes(_large_state_circuit(), [bitstring])
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+@pytest.mark.parametrize("qubits", [None, [0], [2, 0], [1, 3, 0]])
+def test_get_probabilities_returns_marginals(engine, qubits):
+    circuit = _large_state_circuit()
+    simulator = braket_local_simulator(engine=engine)
+
+    probabilities = simulator.get_probabilities(circuit, qubits)
+
+    wavefunction = simulator.get_wavefunction(circuit).amplitudes
+    expected = _marginal(wavefunction, 4, list(range(4)) if qubits is None else qubits)
+    np.testing.assert_allclose(probabilities, expected, atol=1e-12)
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("engine", ["device", "numpy"])
+def test_get_probabilities_of_qubits_without_gates(engine):
+    simulator = braket_local_simulator(engine=engine)
+
+    probabilities = simulator.get_probabilities(Circuit([H(0)]), [5, 0])
+
+    np.testing.assert_allclose(probabilities, [0.5, 0.5, 0, 0], atol=1e-12)
@@ -0,0 +1,169 @@
+import numpy as np
+import pytest
+import sympy
+from braket.devices import LocalSimulator
+from orquestra.quantum.circuits import (
+    CNOT,
+    CPHASE,
+    CZ,
+    ISWAP,
+    PHASE,
+    RH,
+    RX,
+    RY,
+    RZ,
+    SWAP,
+    XX,
+    XY,
+    YY,
+    ZZ,
+    Circuit,
+    H,
+    I,
+    S,
+    T,
+    X,
+    Y,
+    Z,
+)
+
+from orquestra.integrations.braket.conversions import export_to_braket
+from orquestra.integrations.braket.statevector import (
+    simulate_statevector,
+    simulate_statevectors,
+)
+
+SINGLE_QUBIT_GATES = [X, Y, Z, H, S, T, I]
+TWO_QUBIT_GATES = [CZ, CNOT, ISWAP, SWAP]
+SINGLE_QUBIT_ROTATIONS = [RX, RY, RZ, PHASE]
+TWO_QUBIT_ROTATIONS = [XX, XY, YY, ZZ, CPHASE]
+
+
+def _random_circuit(n_qubits, n_gates, seed):
+    rng = np.random.default_rng(seed)
+    circuit = Circuit()
+    for _ in range(n_gates):
+        qubits = [int(qubit) for qubit in rng.choice(n_qubits, 2, replace=False)]
+        angle = float(rng.uniform(-np.pi, np.pi))
+        kind = rng.integers(4)
+        if kind == 0:
+            circuit += rng.choice(SINGLE_QUBIT_GATES)(qubits[0])
+        elif kind == 1:
+            circuit += rng.choice(TWO_QUBIT_GATES)(*qubits)
+        elif kind == 2:
+            circuit += rng.choice(SINGLE_QUBIT_ROTATIONS)(angle)(qubits[0])
+        else:
+            circuit += rng.choice(TWO_QUBIT_ROTATIONS)(angle)(*qubits)
+    return circuit
+
+
+def _braket_statevector(circuit):
+    braket_circuit = export_to_braket(circuit)
+    braket_circuit.state_vector()
+    return LocalSimulator("braket_sv").run(braket_circuit, shots=0).result().values[0]
+
+
+@pytest.mark.local
+@pytest.mark.parametrize(
+    "gate",
+    [gate(0) for gate in SINGLE_QUBIT_GATES]
+    + [gate(0, 1) for gate in TWO_QUBIT_GATES]
+    + [gate(0.37)(0) for gate in SINGLE_QUBIT_ROTATIONS]
+    + [gate(-1.3)(0, 1) for gate in TWO_QUBIT_ROTATIONS],
+)
+def test_gates_match_braket_definitions(gate):
+    # Preparing a random state makes the comparison sensitive to all entries
+    # of the gate's matrix.
+    circuit = _random_circuit(2, 10, seed=0) + Circuit([gate])
+
+    np.testing.assert_allclose(
+        simulate_statevector(circuit), _braket_statevector(circuit), atol=1e-12
+    )
+
+
+@pytest.mark.local
+@pytest.mark.parametrize(
+    "dtype, tolerance", [(np.complex64, 1e-5), (np.complex128, 1e-12)]
+)
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_random_circuits_match_braket_local_simulator(dtype, tolerance, seed):
+    circuit = _random_circuit(6, 200, seed)
+
+    state = simulate_statevector(circuit, dtype)
+
+    assert state.dtype == dtype
+    np.testing.assert_allclose(state, _braket_statevector(circuit), atol=tolerance)
+
+
+@pytest.mark.local
+def test_only_qubits_acted_on_are_simulated():
+    circuit = Circuit([X(0), H(2), CNOT(2, 5)], n_qubits=7)
+
+    state = simulate_statevector(circuit)
+
+    assert state.shape == (8,)
+    np.testing.assert_allclose(state, _braket_statevector(circuit), atol=1e-12)
+
+
+@pytest.mark.local
+def test_additional_qubits_are_included_in_register():
+    state = simulate_statevector(Circuit([X(1)]), qubits=[0])
+
+    np.testing.assert_allclose(state, [0, 1, 0, 0])
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("seed", range(3))
+def test_simulation_from_initial_state_continues_preparing_circuit(seed):
+    preparation = _random_circuit(4, 15, seed)
+    circuit = _random_circuit(3, 15, seed + 10)
+    initial_state = simulate_statevector(preparation)
+
+    state = simulate_statevector(circuit, initial_state=initial_state)
+
+    np.testing.assert_allclose(
+        state, simulate_statevector(preparation + circuit), atol=1e-12
+    )
+    np.testing.assert_allclose(initial_state, simulate_statevector(preparation))
+
+
+@pytest.mark.local
+@pytest.mark.parametrize("initial_state", [[1, 0, 0], [0, 1]])
+def test_simulation_raises_for_invalid_initial_state(initial_state):
+    with pytest.raises(ValueError):
+        simulate_statevector(Circuit([CNOT(0, 1)]), initial_state=initial_state)
+
+
+@pytest.mark.local
+def test_simulation_raises_for_unsupported_gate():
+    with pytest.raises(RuntimeError):
+        simulate_statevector(Circuit([RH(0.1)(0)]))
+
+
+@pytest.mark.local
+def test_simulation_raises_for_unbound_params():
+    with pytest.raises(ValueError):
+        simulate_statevector(Circuit([RX(sympy.Symbol("theta"))(0)]))
+
+
+@pytest.mark.local
+def test_stacked_simulation_matches_simulation_of_bound_circuits():
+    alpha, beta = sympy.symbols("alpha beta")
+    circuit = Circuit(
+        [H(0), RX(alpha)(0), XY(2 * beta)(1, 0), ZZ(alpha - beta)(0, 2), RY(1.2)(1)]
+    )
+    params = np.array([[0.1, 0.2], [-0.5, 1.3], [2.0, -0.7]])
+
+    states = simulate_statevectors(circuit, params)
+
+    expected = [
+        simulate_statevector(circuit.bind(dict(zip(circuit.free_symbols, row))))
+        for row in params.tolist()
+    ]
+    np.testing.assert_allclose(states, expected, atol=1e-12)
+
+
+@pytest.mark.local
+def test_stacked_simulation_raises_for_wrong_shape_of_params():
+    with pytest.raises(ValueError):
+        simulate_statevectors(Circuit([RX(sympy.Symbol("theta"))(0)]), np.zeros(3))